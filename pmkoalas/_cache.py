@@ -0,0 +1,130 @@
+"""
+Module to keep parsed structures in a binary sidecar file next to their
+source file, so that a source only needs to be parsed once.
+
+A sidecar is keyed by the size, modification time and content hash of
+its source, as well as the kind of structure and the parameters used to
+parse it. A sidecar that does not match its source is treated as stale.
+
+Sidecars only hold plain data (builtin containers, numbers, strings and 
+dates), and are loaded with an unpickler that refuses anything else, so a
+sidecar dropped next to a shared log cannot run code when loaded.
+"""
+import os
+import pickle
+from hashlib import blake2b
+from typing import Tuple, Union
+
+from pmkoalas._logging import debug, info, warn
+
+CACHE_SUFFIX = ".koalas"
+CACHE_VERSION = 1
+HASH_BLOCK_SIZE = 2 ** 20
+# the only globals that a sidecar may refer to
+SAFE_GLOBALS = {
+    "builtins" : frozenset(["set", "frozenset", "complex"]),
+    "datetime" : frozenset(["datetime", "date", "time", "timedelta", 
+                            "timezone"]),
+}
+
+class _SidecarUnpickler(pickle.Unpickler):
+    """
+    An unpickler that only allows the plain data of sidecars.
+    """
+
+    def find_class(self, module:str, name:str):
+        if name in SAFE_GLOBALS.get(module, ()):
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(
+            f"sidecar refers to a disallowed global :: {module}.{name}")
+
+def sidecar_path(filepath:str) -> str:
+    """
+    Returns the path of the sidecar for the given source file.
+    """
+    return filepath + CACHE_SUFFIX
+
+def fingerprint(filepath:str) -> Tuple[int,int]:
+    """
+    Returns the size and modification time (in ns) of the given file.
+    """
+    stat = os.stat(filepath)
+    return stat.st_size, stat.st_mtime_ns
+
+def content_hash(filepath:str) -> str:
+    """
+    Returns a hash of the contents of the given file.
+    """
+    hasher = blake2b(digest_size=32)
+    with open(filepath, "rb") as source:
+        for block in iter(lambda: source.read(HASH_BLOCK_SIZE), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+def load(filepath:str, kind:str, params:Tuple) -> Union[object,None]:
+    """
+    Loads the structure stored in the sidecar of the given source file,
+    or returns `None` if there is no sidecar or the sidecar is stale.
+    """
+    sidecar = sidecar_path(filepath)
+    if not os.path.exists(sidecar):
+        return None
+    size, mtime = fingerprint(filepath)
+    try:
+        with open(sidecar, "rb") as cache:
+            meta = _SidecarUnpickler(cache).load()
+            if not isinstance(meta, dict) \
+                or meta.get("version") != CACHE_VERSION \
+                or meta.get("kind") != kind \
+                or meta.get("params") != params \
+                or meta.get("size") != size:
+                info(f"sidecar is stale for :: {filepath}")
+                return None
+            # only hash when the modification time does not match
+            touched = meta.get("mtime") != mtime
+            if touched and meta.get("hash") != content_hash(filepath):
+                info(f"sidecar is stale for :: {filepath}")
+                return None
+            debug(f"loading sidecar :: {sidecar}")
+            payload = _SidecarUnpickler(cache).load()
+    except Exception as e:
+        warn(f"unable to load sidecar {sidecar} :: {e}")
+        return None
+    if touched:
+        # the contents are unchanged, so later loads need not hash again
+        meta["mtime"] = mtime
+        _write(sidecar, meta, payload)
+    return payload
+
+def store(filepath:str, kind:str, params:Tuple, payload:object) -> None:
+    """
+    Stores the given structure into the sidecar of the given source file,
+    replacing any existing sidecar. A failure to write is only reported.
+    """
+    size, mtime = fingerprint(filepath)
+    meta = {
+        "version" : CACHE_VERSION,
+        "kind" : kind,
+        "params" : params,
+        "size" : size,
+        "mtime" : mtime,
+        "hash" : content_hash(filepath)
+    }
+    _write(sidecar_path(filepath), meta, payload)
+
+def _write(sidecar:str, meta:dict, payload:object) -> None:
+    """
+    Writes the metadata and structure of a sidecar, replacing any existing 
+    sidecar. A failure to write is only reported.
+    """
+    partial = sidecar + ".partial"
+    try:
+        with open(partial, "wb") as cache:
+            pickle.dump(meta, cache, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(payload, cache, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partial, sidecar)
+        debug(f"stored sidecar :: {sidecar}")
+    except Exception as e:
+        warn(f"unable to store sidecar {sidecar} :: {e}")
+        if os.path.exists(partial):
+            os.remove(partial)
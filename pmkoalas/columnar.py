@@ -0,0 +1,360 @@
+"""
+This module provides a columnar storage for simplified event logs, where
+the variants of a log are kept in flat NumPy arrays so that statistics
+over the log are computed with array operations rather than loops over
+traces.
+
+NumPy is an optional dependency, which is only imported when a columnar
+log is created (install with `pip install pmkoalas[columnar]`).
+"""
+from typing import Dict, FrozenSet, Iterable, Iterator, Mapping, Tuple, \
+    Union
+from itertools import chain
+from time import time
+
+from pmkoalas._logging import info, enable_logging
+from pmkoalas.simple import EventLog, Trace, ActivityAlphabet
+from pmkoalas.simple import DEFAULT_SIMPLE_LOG_NAME
+from pmkoalas.directly import DirectlyFollowPair, FollowLanguage
+from pmkoalas.directly import DIRECTLY_SOURCE, DIRECTLY_END
+
+def _numpy():
+    """
+    Imports NumPy, reporting how to install it if it is missing.
+    """
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "a columnar event log requires numpy, which can be installed "
+            "with :: pip install pmkoalas[columnar]"
+        ) from e
+    return numpy
+
+class ColumnarEventLog(EventLog):
+    """
+    A simplified collection of traces, where variants are stored as 
+    columns: a flat int32 array of activity codes (see `alphabet`), an
+    array of offsets where the i-th variant spans
+    `codes[offsets[i]:offsets[i+1]]`, and an array with the frequency of
+    each variant. 
+    
+    The columns are the only storage of variants, which are made into 
+    traces when the collection is iterated. Methods of `EventLog` that are
+    not answered from the columns make the traces on each call, without
+    keeping them.
+    """
+
+    @enable_logging
+    def __init__(self, traces: Iterable[Trace],
+                 name:str=DEFAULT_SIMPLE_LOG_NAME) -> None:
+        counts = dict()
+        for trace in traces:
+            sequence = trace.sequence
+            counts[sequence] = counts.get(sequence, 0) + 1
+        self._store(counts, name)
+
+    @classmethod
+    def from_frequencies(cls, frequencies:Union[Mapping[Trace,int],
+                                                Iterable[Tuple[Trace,int]]],
+                         name:str=DEFAULT_SIMPLE_LOG_NAME) \
+            -> 'ColumnarEventLog':
+        """
+        Creates a columnar collection from a mapping between traces and 
+        their frequencies (or from pairs of traces and frequencies), see
+        `EventLog.from_frequencies`.
+        """
+        if isinstance(frequencies, Mapping):
+            frequencies = frequencies.items()
+        counts = dict()
+        for trace, freq in frequencies:
+            sequence = trace.sequence
+            counts[sequence] = counts.get(sequence, 0) + freq
+        log = cls.__new__(cls)
+        log._store(counts, name)
+        return log
+
+    @classmethod
+    def from_shards(cls, shards:Iterable[Iterable[Trace]],
+                    name:str=DEFAULT_SIMPLE_LOG_NAME,
+                    workers:int=1) -> 'ColumnarEventLog':
+        """
+        Creates a columnar collection from shards of traces, see 
+        `EventLog.from_shards`.
+        """
+        return cls.from_frequencies(
+            EventLog.from_shards(shards, name, workers), name)
+
+    @classmethod
+    def from_log(cls, log:EventLog) -> 'ColumnarEventLog':
+        """
+        Creates a columnar collection from the variants of another log.
+        """
+        return cls.from_frequencies(log, log.get_name())
+
+    def _store(self, counts:Dict[Tuple[str],int], name:str) -> None:
+        """
+        Builds the columns of this collection from the frequencies of 
+        sequences of activities, in seen order.
+        """
+        np = _numpy()
+        info("Computing columns...")
+        start = time()
+        nvariants = len(counts)
+        lengths = np.fromiter(map(len, counts.keys()), dtype=np.int64, 
+                              count=nvariants)
+        offsets = np.zeros(nvariants + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        labels = list(chain.from_iterable(counts.keys()))
+        # activities are coded in the order they are first seen
+        alphabet = ActivityAlphabet(dict.fromkeys(labels))
+        codes = np.fromiter(alphabet.codes(labels), dtype=np.int32,
+                            count=len(labels))
+        freqs = np.fromiter(counts.values(), dtype=np.int64, count=nvariants)
+        self.name = name
+        self._columns = (codes, offsets, freqs)
+        self._len = int(freqs.sum())
+        self._variants = nvariants
+        # activity sets are found from the columns when first asked for
+        self._acts = None
+        self._start_acts = None
+        self._end_acts = None
+        self._traces = None
+        self._init_caches()
+        self._alphabet = alphabet
+        info(f"Computed columns in {(time()-start)*1000:.0f}ms")
+
+    @property
+    def _freqset(self) -> Dict[Trace,int]:
+        "Makes the mapping between variants and their frequencies."
+        return dict(self)
+
+    def _add(self, trace:Trace, freq:int) -> None:
+        raise NotImplementedError(
+            "a columnar event log cannot be added to once created")
+
+    # columns
+    def codes(self):
+        "Get the flat array of activity codes for all variants."
+        return self._columns[0]
+
+    def offsets(self):
+        "Get the array of offsets where each variant starts in `codes`."
+        return self._columns[1]
+
+    def frequencies(self):
+        "Get the array of frequencies for each variant."
+        return self._columns[2]
+
+    def lengths(self):
+        "Get the array of lengths for each variant."
+        return _numpy().diff(self.offsets())
+
+    # vectorised primitives
+    def length_histogram(self) -> Dict[int,int]:
+        "Get the number of traces for each trace length."
+        np = _numpy()
+        counts = np.bincount(self.lengths(), weights=self.frequencies())
+        lengths = np.nonzero(counts)[0]
+        return dict(zip(lengths.tolist(),
+                        counts[lengths].astype(np.int64).tolist()))
+
+    def activity_counts(self) -> Dict[str,int]:
+        "Get the number of events for each activity."
+        np = _numpy()
+        alphabet = self.alphabet()
+        weights = np.repeat(self.frequencies(), self.lengths())
+        counts = np.bincount(self.codes(), weights=weights,
+                             minlength=len(alphabet))
+        return {
+            alphabet.label(code) : count
+            for code, count
+            in enumerate(counts.astype(np.int64).tolist())
+        }
+
+    def _boundary_counts(self, first:bool) -> Dict[str,int]:
+        "Get the number of traces starting (or ending) with each activity."
+        np = _numpy()
+        offsets = self.offsets()
+        seen = offsets[1:] > offsets[:-1]
+        positions = offsets[:-1][seen] if first else offsets[1:][seen] - 1
+        alphabet = self.alphabet()
+        counts = np.bincount(self.codes()[positions], 
+                             weights=self.frequencies()[seen],
+                             minlength=len(alphabet))
+        codes = np.nonzero(counts)[0]
+        return {
+            alphabet.label(code) : count
+            for code, count 
+            in zip(codes.tolist(), counts[codes].astype(np.int64).tolist())
+        }
+
+    def start_counts(self) -> Dict[str,int]:
+        "Get the number of traces starting with each activity."
+        return self._boundary_counts(True)
+
+    def end_counts(self) -> Dict[str,int]:
+        "Get the number of traces ending with each activity."
+        return self._boundary_counts(False)
+
+    def seen_activities(self) -> FrozenSet[str]:
+        """
+        Get the activities of this language, found from the columns, as a
+        read-only set (use `set(...)` for a mutable copy).
+        """
+        if self._acts is None:
+            alphabet = self.alphabet()
+            self._acts = frozenset( 
+                alphabet.label(code) 
+                for code in _numpy().unique(self.codes()).tolist() )
+        return self._acts
+
+    def seen_start_activities(self) -> FrozenSet[str]:
+        """
+        Get the start activities of this language, found from the columns, 
+        as a read-only set (use `set(...)` for a mutable copy).
+        """
+        if self._start_acts is None:
+            self._start_acts = frozenset(self.start_counts())
+        return self._start_acts
+
+    def seen_end_activities(self) -> FrozenSet[str]:
+        """
+        Get the end activities of this language, found from the columns, 
+        as a read-only set (use `set(...)` for a mutable copy).
+        """
+        if self._end_acts is None:
+            self._end_acts = frozenset(self.end_counts())
+        return self._end_acts
+
+    def _padded(self) -> Tuple:
+        """
+        Get the codes of non-empty variants with a source code before and an
+        end code after each, along with the variant of each position, and
+        the source and end codes.
+        """
+        np = _numpy()
+        lengths = self.lengths()
+        seen = np.nonzero(lengths > 0)[0]
+        padded_lengths = lengths[seen] + 2
+        total = int(padded_lengths.sum())
+        source, end = len(self.alphabet()), len(self.alphabet()) + 1
+        padded = np.empty(total, dtype=np.int64)
+        firsts = np.cumsum(padded_lengths) - padded_lengths
+        lasts = firsts + padded_lengths - 1
+        inner = np.ones(total, dtype=bool)
+        inner[firsts] = False
+        inner[lasts] = False
+        padded[firsts] = source
+        padded[lasts] = end
+        # empty variants have no codes, so the codes line up with the rest
+        padded[inner] = self.codes()
+        variants = np.repeat(seen, padded_lengths)
+        return padded, variants, source, end
+
+    def pair_counts(self) -> Dict[Tuple[str,str],int]:
+        """
+        Get the number of times each activity is directly followed by
+        another within a trace.
+        """
+        np = _numpy()
+        offsets = self.offsets()
+        codes = self.codes()
+        variants = np.repeat(np.arange(len(offsets) - 1), self.lengths())
+        inside = variants[:-1] == variants[1:]
+        size = len(self.alphabet())
+        keys = codes[:-1][inside].astype(np.int64) * size \
+            + codes[1:][inside]
+        weights = self.frequencies()[variants[:-1][inside]]
+        pairs, inverse = np.unique(keys, return_inverse=True)
+        counts = np.bincount(inverse, weights=weights)
+        alphabet = self.alphabet()
+        return {
+            (alphabet.label(key // size), alphabet.label(key % size)) : count
+            for key, count
+            in zip(pairs.tolist(), counts.astype(np.int64).tolist())
+        }
+
+    @enable_logging
+    def directly_follow_relations(self) -> FollowLanguage:
+        """
+        Get the directly flow relations for this language, computed over
+        the columns.
+        """
+        if self._relations is not None:
+            info("Already computed relations, returning existing" +
+             "computation.")
+            return self._relations
+        np = _numpy()
+        padded, variants, source, end = self._padded()
+        base = end + 1
+        freqs = self.frequencies()
+        # a pair at i is padded[i] followed by padded[i+1]
+        inside = variants[:-1] == variants[1:]
+        keys = padded[:-1] * base + padded[1:]
+        positions = np.nonzero(inside)[0]
+        pairs, firsts, inverse = np.unique(keys[positions],
+                                           return_index=True,
+                                           return_inverse=True)
+        counts = np.bincount(inverse, weights=freqs[variants[positions]])
+        # neighbours of a pair at i are padded[i-1] and padded[i+2]
+        before = positions[(positions > 0)]
+        before = before[variants[before - 1] == variants[before]]
+        preceding = np.unique(keys[before] * base + padded[before - 1])
+        after = positions[positions + 2 < len(padded)]
+        after = after[variants[after + 2] == variants[after]]
+        proceeding = np.unique(keys[after] * base + padded[after + 2])
+        alphabet = self.alphabet()
+        labels = [ alphabet.label(code) for code in range(len(alphabet)) ] \
+            + [DIRECTLY_SOURCE, DIRECTLY_END]
+        neighbours = dict( (key, (set(), set())) for key in pairs.tolist() )
+        for key in preceding.tolist():
+            neighbours[key // base][0].add(labels[key % base])
+        for key in proceeding.tolist():
+            neighbours[key // base][1].add(labels[key % base])
+        # pairs are kept in the order they are first seen
+        order = np.argsort(firsts, kind="stable")
+        pairs = pairs[order].tolist()
+        counts = counts[order].astype(np.int64).tolist()
+        self._relations = FollowLanguage([
+            DirectlyFollowPair(
+                labels[key // base], labels[key % base], count,
+                preceeding=neighbours[key][0],
+                proceeding=neighbours[key][1]
+            )
+            for key, count
+            in zip(pairs, counts)
+        ])
+        return self._relations
+
+    # data model functions
+    def __iter__(self) -> Iterator[Tuple[Trace,int]]:
+        alphabet = self.alphabet()
+        labels = [ alphabet.label(code) for code in range(len(alphabet)) ]
+        codes = self.codes().tolist()
+        offsets = self.offsets().tolist()
+        freqs = self.frequencies().tolist()
+        for i, freq in enumerate(freqs):
+            variant = codes[offsets[i]:offsets[i+1]]
+            yield Trace(tuple(map(labels.__getitem__, variant))), freq
+
+    def __contains__(self, other):
+        """
+        Tests whether a trace is a variant of this language, by comparing 
+        its codes with the variants of the same length, see 
+        `EventLog.__contains__` for patterns.
+        """
+        if not isinstance(other, Trace):
+            return EventLog.__contains__(self, other)
+        np = _numpy()
+        alphabet = self.alphabet()
+        if any( act not in alphabet for act in other.seen_activities() ):
+            return False
+        target = np.fromiter(alphabet.codes(other), dtype=np.int32,
+                             count=len(other))
+        starts = self.offsets()[:-1][self.lengths() == len(other)]
+        if len(other) == 0:
+            return len(starts) > 0
+        # the codes of each candidate variant, one per row
+        rows = self.codes()[starts[:, None] + np.arange(len(other))]
+        return bool((rows == target).all(axis=1).any())
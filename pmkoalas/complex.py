@@ -5,7 +5,8 @@ a trace and an event log in complex form, which considers the
 data perspective.
 """
 from __future__ import annotations # required for typing checks
-from typing import Mapping, Iterable, Set, List, Tuple
+from typing import Mapping, FrozenSet, Iterable, Iterator, Set, List, Tuple
+from types import MappingProxyType
 from copy import deepcopy
 from time import time
 
@@ -17,6 +18,15 @@ from pmkoalas.simple import Trace, EventLog
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from pmkoalas.models.transitiontree import TransitionTree
+    from pmkoalas.views import ComplexLogView
+
+def _copy_map(data:Mapping[str,object]) -> Mapping[str,object]:
+    """
+    Returns a deep copy of a mapping, which may be a read-only view.
+    """
+    if isinstance(data, MappingProxyType):
+        data = dict(data)
+    return deepcopy(data)
 
 class ComplexEvent():
     """
@@ -28,15 +38,29 @@ class ComplexEvent():
 
     def __init__(self, activity:str, data:Mapping[str,object]) -> None:
         self._act = activity
-        self._map = deepcopy(data)
+        self._map = _copy_map(data)
+
+    @classmethod
+    def _owning(cls, activity:str, data:dict) -> 'ComplexEvent':
+        """
+        Creates an event that takes ownership of the given data, without 
+        copying it. The caller must not keep or modify the data.
+        """
+        event = cls.__new__(cls)
+        event._act = activity
+        event._map = data
+        return event
 
     def activity(self) -> str:
         """ the process activity denoted by this event """
         return self._act
 
     def data(self) -> Mapping[str,object]:
-        """ returns a copy of the data attached at this event """
-        return deepcopy(self._map)    
+        """ 
+        returns a read-only view of the data attached at this event, use 
+        `dict(...)` for a mutable copy.
+        """
+        return MappingProxyType(self._map)
 
     # data model functions
     def __getitem__(self, key):
@@ -47,7 +71,7 @@ class ComplexEvent():
         
     def _pretty_map(self) -> str:
         str_map = "{"
-        for key,val in self.data().items():
+        for key,val in self._map.items():
             str_map += f" '{key}' : {val},"
         return str_map[:-1] + "}"
 
@@ -75,7 +99,7 @@ class ComplexEvent():
     def __eq__(self, value):
         if (isinstance(value, ComplexEvent)):
             return self.activity() == value.activity() \
-                   and self.data() == value.data()
+                   and self._map == value._map
     
 class ComplexTrace():
     """
@@ -85,30 +109,45 @@ class ComplexTrace():
 
     def __init__(self, events:Iterable[ComplexEvent], 
                  data: Mapping[str,object] = None) -> None:
-        self._sequence = [ 
-            deepcopy(event)
-            for event
-            in events
-        ]
-        self._len = len(self._sequence)
         if data == None:
-            self._map = dict()
-        elif isinstance(data,(dict)):
-            self._map = deepcopy(data)
+            data = dict()
+        elif isinstance(data,(dict, MappingProxyType)):
+            data = _copy_map(data)
         else:
             raise ValueError(f"Given data is not a map/dict :: {type(data)}")
+        self._own([ deepcopy(event) for event in events ], data)
+
+    @classmethod
+    def _owning(cls, events:List[ComplexEvent], 
+                data:dict) -> 'ComplexTrace':
+        """
+        Creates a trace that takes ownership of the given events and data,
+        without copying them. The caller must not keep or modify either.
+        """
+        trace = cls.__new__(cls)
+        trace._own(events, data)
+        return trace
+
+    def _own(self, events:List[ComplexEvent], data:dict) -> None:
+        "Sets up this trace over the given events and data."
+        self._sequence = events
+        self._len = len(self._sequence)
+        self._map = data
         self._hash = hash( 
             tuple(list(self._map.items()) + [ s.__hash__() for s in self._sequence])
         )
-        self._acts = set([ s.activity() for s in self._sequence])
+        self._acts = frozenset([ s.activity() for s in self._sequence])
 
     # accessors
     def get_id(self) -> str:
         return "complex"
     
-    def seen_activities(self) -> Set[str]:
-        """ returns the activities seen in this trace """
-        return deepcopy(self._acts)
+    def seen_activities(self) -> FrozenSet[str]:
+        """ 
+        returns a read-only set of the activities seen in this trace, use
+        `set(...)` for a mutable copy.
+        """
+        return self._acts
     
     def get_state_as_of(self, i:int) -> Mapping[str,object]:
         """ returns the data state of the trace before the i-th event."""
@@ -121,8 +160,11 @@ class ComplexTrace():
         return state
     
     def data(self) -> Mapping[str,object]:
-        """ returns the trace attributes """
-        return deepcopy(self._map)
+        """ 
+        returns a read-only view of the trace attributes, use `dict(...)`
+        for a mutable copy.
+        """
+        return MappingProxyType(self._map)
     
     def simplify(self) -> Trace:
         """ 
@@ -148,7 +190,7 @@ class ComplexTrace():
             repr += "\t\t" + ev.__repr__() + ",\n"
         repr += "\t],\n"
         # add map
-        repr += "\tdata= "+ self.data().__repr__() +"\n" 
+        repr += "\tdata= "+ self._map.__repr__() +"\n" 
         return repr + ")"
     
     def __iter__(self) -> Iterable[ComplexEvent]:
@@ -190,6 +232,11 @@ class ComplexTrace():
     def __len__(self) -> int:
         return self._len
 
+    def __reduce__(self):
+        # string hashes differ between processes, so the hash is 
+        # recomputed rather than pickled
+        return (self.__class__, (self._sequence, self._map))
+
 DEFAULT_COMPLEX_LOG_NAME = "complex log"
 class ComplexEventLog():
     """
@@ -208,41 +255,60 @@ class ComplexEventLog():
         self._len = 0
         self._variants = 0
         self._pop_size = 0
-        self._acts = set([])
-        self._start_acts = set([])
-        self._end_acts = set([])
+        # activity sets are frozen, so they can be shared by accessors
+        self._acts = frozenset()
+        self._start_acts = frozenset()
+        self._end_acts = frozenset()
         self._traces = None
-        self._map = deepcopy(data)
+        self._view = None
+        self._map = _copy_map(data)
         info("Computing language...")
         start = time()
         for trace in traces:
-            
-            strace = trace.simplify()
-            if (strace in self._instances):
-                collector = self._instances[strace]
-                self._pop_size += 1
-                collector.append(trace)
-            else:
-                self._instances[strace] = list()
-                self._instances[strace].append(trace)
-                self._pop_size += 1
-            trace = strace
-            if (trace in self._freqset.keys()):
-                self._freqset[trace] += 1
-            else:
-                self._acts = self._acts.union(
-                    trace.seen_activities()
-                )
-                if (len(trace) > 0):
-                    self._start_acts.add(trace[0])
-                    self._end_acts.add(trace[-1])
-                self._freqset[trace] = 1
-                self._variants += 1
-            self._len += 1
+            self._add(trace.simplify(), [trace])
         self._traces = set([ t for t in self._freqset.keys() ])
         info(f"Computed language in {(time()-start)*1000:.0f}ms")
         self.name = name 
 
+    @classmethod
+    def from_instances(cls, instances:Mapping[Trace,List[ComplexTrace]],
+                       data:Mapping[str,object] = None,
+                       name:str = DEFAULT_COMPLEX_LOG_NAME) \
+            -> 'ComplexEventLog':
+        """
+        Creates a collection from a mapping between simplified traces and 
+        their complex instances, without simplifying each instance again.
+        """
+        log = cls([], data=data, name=name)
+        for strace, collector in instances.items():
+            log._add(strace, collector)
+        log._traces = set([ t for t in log._freqset.keys() ])
+        return log
+
+    def _add(self, strace:Trace, instances:List[ComplexTrace]) -> None:
+        "Adds instances of the given simplified trace to this collection."
+        freq = len(instances)
+        if (freq < 1):
+            return
+        self._view = None
+        if (strace in self._instances):
+            self._instances[strace].extend(instances)
+            self._freqset[strace] += freq
+        else:
+            self._instances[strace] = list(instances)
+            acts = strace.seen_activities()
+            if (not acts <= self._acts):
+                self._acts = self._acts.union(acts)
+            if (len(strace) > 0):
+                if (strace[0] not in self._start_acts):
+                    self._start_acts = self._start_acts.union([strace[0]])
+                if (strace[-1] not in self._end_acts):
+                    self._end_acts = self._end_acts.union([strace[-1]])
+            self._freqset[strace] = freq
+            self._variants += 1
+        self._pop_size += freq
+        self._len += freq
+
     @enable_logging
     def simplify(self) -> EventLog:
         """
@@ -254,17 +320,26 @@ class ComplexEventLog():
             simple_traces = simple_traces + ([ trace ] * freq)
         return EventLog(simple_traces, self.name)
 
-    def seen_activities(self) -> Set[str]:
-        "Get a language of process activities from this language."
-        return deepcopy(self._acts)
+    def seen_activities(self) -> FrozenSet[str]:
+        """
+        Get a language of process activities from this language, as a 
+        read-only set (use `set(...)` for a mutable copy).
+        """
+        return self._acts
 
-    def seen_start_activities(self) -> Set[str]:
-        "Get a set of start activities from this language."
-        return deepcopy(self._start_acts)
+    def seen_start_activities(self) -> FrozenSet[str]:
+        """
+        Get a read-only set of start activities from this language (use 
+        `set(...)` for a mutable copy).
+        """
+        return self._start_acts
 
-    def seen_end_activities(self) -> Set[str]:
-        "Get a set of end activities from this language."
-        return deepcopy(self._end_acts)
+    def seen_end_activities(self) -> FrozenSet[str]:
+        """
+        Get a read-only set of end activities from this language (use 
+        `set(...)` for a mutable copy).
+        """
+        return self._end_acts
     
     def simple_language(self) -> Set[Trace]:
         "Get a simplified trace language from this language."
@@ -273,23 +348,50 @@ class ComplexEventLog():
     def simple_stochastic_language(self) -> Mapping[Trace,float]:
         "Get a simplified stochastic language from this language."
         return self._freqset.copy()
+
+    def _instances_view(self) -> Mapping[Trace, Tuple[ComplexTrace]]:
+        "Builds the read-only view of instances, once."
+        if self._view == None:
+            self._view = MappingProxyType({
+                strace : tuple(collector) 
+                for strace, collector 
+                in self._instances.items()
+            })
+        return self._view
     
-    def get_instances(self) -> Mapping[Trace, List[ComplexTrace]]:
+    def get_instances(self) -> Mapping[Trace, Tuple[ComplexTrace]]:
         """ 
-        Get a map between seen simple traces and instances 
-        of complex traces.
+        Get a read-only map between seen simple traces and tuples of 
+        instances of complex traces (use `dict(...)` for a mutable copy of 
+        the map, the instances are shared with this collection).
         """
-        return deepcopy(self._instances)
+        return self._instances_view()
     
-    def seen_instances_for(self, trace:Trace) -> Set[ComplexTrace]:
+    def iter_instances(self) -> Iterator[ComplexTrace]:
+        """
+        Iterates over the instances of complex traces, grouped by their 
+        variant in seen order, without copying them. The instances are 
+        shared with this collection and must not be modified.
+        """
+        for collector in self._instances.values():
+            yield from collector
+
+    def view(self) -> 'ComplexLogView':
+        """
+        Get a lazy view over this collection, which selects variants (and 
+        their instances) through chainable predicates without copying this
+        collection, see `pmkoalas.views`.
+        """
+        from pmkoalas.views import ComplexLogView
+        return ComplexLogView(self)
+
+    def seen_instances_for(self, trace:Trace) -> Tuple[ComplexTrace]:
         """
         Explores this collection for instances of the given 
-        simplified trace, may return instances or an empty collection.
+        simplified trace, returning a tuple of instances that may be empty
+        (use `list(...)` for a mutable copy).
         """
-        if (trace in self._traces):
-            return deepcopy(self._instances[trace]) 
-        else:
-            return []
+        return self._instances_view().get(trace, ())
         
     def get_name(self) -> str:
         " returns the name of this collection."
@@ -311,9 +413,8 @@ class ComplexEventLog():
     def __len__(self) -> int:
         return self.get_population_size()
     
-    def __iter__(self) -> Iterable[Tuple[Trace,List[ComplexTrace]]]:
-        for strace, collector in self._instances.items():
-            yield deepcopy(strace), deepcopy(collector)
+    def __iter__(self) -> Iterable[Tuple[Trace,Tuple[ComplexTrace]]]:
+        return iter(self._instances_view().items())
 
     def __str__(self) -> str:
         if (self._variants < 1):
@@ -322,7 +423,7 @@ class ComplexEventLog():
         _str = "[\n"
         for strace,complexes in self:
             for complex in complexes:
-                _str = _str + "\t" + str(complex)+":"+str(complex.data())+",\n"
+                _str = _str + "\t" + str(complex)+":"+str(complex._map)+",\n"
         _str = _str[:-2] + "\n]"
         return _str
     
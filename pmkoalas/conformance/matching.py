@@ -136,9 +136,9 @@ def find_path_in_tree(tree:TransitionTree, tgt:TransitionTreeVertex)\
     """
     seq = []
     breakdown = Trace([])
-    goal = tgt.sigma_sequence().sequence
+    goal = list(tgt.sigma_sequence().sequence)
     while breakdown != tgt.sigma_sequence():
-        step = Trace(breakdown.sequence + [goal.pop(0)])
+        step = Trace(breakdown.sequence + (goal.pop(0),))
         found = False
         for flow in tree.flows():
             if flow.offering().sigma_sequence() == breakdown:
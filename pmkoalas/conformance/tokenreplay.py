@@ -146,7 +146,7 @@ class PlayoutTrace(ComplexTrace):
         Returns the cut of activity sequence of this playout up to the
         i-th step (if it exists).
         """
-        seq = self.simplify().sequence
+        seq = list(self.simplify().sequence)
         ret = []
         while i > 0 and len(seq) > 0:
             head = seq.pop(0)
@@ -200,7 +200,7 @@ def generate_traces_from_lpn(
                 debug("firable transitions :: " + str(firable))
                 for t in firable:
                     new_mark = sem.fire(t)
-                    new_trace = Trace(trace.sequence + [t.name])
+                    new_trace = Trace(trace.sequence + (t.name,))
                     inprogress.push((new_trace, new_mark))
         pcount += 1
         if (pcount % updates_on == 0):
@@ -459,32 +459,20 @@ def compute_follows_relations(slog:EventLog) -> Set[Tuple[str,str]]:
         acts = slog.seen_activities()
         debug(acts)
         follows = set()
-        # iterate over all traces and compute case 1
+        # compute case 1 over the posting lists of activities, rather than 
+        # scanning all traces for each pair of activities
+        index = slog.activity_index()
         for actB,actA in product(acts,acts):
             if actA == actB:
                 continue
             debug(f"checking {actB} -> {actA}")
-            # collect all executions where both acts occur
-            traces = [ 
-                trace 
-                for trace,_ 
-                in slog.__iter__() 
-                if 
-                    actA in trace.seen_activities() 
-                    and 
-                    actB in trace.seen_activities()
-            ]
-            if (len(traces) == 0):
+            # count the executions where both acts occur, and those where
+            # B follows A
+            both, before = index.first_precedes(actA, actB)
+            if (both == 0):
                 continue
-            # check if B follow A in all traces
-            debug(traces)
-            traces = [
-                1 if _check_follows_for(t,actB,actA) else 0
-                for t 
-                in traces
-            ]
-            debug(traces)
-            if (sum(traces) == len(traces)):
+            debug(f"{actB} follows {actA} in {before}/{both} variants")
+            if (before == both):
                 follows.add((actB,actA))
         # adjust follows based on case 2
         addtions = set()
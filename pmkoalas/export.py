@@ -4,8 +4,8 @@ of event logs constructs to the XES format.
 """
 from pmkoalas import __version__
 
-from pmkoalas.simple import EventLog
-from pmkoalas.complex import ComplexEventLog
+from pmkoalas.simple import EventLog, Trace, DEFAULT_SIMPLE_LOG_NAME
+from pmkoalas.complex import ComplexEventLog, ComplexTrace
 from pmkoalas._logging import debug,info, enable_logging, get_logger
 
 from pmkoalas.xes_export import XesLogExtension, XesLogClassifier
@@ -17,18 +17,133 @@ from pmkoalas.xes_export import XesString, XesInt, XesTime, XesFloat, XesBoolean
 from pmkoalas.xes_export import XES_CONCEPT
 
 from pmkoalas.xes_export import XesTrace,XesEvent
+from pmkoalas.xes import XES_GZIP_SUFFIX, XES_VARIANT_COUNT, is_compressed
 
 import os 
+import gzip
+import re
 import logging
-from typing import Union
+from typing import BinaryIO, Iterator, List, Mapping, Tuple, Union
 from datetime import datetime
 
 from xml.etree import ElementTree as ET
 
 EXPORT_SIMPLE_TRACE_FORMAT = "trace {id:d}"
+EXPORT_VARIANT_TRACE_FORMAT = "variant {id:d}"
+# used by the stream writer, to find where an unfinished document ends
+XES_TRACE_CLOSE = b"</trace>"
+XES_TRACE_OPENING = re.compile(rb"<trace[\s/>]")
+XES_LOG_OPENING = re.compile(rb"<log[\s>]")
+APPEND_BLOCK_SIZE = 2 ** 16
+# the number of variant templates the stream writer keeps
+TEMPLATE_CACHE_LIMIT = 2 ** 12
+
+def _open_target(filepath:str, compress:bool=None) -> BinaryIO:
+    """
+    Opens the file to export to, compressing the output with gzip if 
+    requested or, when compress is not given, if the filepath ends with 
+    `.gz`.
+    """
+    if compress == None:
+        compress = filepath.lower().endswith(XES_GZIP_SUFFIX)
+    if compress:
+        debug(f"compressing while writing :: {filepath}")
+        return gzip.open(filepath, "wb")
+    return open(filepath, "wb")
+
+XES_LOG_CLOSE = "</" + XES_LOG_TAG + ">"
+XES_INDENT = "\t"
+
+def _xes_log_element(name:str, data:Mapping[str,object]=None) -> ET.Element:
+    """
+    Creates the log element with its log-level attributes, but no traces.
+    """
+    # add log element
+    xml_log = ET.Element( XES_LOG_TAG, XES_LOG_ATTRS)
+    # (1) add default extension for concept:name
+    xml_log.append(XesLogExtension(XES_EXT_CONCEPT_NAME,
+        XES_EXT_CONCEPT_PREFIX,
+        XES_EXT_CONCEPT_URI)
+    )
+    # (2) add any globals
+    # (3) add any classifiers
+    xml_log.append(XesLogClassifier("activity-classifier",
+     [XES_CONCEPT]))
+    # (4) add any properties 
+    # add concept:name to log
+    xml_log.append(XesString(XES_CONCEPT, name))
+    # add elements from data
+    if (data != None):
+       for key,val in data.items():
+          xml_log.append(create_xes_attribute(key,val))
+    # add meta_exporter to log as koalas
+    xml_log.append(XesString("meta:exporter", "koalas"))
+    xml_log.append(XesString("meta:exporter:version", 
+     f"{__version__}"))
+    return xml_log
+
+def _xes_header(xml_log:ET.Element, pretty:bool=True) -> bytes:
+    """
+    Serialises the start of a document, from the xml declaration up to the
+    last log-level attribute, leaving the log element open for traces.
+    """
+    if pretty:
+        ET.indent(xml_log, space=XES_INDENT, level=0)
+        close = "\n" + XES_LOG_CLOSE
+    else:
+        close = XES_LOG_CLOSE
+    document = ET.tostring(xml_log, encoding="utf-8", method="xml",
+                           xml_declaration=True)
+    return document[:-len(close)]
+
+def _xes_trace(xml_trace:ET.Element, pretty:bool=True) -> bytes:
+    """
+    Serialises a trace element, to be written after the header or another 
+    trace.
+    """
+    if pretty:
+        ET.indent(xml_trace, space=XES_INDENT, level=1)
+        return ("\n" + XES_INDENT).encode("utf-8") + \
+            ET.tostring(xml_trace, encoding="utf-8", method="xml")
+    return ET.tostring(xml_trace, encoding="utf-8", method="xml")
+
+def _xes_footer(pretty:bool=True) -> bytes:
+    """
+    Serialises the end of a document, closing the log element.
+    """
+    if pretty:
+        return ("\n" + XES_LOG_CLOSE).encode("utf-8")
+    return XES_LOG_CLOSE.encode("utf-8")
+
+EXPORT_TEMPLATE_NAME = "trace-name"
+
+def _xes_variant_template(trace:Trace, pretty:bool=True, count:int=None) \
+        -> Tuple[bytes,bytes]:
+    """
+    Serialises a trace variant once, returning the bytes before and after 
+    the concept:name value of the trace, so that instances of the variant 
+    can be written by only filling in their name. If count is given, the 
+    trace records the number of cases of the variant.
+    """
+    xml_trace = XesTrace(EXPORT_TEMPLATE_NAME)
+    if count != None:
+        xml_trace.append(XesInt(XES_VARIANT_COUNT, count))
+    # generate subelements
+    for act in trace.__iter__():
+        ev = XesEvent()
+        # add concept for event
+        ev.append(XesString(XES_CONCEPT, act))
+        xml_trace.append(ev)
+    template = _xes_trace(xml_trace, pretty)
+    if (get_logger().isEnabledFor(logging.DEBUG)):
+        debug(f"Generated variant template :: {template}")
+    # the name of the trace is its first attribute, so it is the first match
+    before, after = template.split(EXPORT_TEMPLATE_NAME.encode("utf-8"), 1)
+    return before, after
 
 @enable_logging
-def export_to_xes_simple(filepath:str, log:EventLog) -> None:
+def export_to_xes_simple(filepath:str, log:EventLog, compress:bool=None,
+                         pretty:bool=True, variants:bool=False) -> None:
     """
     This exports a simple event log structure out into an XES format but 
     consider the following before using:
@@ -39,9 +154,17 @@ def export_to_xes_simple(filepath:str, log:EventLog) -> None:
        concept:name based on seen order from log.
     - For each trace variant, we add x number of traces, based on how many 
        times a variant is seen.
+    - Unless variants is `True`, then each trace variant is added once, 
+       named by seen order, with the number of times it is seen as its 
+       meta:variant:count. Reading such a log with `read_xes_simple` 
+       restores the frequencies of variants.
     - Eventlogs will have concept:name, using the name from the event log.
     - We do not assume that the filepath exists, and will create the parent 
       directory path if does not exist.
+    - The output is gzip compressed if compress is `True`, or if compress is
+      not given and the filepath ends with `.gz`.
+    - Traces are written out one at a time, so the document is never held in
+      memory. Each trace is indented as it is written if pretty is `True`.
     """
 
     info(f"exporting log of size :: {len(log)}")
@@ -52,67 +175,33 @@ def export_to_xes_simple(filepath:str, log:EventLog) -> None:
 
         info(f"made directory for :: {filepath}")
 
-    with open(filepath,"wb") as flog:
-        # add log element
-        xml_log = ET.Element( XES_LOG_TAG, XES_LOG_ATTRS)
-        # make xml docuement
-        xml_tree = ET.ElementTree(xml_log)
-        # (1) add default extension for concept:name
-        xml_log.append(XesLogExtension(XES_EXT_CONCEPT_NAME,
-            XES_EXT_CONCEPT_PREFIX,
-            XES_EXT_CONCEPT_URI)
-        )
-        # (2) add any globals
-        # (3) add any classifiers
-        xml_log.append(XesLogClassifier("activity-classifier",
-         [XES_CONCEPT]))
-        # (4) add any properties 
-        # add concept:name to log
-        xml_log.append(XesString(XES_CONCEPT, log.get_name()))
-        # add meta_exporter to log as koalas
-        xml_log.append(XesString("meta:exporter", "koalas"))
-        xml_log.append(XesString("meta:exporter:version", 
-         f"{__version__}"))
+    with _open_target(filepath, compress) as flog:
+        flog.write(_xes_header(_xes_log_element(log.get_name()), pretty))
         # add traces
         trace_id = 1
         debug("starting trace conversion")
-        for trace,count in log.__iter__():
-            events = []
+        for variant_id, (trace,count) in enumerate(log.__iter__(), 1):
+            debug(f"Generating events for variant ::"+
+             f"{trace} x {count}")
+            if variants:
+                before, after = _xes_variant_template(trace, pretty, count)
+                flog.write(before)
+                flog.write(EXPORT_VARIANT_TRACE_FORMAT.format(
+                  id=variant_id).encode("utf-8"))
+                flog.write(after)
+                trace_id += count
+                continue
+            # serialise the variant once, instances only differ by name
+            before, after = _xes_variant_template(trace, pretty)
             # add a trace, count times
             for _ in range(count):
-                # generate parent trace
-                xml_trace = XesTrace(EXPORT_SIMPLE_TRACE_FORMAT.format(
-                  id=trace_id))
-
-                # only generate events once
-                if (len(events) != len(trace)):
-                  debug(f"Generating events for variant ::"+
-                   f"{trace} x {count}")
-                  # generate subelements
-                  for act in trace.__iter__():
-                      ev = XesEvent()
-                      # add concept for event
-                      ev.append(XesString(XES_CONCEPT, act))
-                      # keep event
-                      events.append(ev)  
-
-                  if (get_logger().isEnabledFor(logging.DEBUG)):
-                    debug(f"Generated sequence of events :: "+
-                     f"{[ ET.tostring(e) for e in events ]}")
-
-                # add events as subelements
-                for ev in events:
-                    xml_trace.append(ev) 
-
-                # after adding all events to trace, add element to log
-                xml_log.append(xml_trace)
-
+                flog.write(before)
+                flog.write(EXPORT_SIMPLE_TRACE_FORMAT.format(
+                  id=trace_id).encode("utf-8"))
+                flog.write(after)
                 trace_id += 1
         debug(f"exported traces :: {trace_id-1}")
-        # write out xml to file
-        ET.indent(xml_tree, space="\t", level=0)
-        xml_tree.write(flog, encoding="utf-8", method="xml",
-         xml_declaration=True)
+        flog.write(_xes_footer(pretty))
     
     info(f"exported log to :: {filepath}")
 
@@ -129,8 +218,90 @@ def create_xes_attribute(key:str, value:object) -> Union[XesString, XesInt, XesT
       return XesString(key, value)
 
 
+def _xes_complex_trace(trace:ComplexTrace, trace_id:int) -> ET.Element:
+    """
+    Creates the trace element for a complex trace, using its concept:name 
+    if it has one and otherwise a dummy name based on trace_id.
+    """
+    # attributes are only read to be serialised, so they are not copied
+    trace_data = trace._map
+    events = []
+    # generate complex trace
+    if ( XES_CONCEPT in trace_data.keys()):
+      name = trace_data[XES_CONCEPT]
+    else:
+      name = EXPORT_SIMPLE_TRACE_FORMAT.format(
+        id=trace_id)
+    xml_trace = XesTrace(name)
+    # generate events
+    if (get_logger().isEnabledFor(logging.DEBUG)):
+      debug(f"Generating events for variant ::"+
+      f"{trace}")
+    # generate subelements
+    for cev in trace:
+        xml_ev = XesEvent()
+        # add concept for event
+        xml_ev.append(XesString(XES_CONCEPT, cev.activity()))
+        # add other attributes to event
+        for key,val in cev._map.items():
+           if key == XES_CONCEPT:
+              continue
+           else:
+              xml_ev.append(create_xes_attribute(key,val))
+        # keep event
+        events.append(xml_ev)  
+
+    if (get_logger().isEnabledFor(logging.DEBUG)):
+      debug(f"Generated sequence of events :: "+
+      f"{[ ET.tostring(e) for e in events ]}")
+
+    # add attributes to trace
+    for key,val in trace_data.items():
+       if key == XES_CONCEPT:
+          continue
+       else:
+          xml_trace.append(create_xes_attribute(key,val))
+
+    # add events as subelements
+    for xml_ev in events:
+        xml_trace.append(xml_ev) 
+    return xml_trace
+
+EXPORT_CHUNK_SIZE = 2 ** 10
+
+def _chunk_instances(log:ComplexEventLog, size:int) \
+        -> Iterator[Tuple[int,List[ComplexTrace]]]:
+    """
+    Splits the instances of a complex log into chunks of up to size traces,
+    along with the dummy trace id of the first trace in each chunk.
+    """
+    first = 1
+    chunk = []
+    for trace in log.iter_instances():
+        chunk.append(trace)
+        if len(chunk) == size:
+            yield first, chunk
+            first += len(chunk)
+            chunk = []
+    if len(chunk) > 0:
+        yield first, chunk
+
+def _serialise_complex_chunk(traces:List[ComplexTrace], first:int, 
+                             pretty:bool) -> bytes:
+    """
+    Serialises a chunk of complex traces, where the first trace has the 
+    given dummy trace id.
+    """
+    return b"".join(
+        _xes_trace(_xes_complex_trace(trace, trace_id), pretty)
+        for trace_id, trace
+        in enumerate(traces, first)
+    )
+
 @enable_logging
-def export_to_xes_complex(filepath:str, log:ComplexEventLog) -> None:
+def export_to_xes_complex(filepath:str, log:ComplexEventLog, 
+                          compress:bool=None, pretty:bool=True,
+                          workers:int=1) -> None:
     """
     This exports a complex event log structure out into an XES format but 
     consider the following before using:
@@ -142,11 +313,18 @@ def export_to_xes_complex(filepath:str, log:ComplexEventLog) -> None:
     - Eventlogs will have concept:name, using the name from the event log.
     - We do not assume that the filepath exists, and will create the parent 
       directory path if does not exist.
+    - The output is gzip compressed if compress is `True`, or if compress is
+      not given and the filepath ends with `.gz`.
+    - Traces are written out one at a time, so the document is never held in
+      memory. Each trace is indented as it is written if pretty is `True`.
+    - By default traces are serialised serially. If workers is not 1, chunks
+      of traces are serialised in a pool of processes (as per joblib's 
+      n_jobs) and written out in order.
     """
 
     if (isinstance(log, EventLog)):
         info("Changing to simple version as given log was simple")
-        export_to_xes_simple(filepath, log)
+        export_to_xes_simple(filepath, log, compress, pretty)
         return 
     elif (not isinstance(log, ComplexEventLog)):
         raise ValueError(f"Was expecting a complex event log, but was given :: {type(log)}")
@@ -159,85 +337,196 @@ def export_to_xes_complex(filepath:str, log:ComplexEventLog) -> None:
 
         info(f"made directory for :: {filepath}")
 
-    with open(filepath,"wb") as flog:
-        # add log element
-        xml_log = ET.Element( XES_LOG_TAG, XES_LOG_ATTRS)
-        # make xml docuement
-        xml_tree = ET.ElementTree(xml_log)
-        # (1) add default extension for concept:name
-        xml_log.append(XesLogExtension(XES_EXT_CONCEPT_NAME,
-            XES_EXT_CONCEPT_PREFIX,
-            XES_EXT_CONCEPT_URI)
-        )
-        # (2) add any globals
-        # (3) add any classifiers
-        xml_log.append(XesLogClassifier("activity-classifier",
-         [XES_CONCEPT]))
-        # (4) add any properties 
-        # add concept:name to log
-        xml_log.append(XesString(XES_CONCEPT, log.get_name()))
-        # add elements from data
-        if (log.data() != None):
-           for key,val in log.data().items():
-              xml_log.append(create_xes_attribute(key,val))
-        # add meta_exporter to log as koalas
-        xml_log.append(XesString("meta:exporter", "koalas"))
-        xml_log.append(XesString("meta:exporter:version", 
-         f"{__version__}"))
+    with _open_target(filepath, compress) as flog:
+        flog.write(_xes_header(
+            _xes_log_element(log.get_name(), log.data()), pretty))
         # add traces
         trace_id = 1
         debug("starting trace conversion")
-        for _,complexes in log.get_instances().items():
-            for trace in complexes:
-              events = []
-              # generate complex trace
-              xml_trace = None
-              if ( XES_CONCEPT in trace.data().keys()):
-                name = trace.data()[XES_CONCEPT]
-              else:
-                name = EXPORT_SIMPLE_TRACE_FORMAT.format(
-                  id=trace_id)
-              xml_trace = XesTrace(name)
-              # generate events
-              debug(f"Generating events for variant ::"+
-              f"{trace}")
-              # generate subelements
-              for cev in trace:
-                  xml_ev = XesEvent()
-                  # add concept for event
-                  xml_ev.append(XesString(XES_CONCEPT, cev.activity()))
-                  # add other attributes to event
-                  for key,val in cev.data().items():
-                     if key == XES_CONCEPT:
-                        continue
-                     else:
-                        xml_ev.append(create_xes_attribute(key,val))
-                  # keep event
-                  events.append(xml_ev)  
-
-              if (get_logger().isEnabledFor(logging.DEBUG)):
-                debug(f"Generated sequence of events :: "+
-                f"{[ ET.tostring(e) for e in events ]}")
-
-              # add attributes to trace
-              for key,val in trace.data().items():
-                 if key == XES_CONCEPT:
-                    continue
-                 else:
-                    xml_trace.append(create_xes_attribute(key,val))
-
-              # add events as subelements
-              for xml_ev in events:
-                  xml_trace.append(xml_ev) 
-
-              # after adding all events to trace, add element to log
-              xml_log.append(xml_trace)
-              trace_id += 1
+        if workers == 1:
+            for trace in log.iter_instances():
+                xml_trace = _xes_complex_trace(trace, trace_id)
+                # write out the trace, so that only one trace is kept
+                flog.write(_xes_trace(xml_trace, pretty))
+                trace_id += 1
+        else:
+            from joblib import Parallel, delayed
+            info(f"serialising traces with {workers} workers ...")
+            pool = Parallel(n_jobs=workers, return_as="generator")
+            # chunks are written out in order as they are serialised
+            for chunk in pool(
+                delayed(_serialise_complex_chunk)(traces, first, pretty)
+                for first, traces 
+                in _chunk_instances(log, EXPORT_CHUNK_SIZE)):
+                flog.write(chunk)
+            trace_id += len(log)
 
         debug(f"exported traces :: {trace_id-1}")
-        # write out xml to file
-        ET.indent(xml_tree, space="\t", level=0)
-        xml_tree.write(flog, encoding="utf-8", method="xml",
-         xml_declaration=True)
+        flog.write(_xes_footer(pretty))
     
-    info(f"exported log to :: {filepath}")
\ No newline at end of file
+    info(f"exported log to :: {filepath}")
+
+
+def _find_last_trace(source:BinaryIO) -> Tuple[int,int]:
+    """
+    Scans a document for closing trace tags, returning the number of traces
+    and the offset just after the last trace (or -1 if there are none).
+    """
+    count, last, offset, carry = 0, -1, 0, b""
+    for block in iter(lambda: source.read(APPEND_BLOCK_SIZE), b""):
+        data = carry + block
+        base = offset - len(carry)
+        pos = data.find(XES_TRACE_CLOSE)
+        while pos >= 0:
+            count += 1
+            last = base + pos + len(XES_TRACE_CLOSE)
+            pos = data.find(XES_TRACE_CLOSE, pos + 1)
+        # a tag split over blocks is found with the next block
+        carry = data[-(len(XES_TRACE_CLOSE) - 1):]
+        offset += len(block)
+    return count, last
+
+def _find_header_end(document:bytes) -> int:
+    """
+    Finds the offset just after the last complete element of the header of
+    a document without complete traces, ignoring an unfinished trace and 
+    the closing of the log (or -1 if the log is never opened).
+    """
+    end = document.rfind(XES_LOG_CLOSE.encode("utf-8"))
+    if end < 0:
+        end = len(document)
+    opening = XES_TRACE_OPENING.search(document, 0, end)
+    if opening != None:
+        end = opening.start()
+    log = XES_LOG_OPENING.search(document, 0, end)
+    last = document.rfind(b">", 0, end)
+    if log == None or last < log.start():
+        return -1
+    return last + 1
+
+class XesStreamWriter():
+    """
+    Writes an XES document incrementally, so that traces can be exported 
+    as they are produced without keeping a log in memory. Log-level 
+    attributes are written once when the writer is opened, traces are 
+    written by `write_trace`, and the document is closed when the writer 
+    is closed (or the with block is left).
+
+    Parameters
+    ----------
+    filepath: `str`
+    \t the filepath to write to, parent directories are created if needed.
+    name: `str`=`"simple"`
+    \t the concept:name of the log.
+    data: `Mapping[str,object]`=`None`
+    \t other log-level attributes.
+    compress: `bool`=`None`
+    \t whether to gzip the output, by default if the filepath ends with 
+    \t `.gz`.
+    pretty: `bool`=`True`
+    \t whether each trace is indented as it is written.
+    append: `bool`=`False`
+    \t if `True` and the file exists, traces are added to the end of the 
+    \t document instead, keeping its log-level attributes (name and data 
+    \t are ignored). Any incomplete trace left by an unfinished write is 
+    \t dropped. Only uncompressed documents written by koalas can be 
+    \t appended to.
+
+    Example
+    -------
+    with XesStreamWriter("out.xes", name="simulated") as writer:
+        for trace in simulation:
+            writer.write_trace(trace)
+    """
+
+    def __init__(self, filepath:str, name:str=DEFAULT_SIMPLE_LOG_NAME,
+                 data:Mapping[str,object]=None, compress:bool=None, 
+                 pretty:bool=True, append:bool=False) -> None:
+        self._filepath = filepath
+        self._name = name
+        self._data = data
+        self._compress = compress
+        self._pretty = pretty
+        self._append = append
+        self._target = None
+        self._traces = 0
+        self._templates = dict()
+
+    def open(self) -> 'XesStreamWriter':
+        """
+        Opens the document, writing the log-level attributes or, when 
+        appending, moving past the last complete trace of the document.
+        """
+        if self._target != None:
+            raise ValueError(f"writer is already open for :: {self._filepath}")
+        filepath = self._filepath
+        if (self._append and os.path.exists(filepath)):
+            if self._compress or is_compressed(filepath):
+                raise ValueError(
+                    f"unable to append to a compressed log :: {filepath}")
+            target = open(filepath, "r+b")
+            count, last = _find_last_trace(target)
+            if last < 0:
+                # no complete traces yet, so continue after the header
+                target.seek(0)
+                last = _find_header_end(target.read())
+                if last < 0:
+                    target.close()
+                    raise ValueError(
+                        f"unable to find the start of the log :: {filepath}")
+            target.seek(last)
+            target.truncate()
+            self._traces = count
+            info(f"appending after {count} traces to :: {filepath}")
+        else:
+            if (not os.path.exists(os.path.dirname(filepath))):
+                os.makedirs(os.path.dirname(filepath),exist_ok=True)
+                info(f"made directory for :: {filepath}")
+            target = _open_target(filepath, self._compress)
+            target.write(_xes_header(
+                _xes_log_element(self._name, self._data), self._pretty))
+        self._target = target
+        return self
+
+    def write_trace(self, trace:Union[Trace,ComplexTrace]) -> None:
+        """
+        Writes a trace to the end of the document. Simple traces are given 
+        a dummy concept:name based on the number of traces written.
+        """
+        if self._target == None:
+            raise ValueError("writer is not open, use open or a with block")
+        self._traces += 1
+        if isinstance(trace, ComplexTrace):
+            self._target.write(_xes_trace(
+                _xes_complex_trace(trace, self._traces), self._pretty))
+            return
+        # instances of a variant only differ by name
+        if trace not in self._templates:
+            if len(self._templates) >= TEMPLATE_CACHE_LIMIT:
+                self._templates.clear()
+            self._templates[trace] = _xes_variant_template(trace, 
+                                                           self._pretty)
+        before, after = self._templates[trace]
+        self._target.write(before)
+        self._target.write(EXPORT_SIMPLE_TRACE_FORMAT.format(
+            id=self._traces).encode("utf-8"))
+        self._target.write(after)
+
+    def close(self) -> None:
+        """
+        Closes the document, after which it is a complete XES log.
+        """
+        if self._target == None:
+            return
+        try:
+            self._target.write(_xes_footer(self._pretty))
+        finally:
+            self._target.close()
+            self._target = None
+        info(f"exported {self._traces} traces to :: {self._filepath}")
+
+    def __enter__(self) -> 'XesStreamWriter':
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
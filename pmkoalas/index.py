@@ -0,0 +1,349 @@
+"""
+This module contains indexes over the variants of a simplified event log,
+which answer queries about variants without scanning every variant.
+
+Included are the following structures:
+    - `VariantIndex`, a prefix trie (and a lazily built suffix trie) over
+      variants that answers prefix, suffix and wildcard pattern queries.
+    - `PatternMatch`, the variants matched by a query.
+    - `ActivityIndex`, an inverted index from activities to the variants
+      (and positions) where they occur.
+
+Patterns are sequences of activities, where `PATTERN_GAP` ("*") matches
+any number of activities and `PATTERN_ANY` ("?") matches exactly one
+activity, i.e. `("*","a","b","*")` matches any variant where a is directly
+followed by b.
+"""
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Sequence, \
+    Tuple, Union
+
+from pmkoalas._logging import info
+
+# only evaluate these classes if we are type checking/hinting
+# prevents cyclic imports
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from pmkoalas.simple import EventLog, Trace
+
+PATTERN_GAP = "*"
+PATTERN_ANY = "?"
+
+class _TrieNode():
+    """
+    A node of a trie over variants, keeping the total frequency of the
+    variants passing through it and the variant ending at it (if any).
+    """
+    __slots__ = ("children", "frequency", "variant", "count")
+
+    def __init__(self) -> None:
+        self.children = dict()
+        self.frequency = 0
+        self.variant = None
+        self.count = 0
+
+    def walk(self) -> Iterator[Tuple['Trace',int]]:
+        "Yields the variants (and their frequencies) ending below this node."
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.variant is not None:
+                yield node.variant, node.count
+            stack.extend(node.children.values())
+
+def _build_trie(variants:Iterable[Tuple['Trace',int]],
+                reverse:bool=False) -> _TrieNode:
+    "Builds a trie over the given variants, read backwards if reverse."
+    root = _TrieNode()
+    for trace, freq in variants:
+        node = root
+        node.frequency += freq
+        for act in (reversed(trace.sequence) if reverse else trace.sequence):
+            child = node.children.get(act)
+            if child is None:
+                child = _TrieNode()
+                node.children[act] = child
+            node = child
+            node.frequency += freq
+        node.variant = trace
+        node.count = freq
+    return root
+
+class PatternMatch():
+    """
+    The variants matched by a query over a `VariantIndex`, kept as the
+    subtrees of the trie where all variants match and the single variants
+    that match. The total frequency is known without enumerating variants.
+    """
+
+    def __init__(self, subtrees:List[_TrieNode]=None,
+                 singles:List[_TrieNode]=None) -> None:
+        self._subtrees = [] if subtrees is None else subtrees
+        self._singles = [] if singles is None else singles
+        self.frequency = sum( node.frequency for node in self._subtrees ) \
+            + sum( node.count for node in self._singles )
+
+    def variants(self) -> Dict['Trace',int]:
+        "Get the matched variants and their frequencies."
+        matched = dict()
+        for node in self._subtrees:
+            matched.update(node.walk())
+        for node in self._singles:
+            matched[node.variant] = node.count
+        return matched
+
+    def __len__(self) -> int:
+        "Get the number of matched variants."
+        return sum( 1 for node in self._subtrees for _ in node.walk() ) \
+            + len(self._singles)
+
+    def __bool__(self) -> bool:
+        return self.frequency > 0
+
+    def __iter__(self) -> Iterator[Tuple['Trace',int]]:
+        return iter(self.variants().items())
+
+    def __repr__(self) -> str:
+        return f"PatternMatch(variants={len(self)}, " \
+            + f"frequency={self.frequency})"
+
+class VariantIndex():
+    """
+    An index over the variants of a language, built as a prefix trie where
+    each node knows the total frequency of the variants below it. A trie
+    over reversed variants is only built when a query needs it.
+    """
+
+    def __init__(self, log:'EventLog') -> None:
+        self._log = log
+        self._acts = log.seen_activities()
+        info("building variant index...")
+        self._forward = _build_trie(log)
+        self._backward = None
+
+    def _suffixes(self) -> _TrieNode:
+        "Get the trie over reversed variants, building it once."
+        if self._backward is None:
+            info("building reversed variant index...")
+            self._backward = _build_trie(self._log, reverse=True)
+        return self._backward
+
+    @staticmethod
+    def _descend(root:_TrieNode,
+                 sequence:Iterable[str]) -> Union[_TrieNode,None]:
+        "Follows the given sequence from root, if possible."
+        node = root
+        for act in sequence:
+            node = node.children.get(act)
+            if node is None:
+                return None
+        return node
+
+    def prefix(self, prefix:Iterable[str]) -> PatternMatch:
+        "Get the variants starting with the given prefix."
+        node = self._descend(self._forward, prefix)
+        return PatternMatch([node] if node is not None else [])
+
+    def suffix(self, suffix:Sequence[str]) -> PatternMatch:
+        "Get the variants ending with the given suffix."
+        node = self._descend(self._suffixes(), reversed(tuple(suffix)))
+        return PatternMatch([node] if node is not None else [])
+
+    def frequency(self, trace:Iterable[str]) -> int:
+        "Get the frequency of the given variant, or zero if not seen."
+        node = self._descend(self._forward, trace)
+        return node.count if node is not None else 0
+
+    def match(self, pattern:Iterable[str]) -> PatternMatch:
+        """
+        Get the variants matching the given pattern, where PATTERN_GAP
+        matches any number of activities and PATTERN_ANY matches exactly one
+        activity. Patterns are matched from whichever end is more
+        selective.
+        """
+        pattern = tuple(pattern)
+        literals = [ act for act in pattern
+                     if act != PATTERN_GAP and act != PATTERN_ANY ]
+        # a pattern over unseen activities cannot match
+        if any( act not in self._acts for act in literals ):
+            return PatternMatch()
+        if self._anchored(pattern) >= self._anchored(pattern[::-1]):
+            return self._match(self._forward, pattern)
+        return self._match(self._suffixes(), pattern[::-1])
+
+    def __contains__(self, pattern:Iterable[str]) -> bool:
+        return bool(self.match(pattern))
+
+    @staticmethod
+    def _anchored(pattern:Tuple[str]) -> int:
+        "Counts the activities before the first gap of the pattern."
+        count = 0
+        for act in pattern:
+            if act == PATTERN_GAP:
+                break
+            if act != PATTERN_ANY:
+                count += 1
+        return count
+
+    @staticmethod
+    def _match(root:_TrieNode, pattern:Tuple[str]) -> PatternMatch:
+        """
+        Matches the pattern over the trie, by running the pattern as a
+        non-deterministic automaton while descending the trie. Descent stops
+        when no state is left, and when only gaps remain in the pattern the
+        whole subtree matches.
+        """
+        size = len(pattern)
+        # states from tail onwards only have gaps left
+        tail = size
+        while tail > 0 and pattern[tail-1] == PATTERN_GAP:
+            tail -= 1
+
+        def close(states:Iterable[int]) -> FrozenSet[int]:
+            closed = set()
+            for state in states:
+                closed.add(state)
+                while state < size and pattern[state] == PATTERN_GAP:
+                    state += 1
+                    closed.add(state)
+            return frozenset(closed)
+
+        def step(states:FrozenSet[int], act:str) -> FrozenSet[int]:
+            nexts = []
+            for state in states:
+                if state >= size:
+                    continue
+                token = pattern[state]
+                if token == PATTERN_GAP:
+                    nexts.append(state)
+                elif token == PATTERN_ANY or token == act:
+                    nexts.append(state + 1)
+            return close(nexts)
+
+        # the automaton is made deterministic while descending, where all 
+        # activities outside of the pattern step alike
+        literals = set(pattern) - set([PATTERN_GAP, PATTERN_ANY])
+        ids = dict()
+        kinds = []
+        steps = []
+        sets = []
+        def state_id(states:FrozenSet[int]) -> int:
+            if states not in ids:
+                ids[states] = len(kinds)
+                if not states:
+                    kinds.append(None)
+                elif tail < size and max(states) >= tail:
+                    kinds.append("subtree")
+                else:
+                    kinds.append("single" if size in states else "")
+                steps.append(dict())
+                sets.append(states)
+            return ids[states]
+
+        subtrees, singles = [], []
+        stack = [(root, state_id(close([0])))]
+        while stack:
+            node, state = stack.pop()
+            kind = kinds[state]
+            if kind == "subtree":
+                subtrees.append(node)
+                continue
+            if kind == "single" and node.variant is not None:
+                singles.append(node)
+            nexts = steps[state]
+            for act, child in node.children.items():
+                nxt = nexts.get(act)
+                if nxt is None:
+                    key = act if act in literals else None
+                    nxt = nexts.get(key)
+                    if nxt is None:
+                        nxt = state_id(step(sets[state], act))
+                        nexts[key] = nxt
+                    nexts[act] = nxt
+                if kinds[nxt] is not None:
+                    stack.append((child, nxt))
+        return PatternMatch(subtrees, singles)
+
+class ActivityIndex():
+    """
+    An inverted index over the variants of a language, where each activity
+    has a posting list of the variants it occurs in, along with the
+    positions it occurs at. Variants are identified by their position in
+    the language (see `variant`), and posting lists are in variant order.
+    """
+
+    def __init__(self, log:'EventLog') -> None:
+        info("building activity index...")
+        self._variants = list(log)
+        postings = dict()
+        for vid, (trace, _) in enumerate(self._variants):
+            for pos, act in enumerate(trace.sequence):
+                occurs = postings.get(act)
+                if occurs is None:
+                    occurs = dict()
+                    postings[act] = occurs
+                if vid in occurs:
+                    occurs[vid].append(pos)
+                else:
+                    occurs[vid] = [pos]
+        self._postings = dict(
+            (act, dict( (vid, tuple(positions)) 
+                        for vid, positions in occurs.items() ))
+            for act, occurs in postings.items()
+        )
+
+    def variant(self, vid:int) -> Tuple['Trace',int]:
+        "Get the variant (and its frequency) with the given identifier."
+        return self._variants[vid]
+
+    def postings(self, act:str) -> Dict[int,Tuple[int]]:
+        """
+        Get the posting list of an activity, mapping the variants where it 
+        occurs to the positions it occurs at. Do not modify the result.
+        """
+        return self._postings.get(act, {})
+
+    def containing(self, *acts:str) -> List[int]:
+        """
+        Get the variants where all of the given activities occur, by 
+        intersecting posting lists from the shortest one.
+        """
+        lists = sorted(( self.postings(act) for act in set(acts) ), key=len)
+        if not lists:
+            return list(range(len(self._variants)))
+        rest = lists[1:]
+        return [ vid for vid in lists[0] 
+                 if all( vid in other for other in rest ) ]
+
+    def eventually_follows(self, actA:str, actB:str) -> List[int]:
+        """
+        Get the variants where some instance of actA is eventually followed
+        by some instance of actB.
+        """
+        alist, blist = self.postings(actA), self.postings(actB)
+        if len(blist) < len(alist):
+            vids = ( vid for vid in blist if vid in alist )
+        else:
+            vids = ( vid for vid in alist if vid in blist )
+        return [ vid for vid in vids if alist[vid][0] < blist[vid][-1] ]
+
+    def first_precedes(self, actA:str, actB:str) -> Tuple[int,int]:
+        """
+        Counts the variants where both activities occur, and those where the
+        first instance of actA occurs before the first instance of actB.
+        """
+        alist, blist = self.postings(actA), self.postings(actB)
+        if len(blist) < len(alist):
+            alist, blist = blist, alist
+            flip = True
+        else:
+            flip = False
+        both, before = 0, 0
+        for vid, positions in alist.items():
+            other = blist.get(vid)
+            if other is None:
+                continue
+            both += 1
+            if (positions[0] > other[0]) if flip \
+                else (positions[0] < other[0]):
+                before += 1
+        return both, before
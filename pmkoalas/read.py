@@ -2,19 +2,31 @@
 This module provides functions to read in an XES formatted event log in various forms.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from os import path
 from datetime import datetime
-from typing import List, Mapping
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Mapping
+from typing import Set, Tuple, Union
 from copy import deepcopy
+from itertools import chain, islice
+from functools import partial
+from random import Random
+from html import unescape
+from sys import intern
+from math import ceil
+from array import array
+import gzip
+import re
 
-from xml.etree.ElementTree import Element, parse
+from xml.etree.ElementTree import Element, XMLPullParser, fromstring
 
-from pmkoalas.simple import EventLog, Trace
+from pmkoalas.simple import EventLog, Trace, ActivityAlphabet
 from pmkoalas.complex import ComplexEvent, ComplexTrace, ComplexEventLog
 from pmkoalas._logging import debug, info, enable_logging
+from pmkoalas import _cache
 from pmkoalas.xes import XES_CONCEPT,XES_TIME,XES_XML_NAMESPACE
+from pmkoalas.xes import XES_VARIANT_COUNT, is_compressed
 
 from pmkoalas.xes_export import XES_STRING_TAG, XES_TIME_TAG , XES_INT_TAG
 from pmkoalas.xes_export import XES_FLOAT_TAG, XES_BOOLEAN_TAG
@@ -96,9 +108,547 @@ def find_element(root:Element, find:str, use_namespace:bool) -> List[Element]:
     else: 
         return [ event for event in root.findall(f"{find}")]
 
+def _local_name(tag:str) -> str:
+    """
+    Returns the tag of an element without its namespace, i.e.
+    `{http://www.xes-standard.org/}trace` becomes `trace`.
+    """
+    return tag.rsplit("}", 1)[-1]
+
+def _open_xes(filepath:str) -> BinaryIO:
+    """
+    Opens a XES document for reading, where compressed documents are
+    decompressed as they are read.
+    """
+    if is_compressed(filepath):
+        debug(f"decompressing while reading :: {filepath}")
+        return gzip.open(filepath, "rb")
+    return open(filepath, "rb")
+
+READ_BLOCK_SIZE = 2 ** 16
+
+def _read_blocks(filepath:str, start:int=0, end:int=None) -> Iterator[bytes]:
+    """
+    Reads the bytes of a XES document in blocks, optionally restricted to 
+    the byte range between start and end (only for uncompressed documents).
+    """
+    with _open_xes(filepath) as source:
+        if start > 0:
+            source.seek(start)
+        remaining = -1 if end == None else end - start
+        while remaining != 0:
+            size = READ_BLOCK_SIZE if remaining < 0 \
+                else min(READ_BLOCK_SIZE, remaining)
+            block = source.read(size)
+            if not block:
+                break
+            if remaining > 0:
+                remaining -= len(block)
+            yield block
+
+def _parse_log_children(blocks:Iterable[bytes]) -> Iterator[Element]:
+    """
+    Incrementally parses the blocks of an XES document and yields each child
+    of the log element once it has been completely parsed. After the caller
+    moves on, the child is cleared and detached from the log element, so at 
+    most one child (i.e. one trace) is held in memory at a time.
+    """
+    depth = 0
+    root = None
+    parser = XMLPullParser(events=("start", "end"))
+    def children(events) -> Iterator[Element]:
+        nonlocal depth, root
+        for action, elem in events:
+            if action == "start":
+                if depth == 0:
+                    root = elem
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 1:
+                    yield elem
+                    elem.clear()
+                    root.remove(elem)
+    for block in blocks:
+        parser.feed(block)
+        yield from children(parser.read_events())
+    parser.close()
+    yield from children(parser.read_events())
+    if root == None:
+        raise ValueError("Unable to find log element in xml structure")
+
+def _stream_log_children(filepath:str) -> Iterator[Element]:
+    """
+    Streams the children of the log element in an XES document, see 
+    `_parse_log_children`.
+
+    Parameters
+    ----------
+    filepath: `str`
+    \t the xes document to parse, which may be gzip compressed.
+    """
+    return _parse_log_children(_read_blocks(filepath))
+
+def _peek(iterable:Iterable) -> Iterator:
+    """
+    Advances a lazy iterable by one element and returns an iterator that 
+    still produces every element. Used to make a stream consume the log-level
+    attributes that precede the first trace.
+    """
+    iterator = iter(iterable)
+    for first in iterator:
+        return chain([first], iterator)
+    return iter([])
+
+@dataclass
+class XesLogHeader:
+    """
+    The log-level information of an XES document, i.e. the name of the log
+    and the attributes stated on the log element.
+    """
+    name:str = "Unknown Event log"
+    data:Dict[str,object] = field(default_factory=dict)
+
+def _convert_attribute(child:Element) -> object:
+    """
+    Converts an attribute element into its python value.
+    """
+    return XesAttribute(
+        find_xes_type(child.tag),
+        child.attrib.get('key'),
+        child.attrib.get("value")
+    ).get()
+
+def _stream_traces(children:Iterable[Element], 
+                   header:XesLogHeader) -> Iterator[Element]:
+    """
+    Streams the trace elements from the children of a log element, while 
+    recording any log-level attributes seen into the given header.
+    """
+    named = False
+    for child in children:
+        if _local_name(child.tag) == "trace":
+            yield child
+            continue
+        key = child.attrib.get('key')
+        if (key == None):
+            continue
+        header.data[key] = _convert_attribute(child)
+        if not named and key == XES_CONCEPT:
+            header.name = child.attrib.get("value")
+            named = True
+            debug(f"extracted event log name :: {header.name}")
+
+def _as_whitelist(keys:Iterable[str]) -> Union[Set[str],None]:
+    """
+    Converts an optional collection of attribute keys into a set for 
+    quick lookups, where `None` denotes that every key is kept.
+    """
+    if keys == None:
+        return None
+    if isinstance(keys, str):
+        return frozenset([keys])
+    return frozenset(keys)
+
+# the events (as pairs of an activity and its attributes) and the 
+# attributes of a complex trace
+ComplexParts = Tuple[List[Tuple[str,Dict[str,object]]],Dict[str,object]]
+
+def _complex_from_parts(parts:ComplexParts) -> ComplexTrace:
+    """
+    Creates a complex trace from its parts, which are taken over rather 
+    than copied. The parts must not be kept or modified by the caller.
+    """
+    events, trace_map = parts
+    return ComplexTrace._owning(
+        [ ComplexEvent._owning(act, map) for act, map in events ], 
+        trace_map
+    )
+
+def _extract_complex_trace(trace:Element, label_attribute:str,
+                           attributes:Set[str]=None, 
+                           trace_attributes:Set[str]=None) -> ComplexTrace:
+    """
+    Extracts a complex trace from a trace element, see 
+    `_extract_complex_parts`.
+    """
+    # the maps are only reachable from here, so events take them over
+    return _complex_from_parts(_extract_complex_parts(
+        trace, label_attribute, attributes, trace_attributes))
+
+def _extract_complex_parts(trace:Element, label_attribute:str,
+                           attributes:Set[str]=None, 
+                           trace_attributes:Set[str]=None) -> ComplexParts:
+    """
+    Extracts the parts of a complex trace from a trace element, keeping the
+    attributes of each event and any trace level attributes. If attributes
+    (or trace_attributes) are given, then only keys in these sets are 
+    converted and kept for events (or traces).
+    """
+    events = []
+    trace_map = dict()
+    for child in trace:
+        if _local_name(child.tag) != "event":
+            # collect any trace level attributes
+            key = child.attrib.get('key')
+            if (key == None):
+                continue
+            if (trace_attributes == None or key in trace_attributes):
+                trace_map[key] = _convert_attribute(child)
+            continue
+        label = None 
+        map = dict()
+        for attr in child.iter():
+            key = attr.attrib.get('key')
+            if (key == label_attribute):
+                label = _convert_attribute(attr)
+            elif (key != None and (attributes == None or key in attributes)):
+                map[key] = _convert_attribute(attr)
+        if label == None:
+            raise ValueError(
+                f"unable to find label attribute on :: {child}"
+            )
+        events.append((label, map))
+    return events, trace_map
+
+TRACE_OPEN_TAG = re.compile(rb"<(?:[\w.-]+:)?trace[\s/>]")
+LOG_CLOSE_TAG = re.compile(rb"</(?:[\w.-]+:)?log\s*>")
+READ_CHUNK_SIZE = 2 ** 25
+# smaller documents are always read serially, as sending the parsed traces
+# back from a pool of processes costs more than parsing them in parallel
+READ_PARALLEL_SIZE = 2 ** 26
+
+def _find_trace_start(source:BinaryIO, offset:int, limit:int) -> int:
+    """
+    Finds the byte offset of the first trace opening tag at or after the 
+    given offset, or returns limit if no trace starts before it.
+    """
+    overlap = 64
+    while offset < limit:
+        source.seek(offset)
+        block = source.read(min(READ_BLOCK_SIZE, limit - offset) + overlap)
+        found = TRACE_OPEN_TAG.search(block)
+        if found != None:
+            return min(offset + found.start(), limit)
+        if len(block) <= overlap:
+            break
+        offset += len(block) - overlap
+    return limit
+
+def _split_at_traces(filepath:str, chunks:int) \
+        -> Tuple[int, List[Tuple[int,int]], int]:
+    """
+    Splits an uncompressed XES document into (at most) the given number of 
+    chunks, where each chunk starts at a trace opening tag. Returns the 
+    offset where the first trace starts, the byte ranges of each chunk in 
+    document order, and the offset where the log element is closed.
+    """
+    size = path.getsize(filepath)
+    with open(filepath, "rb") as source:
+        source.seek(max(0, size - READ_BLOCK_SIZE))
+        tail = source.read()
+        closings = [ found for found in LOG_CLOSE_TAG.finditer(tail) ]
+        if len(closings) == 0:
+            raise ValueError("Unable to find the end of the log element")
+        footer = size - len(tail) + closings[-1].start()
+        header = _find_trace_start(source, 0, footer)
+        bounds = [header]
+        step = (footer - header) / chunks
+        for i in range(1, chunks):
+            bound = _find_trace_start(source, header + int(i * step), footer)
+            if bound > bounds[-1]:
+                bounds.append(bound)
+        if footer > bounds[-1]:
+            bounds.append(footer)
+    return header, list(zip(bounds[:-1], bounds[1:])), footer
+
+def _chunk_blocks(filepath:str, header:bytes, start:int, end:int, 
+                  footer:bytes) -> Iterator[bytes]:
+    """
+    Produces the blocks of a standalone XES document, consisting of the 
+    given header, the traces between start and end, and the footer.
+    """
+    yield header
+    yield from _read_blocks(filepath, start, end)
+    yield footer
+
+def _pack_variants(counts:Mapping[Trace,int]) \
+        -> Tuple[List[str],List[Tuple[array,int]]]:
+    """
+    Packs the frequencies of variants into the labels of activities and 
+    the activity codes of each variant, which are much cheaper to send 
+    between processes than traces.
+    """
+    alphabet = ActivityAlphabet()
+    variants = [ (alphabet.encode_trace(trace), freq) 
+                 for trace, freq in counts.items() ]
+    return list(alphabet), variants
+
+def _unpack_variants(packed:Tuple[List[str],List[Tuple[array,int]]]) \
+        -> Iterator[Tuple[Trace,int]]:
+    "Unpacks the frequencies of variants, see `_pack_variants`."
+    labels, variants = packed
+    alphabet = ActivityAlphabet(labels)
+    for codes, freq in variants:
+        yield alphabet.decode_trace(codes), freq
+
+def _read_simple_chunk(filepath:str, header:bytes, start:int, end:int,
+                       footer:bytes, label_attribute:List[str], fast:bool) \
+        -> Tuple[List[str],List[Tuple[array,int]]]:
+    """
+    Counts the trace variants within a chunk of an XES document, keeping 
+    variants in the order they were first seen, see `_pack_variants`.
+    """
+    counts = dict()
+    blocks = _chunk_blocks(filepath, header, start, end, footer)
+    for trace, count in _simple_traces(blocks, label_attribute, 
+                                       XesLogHeader(), fast):
+        counts[trace] = counts.get(trace, 0) + count
+    return _pack_variants(counts)
+
+def _read_complex_chunk(filepath:str, header:bytes, start:int, end:int,
+                        footer:bytes, label_attribute:str,
+                        attributes:Set[str], trace_attributes:Set[str]) \
+        -> List[ComplexParts]:
+    """
+    Extracts the parts of the complex traces within a chunk of an XES 
+    document, in document order. Parts are plain lists and dicts, which 
+    are cheaper to send between processes than traces.
+    """
+    children = _parse_log_children(
+        _chunk_blocks(filepath, header, start, end, footer))
+    return [ 
+        _extract_complex_parts(trace, label_attribute, attributes, 
+                               trace_attributes)
+        for trace 
+        in _stream_traces(children, XesLogHeader())
+    ]
+
+def _read_chunks(filepath:str, worker:Callable, args:Tuple, workers:int) \
+        -> Tuple[XesLogHeader, List[object]]:
+    """
+    Splits an uncompressed XES document at trace boundaries and hands each 
+    chunk to the worker in a pool of processes. Returns the header of the 
+    document and the outcome of each chunk in document order.
+    """
+    from joblib import Parallel, delayed
+    chunks = max(workers, ceil(path.getsize(filepath) / READ_CHUNK_SIZE))
+    start, ranges, end = _split_at_traces(filepath, chunks)
+    with open(filepath, "rb") as source:
+        header_bytes = source.read(start)
+        source.seek(end)
+        footer_bytes = source.read()
+    header = XesLogHeader()
+    children = _parse_log_children([header_bytes, footer_bytes])
+    for _ in _stream_traces(children, header):
+        pass
+    info(f"parsing {len(ranges)} chunks with {workers} workers ...")
+    pool = Parallel(n_jobs=workers)
+    outcomes = pool(
+        delayed(worker)(filepath, header_bytes, lower, upper, footer_bytes, 
+                        *args)
+        for lower, upper
+        in ranges
+    )
+    return header, outcomes
+
+def _serial_only(filepath:str, workers:int) -> int:
+    """
+    Get the number of processes to read a document with. Compressed 
+    documents cannot be split, and documents smaller than 
+    READ_PARALLEL_SIZE are not worth splitting, so both are always read
+    serially.
+    """
+    if workers == 1:
+        return 1
+    if is_compressed(filepath):
+        info("compressed logs can only be read serially, ignoring workers")
+        return 1
+    if path.getsize(filepath) < READ_PARALLEL_SIZE:
+        info("small logs are read serially, ignoring workers")
+        return 1
+    from joblib import effective_n_jobs
+    return effective_n_jobs(workers)
+
+def _reservoir(items:Iterable, size:int, seed:int, 
+               extract:Callable=None) -> List:
+    """
+    Draws a uniform sample of the given size from a stream of items, using
+    reservoir sampling, and returns the sample in stream order. Only the 
+    items that enter the reservoir are passed through extract.
+    """
+    rng = Random(seed)
+    reservoir = []
+    for i, item in enumerate(items):
+        if i < size:
+            slot = len(reservoir)
+            reservoir.append(None)
+        else:
+            slot = rng.randrange(i + 1)
+            if slot >= size:
+                continue
+        reservoir[slot] = (i, item if extract == None else extract(item))
+    reservoir.sort(key=lambda pair: pair[0])
+    return [ item for _, item in reservoir ]
+
+def _take(items:Iterator, extract:Callable=None, limit:int=None,
+          sample:int=None, seed:int=None) -> Iterator:
+    """
+    Restricts a stream of traces to the first limit traces, and then draws 
+    a uniform sample of traces (kept in document order). Items are only 
+    passed through extract if they are kept, and the stream is not read 
+    past the limit.
+    """
+    if limit != None:
+        items = islice(items, limit)
+    if sample != None:
+        return iter(_reservoir(items, sample, seed, extract))
+    if extract == None:
+        return items
+    return map(extract, items)
+
+def _check_subset(workers:int, cache:bool, limit:int, sample:int) \
+        -> Tuple[int,bool]:
+    """
+    Checks the options for reading a subset of traces, which are read 
+    serially and are never cached.
+    """
+    for option, value in [("limit", limit), ("sample", sample)]:
+        if value != None and value < 0:
+            raise ValueError(f"{option} must be non-negative, given :: {value}")
+    if limit == None and sample == None:
+        return workers, cache
+    if workers != 1:
+        info("a subset of traces is read serially, ignoring workers")
+    return 1, False
+
+SIMPLE_CACHE_KIND = "simple"
+COMPLEX_CACHE_KIND = "complex"
+
+def _cache_key(keys:Set[str]) -> Union[Tuple[str],None]:
+    """
+    Converts an optional whitelist into a comparable key for sidecars.
+    """
+    if keys == None:
+        return None
+    return tuple(sorted(keys))
+
+def _encode_simple(log:EventLog) -> Tuple:
+    """
+    Encodes a simplified event log into plain tuples for a sidecar.
+    """
+    return (
+        log.get_name(), 
+        [ (tuple(trace), freq) for trace, freq in log ]
+    )
+
+def _decode_simple(payload:Tuple) -> EventLog:
+    """
+    Decodes a simplified event log from the tuples of a sidecar.
+    """
+    name, variants = payload
+    return EventLog.from_frequencies(
+        ( (Trace(sequence), freq) for sequence, freq in variants ),
+        name
+    )
+
+def _encode_complex(log:ComplexEventLog) -> Tuple:
+    """
+    Encodes a complex event log into plain tuples for a sidecar, where 
+    instances of the same variant are kept together and in order.
+    """
+    return (
+        log.get_name(),
+        log.data(),
+        [ 
+            (
+                [ (event.activity(), event.data().copy()) 
+                  for event in trace ],
+                trace.data().copy()
+            )
+            for _, instances in log
+            for trace in instances 
+        ]
+    )
+
+def _decode_complex(payload:Tuple) -> ComplexEventLog:
+    """
+    Decodes a complex event log from the tuples of a sidecar.
+    """
+    name, data, traces = payload
+    return ComplexEventLog(
+        ( 
+            # the payload was just unpickled, so its maps are taken over
+            _complex_from_parts(parts) for parts in traces 
+        ),
+        name=name, data=data
+    )
+
+def read_xes_header(filepath:str) -> XesLogHeader:
+    """
+    Reads the log-level information of an XES formatted event log, without 
+    reading any of its traces.
+
+    Parameters
+    ----------
+    filepath: `str`
+    \t the filepath to the xes file to read, which may be gzip compressed.
+    """
+    # check that file exists
+    if not path.exists(filepath):
+        raise FileNotFoundError("event log file not found at :: "+filepath)
+    
+    header = XesLogHeader()
+    for _ in _stream_traces(_stream_log_children(filepath), header):
+        break
+    return header
+
+def iter_xes_complex(filepath:str,
+                    label_attribute=XES_CONCEPT,
+                    attributes:Iterable[str]=None,
+                    trace_attributes:Iterable[str]=None) \
+        -> Iterator[ComplexTrace]:
+    """
+    Reads an XES formatted event log incrementally, producing one complex 
+    trace at a time in document order. Only the trace being produced is 
+    held in memory, so the log can be larger than the available memory.
+    See `read_xes_header` for the log-level information.
+
+    Parameters
+    ----------
+    filepath: `str`
+    \t the filepath to the xes file to read, which may be gzip compressed.
+    label_attribute: `str`=`concept:name`
+    \t the xes attribute for the process label for an event
+    attributes: `Iterable[str]`=`None`
+    \t if given, only event attributes with these keys are kept, others are 
+    \t skipped without being converted.
+    trace_attributes: `Iterable[str]`=`None`
+    \t if given, only trace attributes with these keys are kept.
+    """
+    # check that file exists
+    if not path.exists(filepath):
+        raise FileNotFoundError("event log file not found at :: "+filepath)
+    
+    attributes = _as_whitelist(attributes)
+    trace_attributes = _as_whitelist(trace_attributes)
+    return (
+        _extract_complex_trace(trace, label_attribute, attributes, 
+                               trace_attributes)
+        for trace 
+        in _stream_traces(_stream_log_children(filepath), XesLogHeader())
+    )
+
 @enable_logging
 def read_xes_complex(filepath:str,
-                    label_attribute=XES_CONCEPT) -> ComplexEventLog:
+                    label_attribute=XES_CONCEPT,
+                    workers:int=1,
+                    attributes:Iterable[str]=None,
+                    trace_attributes:Iterable[str]=None,
+                    cache:bool=False,
+                    limit:int=None,
+                    sample:int=None,
+                    seed:int=None) -> ComplexEventLog:
     """
     Reads an XES formatted event log and creates a complex event log
     object. 
@@ -106,119 +656,412 @@ def read_xes_complex(filepath:str,
     Parameters
     ----------
     filepath: `str`
-    \t the filepath to the xes file to read.
+    \t the filepath to the xes file to read, which may be gzip compressed.
     label_attribute: `str`=`concept:name`
     \t the xes attribute for the process label for an event
+    workers: `int`=`1`
+    \t the number of processes used to parse the document (as per joblib's
+    \t n_jobs), by default the document is parsed serially. Otherwise, 
+    \t an uncompressed document is split into chunks of traces that are 
+    \t parsed in parallel, keeping traces in document order. Workers only
+    \t pay off for large documents (of at least 64MB, see 
+    \t READ_PARALLEL_SIZE) on machines with spare cores, smaller documents
+    \t are always parsed serially.
+    attributes: `Iterable[str]`=`None`
+    \t if given, only event attributes with these keys are kept, others are 
+    \t skipped without being converted.
+    trace_attributes: `Iterable[str]`=`None`
+    \t if given, only trace attributes with these keys are kept.
+    cache: `bool`=`False`
+    \t if `True`, the parsed log is stored in a binary sidecar file next to
+    \t the xes file (`<filepath>.koalas`), and later reads with the same 
+    \t parameters load the sidecar unless the xes file has changed.
+    limit: `int`=`None`
+    \t if given, only the first limit traces are read, and the rest of the 
+    \t document is never parsed.
+    sample: `int`=`None`
+    \t if given, a uniform sample of this many traces is drawn (after any 
+    \t limit) with reservoir sampling, keeping the sample in document order.
+    \t Only sampled traces are kept in memory.
+    seed: `int`=`None`
+    \t the seed for sampling traces.
+    \t Subsets are always read serially and are never cached.
     """ 
 
     # check that file exists
     if not path.exists(filepath):
         raise FileNotFoundError("event log file not found at :: "+filepath)
     
-    # parse traces
-    xml_tree = parse(filepath)
-    log = xml_tree.getroot()
+    attributes = _as_whitelist(attributes)
+    trace_attributes = _as_whitelist(trace_attributes)
+    workers, cache = _check_subset(workers, cache, limit, sample)
+    params = (label_attribute, _cache_key(attributes), 
+              _cache_key(trace_attributes))
+    if cache:
+        payload = _cache.load(filepath, COMPLEX_CACHE_KIND, params)
+        if payload != None:
+            info(f"loaded log from sidecar of :: {filepath}")
+            return _decode_complex(payload)
+    log = _parse_xes_complex(filepath, label_attribute, workers, attributes,
+                             trace_attributes, limit, sample, seed)
+    if cache:
+        _cache.store(filepath, COMPLEX_CACHE_KIND, params, 
+                     _encode_complex(log))
+    return log
 
-    if (log == None):
-        raise ValueError("Unable to find log element in xml structure")
-    
-    # find name of log
-    log_attrs = log.find(".*[@key='concept:name']")
-
-    name = "Unknown Event log"
-    if log_attrs != None:
-        name = log_attrs.attrib.get("value")
-        debug(f"extracted event log name :: {name}")
-
-    # check with namespace
-    ns_traces = [ trace for trace in log.findall("xes:trace",
-     XES_XML_NAMESPACE)]
-    #  check without namespace
-    nns_traces = [ trace for trace in log.findall("trace",
-     XES_XML_NAMESPACE)]
-    #  decide what to do with namespace
-    use_namespace = True
-    if (len(ns_traces) == nns_traces):
-        traces = ns_traces 
-        del nns_traces
-    elif (len(ns_traces) < len(nns_traces)):
-        traces = nns_traces
-        use_namespace = False
-        del ns_traces 
-    else: 
-        traces = ns_traces
-        del ns_traces
-
-    info(f"parsing {len(traces)} traces ...")
-    # extract the following from a trace,
-    # a sequence of activity labels
-    # sort traces by time:timestamp before 
-    extracted_traces = []
-    for trace in traces:
-        trace_ins = [] # each element is a EventExtract
-        events = find_element(trace, "event", use_namespace)
-        for id,event in enumerate(events):
-            label = None 
-            map = dict()
-            for child in event.iter():
-                key = child.attrib.get('key')
-                if (key == label_attribute):
-                    label = XesAttribute(find_xes_type(child.tag), 
-                                        key, child.attrib.get("value"))
-                else:
-                    if (key == None):
-                        continue
-                    map[key] = XesAttribute(
-                        find_xes_type(child.tag),
-                        key, 
-                        child.attrib.get("value")                        
-                    ).get()
-            extract = EventExtract(id, label , sorter=None, map=map)
-            trace_ins.append(extract)
-        # handle complex event construction
-        # collect any trace level attributes
-        trace_map = dict()
-        for child in trace:
+def _parse_xes_complex(filepath:str, label_attribute:str, workers:int,
+                       attributes:Set[str], trace_attributes:Set[str],
+                       limit:int=None, sample:int=None, seed:int=None) \
+        -> ComplexEventLog:
+    """
+    Parses an XES document into a complex event log, see `read_xes_complex`.
+    """
+    workers = _serial_only(filepath, workers)
+    if workers != 1:
+        header, chunks = _read_chunks(filepath, _read_complex_chunk, 
+                                      (label_attribute, attributes, 
+                                       trace_attributes), 
+                                      workers)
+        return ComplexEventLog(
+            ( _complex_from_parts(parts) 
+              for parts in chain.from_iterable(chunks) ),
+            name=header.name, data=header.data)
+
+    info(f"streaming traces from :: {filepath}")
+    header = XesLogHeader()
+    # log-level attributes come before traces, so the header is complete
+    # once the first trace has been extracted
+    traces = _peek(_take(
+        _stream_traces(_stream_log_children(filepath), header),
+        partial(_extract_complex_trace, label_attribute=label_attribute,
+                attributes=attributes, trace_attributes=trace_attributes),
+        limit, sample, seed
+    ))
+    return ComplexEventLog(traces, name=header.name, data=header.data)
+
+def _extract_simple_trace(trace:Element, label_attribute:List[str]) -> Trace:
+    """
+    Extracts the sequence of labels from a trace element, where a label is
+    the space separated values of the label attributes of an event.
+    """
+    sequence = []
+    for event in trace:
+        if _local_name(event.tag) != "event":
+            continue
+        label = None
+        for child in event.iter():
             key = child.attrib.get('key')
-            if (key == None):
+            if (key in label_attribute):
+                if (label == None):
+                    label = child.attrib.get("value")
+                else:
+                    label = " ".join([label, child.attrib.get("value")])
+        if label == None:
+            raise ValueError(
+                f"unable to find label attribute on :: {event}"
+            )
+        sequence.append(label)
+    return Trace(sequence)
+
+def _trace_count(trace:Element) -> int:
+    """
+    Returns the number of cases a trace element stands for, which is given
+    by its meta:variant:count attribute in variant logs and is otherwise 1.
+    """
+    for child in trace:
+        if child.attrib.get('key') == XES_VARIANT_COUNT:
+            return int(child.attrib.get('value'))
+    return 1
+
+def _extract_simple_variant(trace:Element, label_attribute:List[str]) \
+        -> Tuple[Trace,int]:
+    """
+    Extracts the sequence of labels from a trace element, along with the 
+    number of cases it stands for.
+    """
+    return _extract_simple_trace(trace, label_attribute), _trace_count(trace)
+
+SCAN_LOG_OPEN = re.compile(rb"<((?:[\w.-]+:)?log)[\s>]")
+SCAN_TRACE_OPEN = b"<trace"
+SCAN_TRACE_CLOSE = b"</trace"
+# the end of a trace, either its closing tag or a self-closing trace
+SCAN_TRACE_END = re.compile(
+    rb"</trace\s*>|<trace(?:\s+(?:[^>\"']|\"[^\"]*\"|'[^']*')*)?/>")
+# comments and character data may hide tags, they start with SCAN_MARKUP
+SCAN_MARKUP = b"<!"
+SCAN_HIDDEN = re.compile(rb"<!--.*?(?:-->|\Z)|<!\[CDATA\[.*?(?:\]\]>|\Z)",
+                         re.S)
+SCAN_HIDDEN_ENDS = (b"-->", b"]]>")
+# whitespace that the xml parser normalises to spaces in attribute values
+SCAN_WHITESPACE = bytes.maketrans(b"\t\n\r", b"   ")
+SCAN_EVENT_OPEN = b"<event"
+SCAN_PREFIXED_EVENT = b":event"
+# bytes kept from the previous block, so that tags split between blocks
+# are still found
+SCAN_OVERLAP = 2 ** 8
+SCAN_VARIANT_COUNT = re.compile(
+    rb"key=\"" + re.escape(XES_VARIANT_COUNT.encode("utf-8")) + 
+    rb"\"\s+value=\"(\d+)\"")
+SCAN_CACHE_LIMIT = 2 ** 16
+
+def _scan_header(prefix:bytes, header:XesLogHeader) -> None:
+    """
+    Parses the log-level attributes that precede the first trace of an XES
+    document into the given header.
+    """
+    root = SCAN_LOG_OPEN.search(prefix)
+    if root == None:
+        raise ValueError("Unable to find log element in xml structure")
+    closing = b"</" + root.group(1) + b">"
+    for _ in _stream_traces(_parse_log_children([prefix, closing]), header):
+        pass
+
+def _scan_opening(piece:bytes, hidden:bool) -> Union[re.Match,None]:
+    """
+    Finds the opening of the first trace in the given bytes, skipping any
+    within comments or character data if hidden.
+    """
+    if not hidden:
+        return TRACE_OPEN_TAG.search(piece)
+    spans = [ match.span() for match in SCAN_HIDDEN.finditer(piece) ]
+    for opening in TRACE_OPEN_TAG.finditer(piece):
+        if not any( start <= opening.start() < end for start, end in spans ):
+            return opening
+    return None
+
+def _scan_simple_traces(blocks:Iterable[bytes], label_attribute:List[str], 
+                        header:XesLogHeader) -> Iterator[Tuple[Trace,int]]:
+    """
+    Scans the raw bytes of an XES document for the label attributes of 
+    events (and the number of cases of each trace, see `_trace_count`), 
+    without building any elements for traces. Labels are found 
+    where the key and value of an attribute are adjacent and double quoted,
+    any trace that cannot be scanned in this way (e.g. an event is missing 
+    a label, or the trace has comments) is parsed into elements instead. 
+    The log-level attributes are recorded into the given header.
+    """
+    keys = b"|".join( re.escape(key.encode("utf-8")) 
+                      for key in label_attribute )
+    value = rb"<[\w:.-]+\s+key=\"(?:" + keys + rb")\"\s+value=\"([^\"]*)\""
+    if len(label_attribute) == 1:
+        # the first label attribute of each event
+        pattern = re.compile(
+            rb"<event[\s>](?:[^<]*<(?!/event)[^>]*>)*?[^<]*" + value
+        )
+    else:
+        # the opening of events and each label attribute
+        pattern = re.compile(rb"<(event)[\s/>]|" + value)
+    decoded = dict()
+    def decode(raw:bytes) -> str:
+        key = raw
+        if b"\n" in raw or b"\r" in raw or b"\t" in raw:
+            raw = raw.replace(b"\r\n", b" ").translate(SCAN_WHITESPACE)
+        value = raw.decode("utf-8")
+        if "&" in value:
+            value = unescape(value)
+        value = intern(value)
+        if len(decoded) > SCAN_CACHE_LIMIT:
+            decoded.clear()
+        decoded[key] = value
+        return value
+    def scan(piece:bytes) -> Union[List[str],None]:
+        if len(label_attribute) == 1:
+            return [ decoded.get(raw) or decode(raw) 
+                     for raw in pattern.findall(piece) ]
+        labels = []
+        for event, raw in pattern.findall(piece):
+            if event:
+                labels.append(None)
+            elif len(labels) > 0:
+                value = decoded.get(raw) or decode(raw)
+                labels[-1] = value if labels[-1] == None \
+                    else " ".join([labels[-1], value])
+        if None in labels:
+            return None
+        return labels
+    # a label attribute nested in another is only joined by the element
+    # reader, so events with more label keys than labels are parsed
+    single = None
+    if len(label_attribute) == 1:
+        single = b'key="' + label_attribute[0].encode("utf-8") + b'"'
+    def element(piece:bytes) -> Tuple[Trace,int]:
+        return _extract_simple_variant(fromstring(piece), label_attribute)
+    def split(buffer:bytes, final:bool) \
+            -> Tuple[List[Tuple[bytes,bool]],int]:
+        """
+        Finds the complete traces in the buffer, flagging those with 
+        comments or character data, and where the remainder starts.
+        """
+        hidden = []
+        limit = len(buffer)
+        if SCAN_MARKUP in buffer:
+            for match in SCAN_HIDDEN.finditer(buffer):
+                if match.end() == len(buffer) \
+                        and not buffer.endswith(SCAN_HIDDEN_ENDS):
+                    if final:
+                        raise ValueError(
+                            "Unable to find the closing of a comment")
+                    # unfinished, so nothing after it can be cut yet
+                    limit = match.start()
+                    break
+                hidden.append(match.span())
+        found = []
+        cut = 0
+        nhidden = 0
+        flagged = False
+        for match in SCAN_TRACE_END.finditer(buffer, 0, limit):
+            while nhidden < len(hidden) \
+                    and hidden[nhidden][1] <= match.start():
+                flagged = True
+                nhidden += 1
+            if nhidden < len(hidden) and hidden[nhidden][0] <= match.start():
+                # a tag within a comment does not end a trace
                 continue
-            trace_map[key] = XesAttribute(
-                        find_xes_type(child.tag),
-                        key, 
-                        child.attrib.get("value")                        
-                    ).get()
-        # build complex events and trace
-        trace_ins = ComplexTrace(
-            [ ComplexEvent(t.get_label(),t.get_data()) for t in trace_ins ],
-             data=trace_map)
-        # store complex trace
-        extracted_traces.append(trace_ins) 
-    # build log-level attributes
-    log_map = dict()
-    for child in log:
-        key = child.attrib.get('key')
-        if (key == None):
+            found.append((buffer[cut:match.end()], flagged))
+            cut = match.end()
+            flagged = False
+        return found, cut
+    started = False
+    checked = False
+    pending = []
+    tail = b""
+    blocks = iter(blocks)
+    def traces(final:bool) -> Iterator[Tuple[Trace,int]]:
+        nonlocal started, pending, tail
+        buffer = b"".join(pending)
+        found, cut = split(buffer, final)
+        remainder = buffer[cut:]
+        pending = [remainder]
+        tail = remainder[-SCAN_OVERLAP:]
+        for piece, flagged in found:
+            opening = _scan_opening(piece, flagged)
+            if opening == None:
+                raise ValueError("Unable to find the opening of a trace")
+            if not started:
+                _scan_header(piece[:opening.start()], header)
+                started = True
+            piece = piece[opening.start():]
+            if flagged:
+                # comments and character data are left to the element reader
+                yield element(piece)
+                continue
+            sequence = scan(piece)
+            # prefixed events are left to the element reader
+            if sequence == None or \
+                len(sequence) != piece.count(SCAN_EVENT_OPEN) or \
+                SCAN_PREFIXED_EVENT in piece:
+                yield element(piece)
+                continue
+            # trace attributes come before the first event
+            events = piece.find(SCAN_EVENT_OPEN)
+            if events < 0:
+                events = len(piece)
+            if single != None and piece.count(single, events) != len(sequence):
+                yield element(piece)
+                continue
+            count = SCAN_VARIANT_COUNT.search(piece, 0, events)
+            yield Trace(sequence), 1 if count == None else int(count.group(1))
+    for block in blocks:
+        window = tail + block
+        tail = window[-SCAN_OVERLAP:]
+        pending.append(block)
+        if not checked:
+            opening = TRACE_OPEN_TAG.search(window)
+            if opening == None:
+                continue
+            checked = True
+            if not opening.group().startswith(SCAN_TRACE_OPEN):
+                # prefixed elements are left to the element reader
+                debug("found prefixed traces, parsing elements instead")
+                children = _parse_log_children(
+                    chain([b"".join(pending)], blocks))
+                for trace in _stream_traces(children, header):
+                    yield _extract_simple_variant(trace, label_attribute)
+                return
+        if window.find(SCAN_TRACE_CLOSE) < 0 \
+                and SCAN_TRACE_END.search(window) == None:
             continue
-        log_map[key] = XesAttribute(
-                    find_xes_type(child.tag),
-                    key, 
-                    child.attrib.get("value")                        
-                ).get()
-    return ComplexEventLog(extracted_traces, name=name, data=log_map)
+        yield from traces(False)
+    yield from traces(True)
+    remainder = b"".join(pending)
+    if not started:
+        for _ in _stream_traces(_parse_log_children([remainder]), header):
+            raise ValueError("Unable to find the closing of a trace")
+    elif _scan_opening(remainder, SCAN_MARKUP in remainder) != None:
+        raise ValueError("Unable to find the closing of a trace")
+
+def _simple_traces(blocks:Iterable[bytes], label_attribute:List[str],
+                   header:XesLogHeader, fast:bool, limit:int=None, 
+                   sample:int=None, seed:int=None) \
+        -> Iterator[Tuple[Trace,int]]:
+    """
+    Produces the simplified traces of an XES document in document order,
+    along with the number of cases of each (see `_trace_count`), either by 
+    scanning its bytes (fast) or by parsing its elements. See `_take` for 
+    limit, sample and seed.
+    """
+    if fast:
+        return _take(_scan_simple_traces(blocks, label_attribute, header),
+                     None, limit, sample, seed)
+    return _take(
+        _stream_traces(_parse_log_children(blocks), header),
+        partial(_extract_simple_variant, label_attribute=label_attribute),
+        limit, sample, seed
+    )
 
 @enable_logging
-def read_xes_simple(filepath:str, label_attribute:List[str]=[XES_CONCEPT]) -> EventLog:
+def read_xes_simple(filepath:str, label_attribute:List[str]=[XES_CONCEPT],
+                    workers:int=1, fast:bool=False, 
+                    cache:bool=False, limit:int=None, sample:int=None,
+                    seed:int=None) -> EventLog:
     """
     Reads an XES formatted event log and creates a simplified event log 
     object. Traces from the event log are kept in document order before 
     making the sequence of labels (concept:name by default).
 
+    The document is streamed rather than loaded, each trace is released 
+    after its labels are extracted, so memory is bounded by the number 
+    of trace variants rather than the size of the file.
+
+    Variant logs, where each trace has a meta:variant:count attribute 
+    (see `export_to_xes_simple`), are read back with the given number of
+    cases for each trace. For such logs, limit and sample apply to the 
+    traces of the document rather than to cases.
+
     Parameters
     ----------
     filepath: `str`
-    \t the filepath to the xes file to read.
+    \t the filepath to the xes file to read, which may be gzip compressed.
     label_attribute: `List[str]`=`[concept:name]`
     \t the xes attribute for the process label for an event
+    workers: `int`=`1`
+    \t the number of processes used to parse the document (as per joblib's
+    \t n_jobs), by default the document is parsed serially. Otherwise, 
+    \t an uncompressed document is split into chunks of traces that are 
+    \t parsed in parallel, and the variants of each chunk are merged. 
+    \t Workers only pay off for large documents (of at least 64MB, see 
+    \t READ_PARALLEL_SIZE) on machines with spare cores, smaller documents
+    \t are always parsed serially. The fast scanner rarely gains from 
+    \t workers, as it spends most of its time reading the document.
+    fast: `bool`=`False`
+    \t if `True`, the raw bytes of traces are scanned for label attributes 
+    \t instead of being parsed into elements. Labels are only found where
+    \t the key and value of an attribute are adjacent and double quoted, 
+    \t any trace that does not fit is parsed into elements as usual.
+    cache: `bool`=`False`
+    \t if `True`, the parsed log is stored in a binary sidecar file next to
+    \t the xes file (`<filepath>.koalas`), and later reads with the same 
+    \t parameters load the sidecar unless the xes file has changed.
+    limit: `int`=`None`
+    \t if given, only the first limit traces are read, and the rest of the 
+    \t document is never parsed.
+    sample: `int`=`None`
+    \t if given, a uniform sample of this many traces is drawn (after any 
+    \t limit) with reservoir sampling, keeping the sample in document order.
+    \t Only sampled traces are kept in memory.
+    seed: `int`=`None`
+    \t the seed for sampling traces.
+    \t Subsets are always read serially and are never cached.
     """
     # backwards compatibility for label
     if (type(label_attribute) == str):
@@ -228,68 +1071,324 @@ def read_xes_simple(filepath:str, label_attribute:List[str]=[XES_CONCEPT]) -> Ev
     if not path.exists(filepath):
         raise FileNotFoundError("event log file not found at :: "+filepath)
 
-    # parse traces
-    xml_tree = parse(filepath)
-    log = xml_tree.getroot()
+    workers, cache = _check_subset(workers, cache, limit, sample)
+    params = (tuple(label_attribute),)
+    if cache:
+        payload = _cache.load(filepath, SIMPLE_CACHE_KIND, params)
+        if payload != None:
+            info(f"loaded log from sidecar of :: {filepath}")
+            return _decode_simple(payload)
+    log = _parse_xes_simple(filepath, label_attribute, workers, fast, limit,
+                            sample, seed)
+    if cache:
+        _cache.store(filepath, SIMPLE_CACHE_KIND, params, _encode_simple(log))
+    return log
 
-    if (log == None):
-        raise ValueError("Unable to find log element in xml structure")
+def _parse_xes_simple(filepath:str, label_attribute:List[str], workers:int,
+                      fast:bool, limit:int=None, sample:int=None, 
+                      seed:int=None) -> EventLog:
+    """
+    Parses an XES document into a simplified event log, see 
+    `read_xes_simple`.
+    """
+    workers = _serial_only(filepath, workers)
+    if workers != 1:
+        header, chunks = _read_chunks(filepath, _read_simple_chunk, 
+                                      (label_attribute, fast), workers)
+        return EventLog.from_frequencies(
+            chain.from_iterable( _unpack_variants(packed) 
+                                 for packed in chunks ),
+            header.name
+        )
 
-    # find name of log
-    log_attrs = log.find(".*[@key='concept:name']")
-
-    name = "Unknown Event log"
-    if log_attrs != None:
-        name = log_attrs.attrib.get("value")
-        debug(f"extracted event log name :: {name}")
-
-    # check with namespace
-    ns_traces = [ trace for trace in log.findall("xes:trace",
-     XES_XML_NAMESPACE)]
-    #  check without namespace
-    nns_traces = [ trace for trace in log.findall("trace",
-     XES_XML_NAMESPACE)]
-    #  decide what to do with namespace
-    use_namespace = True
-    if (len(ns_traces) == nns_traces):
-        traces = ns_traces 
-        del nns_traces
-    elif (len(ns_traces) < len(nns_traces)):
-        traces = nns_traces
-        use_namespace = False
-        del ns_traces 
-    else: 
-        traces = ns_traces
-        del ns_traces
-
-    info(f"parsing {len(traces)} traces ...")
-    # extract the following from a trace,
-    # a sequence of activity labels
-    # sort traces by time:timestamp before 
-    extracted_traces = []
-    for trace in traces:
-        trace_ins = [] # eache element is a EventExtract
-        events = find_element(trace, "event", use_namespace)
-        for id,event in enumerate(events):
-            label = None
-            sorter = None 
-            for child in event.iter():
-                key = child.attrib.get('key')
-                # print(key)
-                if (key in label_attribute):
-                    if (label == None):
-                        label = child.attrib.get("value")
-                    else:
-                        label = " ".join([label, child.attrib.get("value")])
-            if label == None:
+    info(f"streaming traces from :: {filepath}")
+    header = XesLogHeader()
+    # log-level attributes come before traces, so the name is known
+    # once the first trace has been extracted
+    traces = _peek(
+        _simple_traces(_read_blocks(filepath), label_attribute, header, fast,
+                       limit, sample, seed)
+    )
+    return EventLog.from_frequencies(traces, header.name)
+
+def _extract_simple_views(trace:Element, classifiers:List[List[str]],
+                          keys:Set[str]) -> Tuple[Tuple[Trace],int]:
+    """
+    Extracts one sequence of labels per classifier from a trace element, 
+    visiting the attributes of each event once, along with the number of 
+    cases the trace stands for. See `_extract_simple_trace` for how a label
+    is formed.
+    """
+    sequences = [ [] for _ in classifiers ]
+    for event in trace:
+        if _local_name(event.tag) != "event":
+            continue
+        found = [ 
+            (child.attrib.get('key'), child.attrib.get('value'))
+            for child
+            in event.iter()
+            if child.attrib.get('key') in keys
+        ]
+        for classifier, sequence in zip(classifiers, sequences):
+            values = [ value for key, value in found if key in classifier ]
+            if len(values) == 0:
                 raise ValueError(
                     f"unable to find label attribute on :: {event}"
                 )
-            label = XesAttribute(XES_STRING_TAG, 
-                                 "concept:name", label)
-            extract = EventExtract(id, label , sorter)
-            trace_ins.append(extract)
-        trace_ins = Trace([ t.get_label() for t in trace_ins ])
-        extracted_traces.append(trace_ins) 
-    return EventLog(extracted_traces, name)
+            sequence.append(" ".join(values))
+    return tuple( Trace(sequence) for sequence in sequences ), \
+        _trace_count(trace)
 
+def _count_views(views:Iterable[Tuple[Tuple[Trace],int]], size:int) \
+        -> List[Dict[Trace,int]]:
+    """
+    Counts the trace variants of each view, keeping variants in the order 
+    they were first seen.
+    """
+    counts = [ dict() for _ in range(size) ]
+    for traces, count in views:
+        for trace, collector in zip(traces, counts):
+            collector[trace] = collector.get(trace, 0) + count
+    return counts
+
+def _read_views_chunk(filepath:str, header:bytes, start:int, end:int,
+                      footer:bytes, classifiers:List[List[str]], 
+                      keys:Set[str]) \
+        -> List[Tuple[List[str],List[Tuple[array,int]]]]:
+    """
+    Counts the trace variants of each view within a chunk of an XES 
+    document, see `_pack_variants`.
+    """
+    children = _parse_log_children(
+        _chunk_blocks(filepath, header, start, end, footer))
+    counts = _count_views(
+        ( _extract_simple_views(trace, classifiers, keys)
+          for trace 
+          in _stream_traces(children, XesLogHeader()) ),
+        len(classifiers)
+    )
+    return [ _pack_variants(collector) for collector in counts ]
+
+@enable_logging
+def read_xes_simple_views(filepath:str, 
+                          classifiers:Iterable[List[str]],
+                          workers:int=1, limit:int=None, sample:int=None,
+                          seed:int=None) -> List[EventLog]:
+    """
+    Reads an XES formatted event log once and creates a simplified event 
+    log object for each classifier, where a classifier is the list of 
+    attributes that make up the label of an event (as for the 
+    label_attribute of `read_xes_simple`). 
+
+    Parameters
+    ----------
+    filepath: `str`
+    \t the filepath to the xes file to read, which may be gzip compressed.
+    classifiers: `Iterable[List[str]]`
+    \t the label attributes of each view, a single attribute may be given
+    \t as a `str`.
+    workers: `int`=`1`
+    \t the number of processes used to parse the document, see 
+    \t `read_xes_simple`.
+    limit: `int`=`None`
+    \t if given, only the first limit traces are read.
+    sample: `int`=`None`
+    \t if given, a uniform sample of this many traces is drawn, the same 
+    \t traces are used for every view.
+    seed: `int`=`None`
+    \t the seed for sampling traces.
+
+    Returns
+    -------
+    a list of simplified event logs, in the same order as classifiers.
+    """
+    classifiers = [ 
+        [classifier] if type(classifier) == str else list(classifier)
+        for classifier
+        in classifiers
+    ]
+    if len(classifiers) == 0:
+        raise ValueError("at least one classifier must be given")
+    keys = set().union(*classifiers)
+
+    # check that file exists
+    if not path.exists(filepath):
+        raise FileNotFoundError("event log file not found at :: "+filepath)
+
+    workers, _ = _check_subset(workers, False, limit, sample)
+    workers = _serial_only(filepath, workers)
+    if workers != 1:
+        header, chunks = _read_chunks(filepath, _read_views_chunk, 
+                                      (classifiers, keys), workers)
+        return [ 
+            EventLog.from_frequencies(
+                chain.from_iterable( 
+                    _unpack_variants(packed[view]) for packed in chunks ),
+                header.name
+            )
+            for view 
+            in range(len(classifiers))
+        ]
+
+    info(f"streaming traces from :: {filepath}")
+    header = XesLogHeader()
+    counts = _count_views(
+        _take(
+            _stream_traces(_stream_log_children(filepath), header),
+            partial(_extract_simple_views, classifiers=classifiers, 
+                    keys=keys),
+            limit, sample, seed
+        ),
+        len(classifiers)
+    )
+    return [ 
+        EventLog.from_frequencies(collector, header.name) 
+        for collector 
+        in counts 
+    ]
+
+def _read_simple_file(filepath:str, label_attribute:List[str], fast:bool) \
+        -> Tuple[str, Dict[Trace,int]]:
+    """
+    Counts the trace variants of a single XES document, returning the name
+    of the log and the variants in the order they were first seen.
+    """
+    header = XesLogHeader()
+    counts = dict()
+    for trace, count in _simple_traces(_read_blocks(filepath), 
+                                       label_attribute, header, fast):
+        counts[trace] = counts.get(trace, 0) + count
+    return header.name, counts
+
+def _read_complex_file(filepath:str, label_attribute:str, 
+                       attributes:Set[str], trace_attributes:Set[str]) \
+        -> Tuple[XesLogHeader, Dict[Trace,List[ComplexTrace]]]:
+    """
+    Extracts the complex traces of a single XES document, returning the 
+    header of the log and the traces grouped by their simplified trace.
+    """
+    header = XesLogHeader()
+    instances = dict()
+    for element in _stream_traces(_stream_log_children(filepath), header):
+        trace = _extract_complex_trace(element, label_attribute, attributes,
+                                       trace_attributes)
+        strace = trace.simplify()
+        if strace in instances:
+            instances[strace].append(trace)
+        else:
+            instances[strace] = [trace]
+    return header, instances
+
+def _read_files(filepaths:List[str], worker:Callable, args:Tuple, 
+                workers:int) -> Iterator[object]:
+    """
+    Hands each XES document to the worker, either serially or in a pool of
+    processes, producing the outcome of each document in the given order.
+    """
+    for filepath in filepaths:
+        if not path.exists(filepath):
+            raise FileNotFoundError(
+                "event log file not found at :: "+filepath)
+    info(f"parsing {len(filepaths)} logs with {workers} workers ...")
+    if workers == 1:
+        return ( worker(filepath, *args) for filepath in filepaths )
+    from joblib import Parallel, delayed
+    pool = Parallel(n_jobs=workers, return_as="generator")
+    return pool(
+        delayed(worker)(filepath, *args) 
+        for filepath 
+        in filepaths
+    )
+
+@enable_logging
+def read_xes_many(filepaths:Iterable[str], 
+                  label_attribute:List[str]=[XES_CONCEPT],
+                  workers:int=1, fast:bool=False, name:str=None) -> EventLog:
+    """
+    Reads several XES formatted event logs and merges them into a single 
+    simplified event log. Each document is parsed on its own, the variants 
+    of each are counted, and the counts are summed into one log without 
+    expanding variants into their instances.
+
+    Parameters
+    ----------
+    filepaths: `Iterable[str]`
+    \t the filepaths to the xes files to read, which may be gzip compressed.
+    label_attribute: `List[str]`=`[concept:name]`
+    \t the xes attribute for the process label for an event
+    workers: `int`=`1`
+    \t the number of processes used to parse documents (as per joblib's
+    \t n_jobs), by default documents are parsed serially. Otherwise, 
+    \t documents are parsed concurrently, one per process.
+    fast: `bool`=`False`
+    \t if `True`, the raw bytes of traces are scanned for label attributes,
+    \t see `read_xes_simple`.
+    name: `str`=`None`
+    \t the name of the merged log, by default the name of the first log.
+    """
+    if (type(label_attribute) == str):
+        label_attribute = [label_attribute]
+    filepaths = list(filepaths)
+    if len(filepaths) == 0:
+        return EventLog([], name) if name != None else EventLog([])
+    outcomes = _read_files(filepaths, _read_simple_file, 
+                           (label_attribute, fast), workers)
+    first, counts = next(outcomes)
+    merged = dict(counts)
+    for _, counts in outcomes:
+        for trace, freq in counts.items():
+            merged[trace] = merged.get(trace, 0) + freq
+    return EventLog.from_frequencies(merged, 
+                                     name if name != None else first)
+
+@enable_logging
+def read_xes_many_complex(filepaths:Iterable[str],
+                          label_attribute=XES_CONCEPT,
+                          workers:int=1,
+                          attributes:Iterable[str]=None,
+                          trace_attributes:Iterable[str]=None,
+                          name:str=None) -> ComplexEventLog:
+    """
+    Reads several XES formatted event logs and merges them into a single 
+    complex event log. Each document is parsed on its own and the 
+    instances of each variant are concatenated in the given order of 
+    documents. The log-level attributes are those of the first log.
+
+    Parameters
+    ----------
+    filepaths: `Iterable[str]`
+    \t the filepaths to the xes files to read, which may be gzip compressed.
+    label_attribute: `str`=`concept:name`
+    \t the xes attribute for the process label for an event
+    workers: `int`=`1`
+    \t the number of processes used to parse documents (as per joblib's
+    \t n_jobs), by default documents are parsed serially. Otherwise, 
+    \t documents are parsed concurrently, one per process.
+    attributes: `Iterable[str]`=`None`
+    \t if given, only event attributes with these keys are kept.
+    trace_attributes: `Iterable[str]`=`None`
+    \t if given, only trace attributes with these keys are kept.
+    name: `str`=`None`
+    \t the name of the merged log, by default the name of the first log.
+    """
+    filepaths = list(filepaths)
+    if len(filepaths) == 0:
+        return ComplexEventLog([], name=name) if name != None \
+            else ComplexEventLog([])
+    outcomes = _read_files(filepaths, _read_complex_file, 
+                           (label_attribute, _as_whitelist(attributes), 
+                            _as_whitelist(trace_attributes)), 
+                           workers)
+    header, instances = next(outcomes)
+    merged = dict( (strace, list(collector)) 
+                   for strace, collector in instances.items() )
+    for _, instances in outcomes:
+        for strace, collector in instances.items():
+            if strace in merged:
+                merged[strace].extend(collector)
+            else:
+                merged[strace] = list(collector)
+    return ComplexEventLog.from_instances(
+        merged, data=header.data, 
+        name=name if name != None else header.name
+    )
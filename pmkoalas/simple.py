@@ -4,38 +4,67 @@ simplified api for process data, being how to represent an event,
 a trace and an event log.
 """
 from __future__ import annotations # required for typing checks
-from typing import Iterable, List, Mapping, Set, Tuple
-from copy import deepcopy
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, \
+    Mapping, Set, Tuple, Union
+from array import array
+from bisect import bisect_left
+from heapq import nlargest
+from itertools import accumulate, islice
+from operator import is_not, itemgetter
+from sys import intern
 from time import time
-from logging import DEBUG
+from warnings import warn
 
-from pmkoalas._logging import info, debug, enable_logging, get_logger
+from pmkoalas._logging import info, enable_logging
 from pmkoalas.directly import DirectlyFollowPair,FollowLanguage
 from pmkoalas.directly import DIRECTLY_SOURCE,DIRECTLY_END
-from pmkoalas.directly import extract_df_pairs
 
 # only evaluate these classes if we are type checking/hinting 
 # prevents cyclic imports
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from pmkoalas.models.transitiontree import TransitionTree
+    from pmkoalas.index import ActivityIndex, VariantIndex
+    from pmkoalas.views import LogView
 
 class Trace():
     """
-    A simplified representation of a sequence of events
+    A simplified representation of a sequence of events, which is immutable
+    and backed by a tuple of activities.
     """
 
-    def __init__(self, sequence: List[str]) -> None:
-        self.sequence = deepcopy(sequence)
-        self._len = len(self.sequence)
-        self._hash = hash(tuple(event for event in self.sequence))
-        self._acts = set(self.sequence)
+    __slots__ = ("sequence", "_len", "_hash", "_acts")
+
+    def __init__(self, sequence: Iterable[str]) -> None:
+        if type(sequence) != tuple:
+            sequence = tuple(sequence)
+        # labels are interned, so that traces share one string per activity,
+        # and a tuple of interned labels is immutable, so it is kept as is
+        try:
+            labels = tuple(map(intern, sequence))
+        except TypeError:
+            labels = sequence
+        if any(map(is_not, labels, sequence)):
+            sequence = labels
+        self.sequence = sequence
+        self._len = len(sequence)
+        self._hash = hash(sequence)
+        self._acts = None
     
     # accessors
-    def get_id(self) -> str:
-        return self.id
-
-    def seen_activities(self) -> Set[str]:
+    def get_id(self) -> None:
+        """
+        Deprecated, simple traces are only their sequence of activities and
+        have no identifier, so this always returns `None`.
+        """
+        warn("Trace.get_id is deprecated, simple traces have no identifier",
+             DeprecationWarning, stacklevel=2)
+        return None
+
+    def seen_activities(self) -> FrozenSet[str]:
+        # only computed when first asked for
+        if self._acts == None:
+            self._acts = frozenset(self.sequence)
         return self._acts
 
     # data model functions
@@ -57,8 +86,7 @@ class Trace():
         return f"Trace({event_repr})"
 
     def __iter__(self) -> Iterable[str]:
-        for event in self.sequence:
-            yield event
+        return iter(self.sequence)
 
     def __getitem__(self,key:int) -> str:
         return self.sequence[key]
@@ -74,7 +102,122 @@ class Trace():
     def __len__(self) -> int:
         return self._len
 
+    def __reduce__(self):
+        # string hashes differ between processes, so the hash is 
+        # recomputed rather than pickled, while the state that subclasses 
+        # add is restored after construction (subclasses that take other 
+        # arguments must override this)
+        slots = dict()
+        for cls in type(self).__mro__[:-1]:
+            if cls is Trace:
+                break
+            names = cls.__dict__.get("__slots__", ())
+            for name in ((names,) if isinstance(names, str) else names):
+                if name != "__dict__" and hasattr(self, name):
+                    slots[name] = getattr(self, name)
+        state = getattr(self, "__dict__", None) or None
+        if slots:
+            state = (state, slots)
+        if state == None:
+            return (self.__class__, (self.sequence,))
+        return (self.__class__, (self.sequence,), state)
+
+    def __copy__(self) -> 'Trace':
+        return self
+
+    def __deepcopy__(self, memo) -> 'Trace':
+        # immutable, so copies can be shared
+        return self
+
+# the largest code that fits into a compact array of codes
+SHORT_CODE_LIMIT = 2 ** 16
+
+class ActivityAlphabet():
+    """
+    A mapping between activity labels and small integer codes, where codes
+    are given in the order that activities are first encoded. Labels are 
+    interned, so that every encoded occurrence of an activity shares one 
+    string.
+    """
+
+    def __init__(self, activities:Iterable[str]=()) -> None:
+        self._codes:Dict[str,int] = dict()
+        self._labels:List[str] = []
+        for act in activities:
+            self.encode(act)
+
+    def encode(self, activity:str) -> int:
+        "Returns the code of an activity, adding it if it is unseen."
+        code = self._codes.get(activity)
+        if code == None:
+            code = len(self._labels)
+            activity = intern(activity)
+            self._codes[activity] = code
+            self._labels.append(activity)
+        return code
+
+    def code(self, activity:str) -> int:
+        "Returns the code of a seen activity."
+        return self._codes[activity]
+
+    def label(self, code:int) -> str:
+        "Returns the activity for a code."
+        return self._labels[code]
+
+    def codes(self, activities:Iterable[str]) -> Iterator[int]:
+        "Returns the codes of seen activities, as they are consumed."
+        return map(self._codes.__getitem__, activities)
+
+    def encode_trace(self, trace:Iterable[str]) -> array:
+        """
+        Returns the codes of a sequence of activities as a compact array, 
+        using two bytes per code while the alphabet is small enough.
+        """
+        codes = [ self.encode(act) for act in trace ]
+        typecode = "H" if len(self._labels) <= SHORT_CODE_LIMIT else "I"
+        return array(typecode, codes)
+
+    def decode_trace(self, codes:Iterable[int]) -> Trace:
+        "Returns the trace for a sequence of codes."
+        labels = self._labels
+        return Trace(tuple( labels[code] for code in codes ))
+
+    # data model functions
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def __contains__(self, activity:str) -> bool:
+        return activity in self._codes
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._labels)
+
+    def __repr__(self) -> str:
+        return f"ActivityAlphabet({self._labels.__repr__()})"
+
 DEFAULT_SIMPLE_LOG_NAME="simple"
+SHARD_SIZE = 2 ** 16
+# the most frequent variants are found with a heap, rather than by ranking 
+# all variants, when fewer than 1/TOP_HEAP_RATIO of variants are asked for
+TOP_HEAP_RATIO = 16
+
+def _count_shard(traces:Iterable[Union[Trace,Tuple[str]]]) \
+        -> Tuple[Dict[Union[Trace,Tuple[str]],int],Set[str],Set[str],Set[str]]:
+    """
+    Counts the variants of a shard of traces (or sequences of activities), 
+    returning the frequencies of variants (in seen order) and the 
+    activities, start activities and end activities of the shard.
+    """
+    counts = dict()
+    for trace in traces:
+        counts[trace] = counts.get(trace, 0) + 1
+    acts, starts, ends = set(), set(), set()
+    for trace in counts.keys():
+        acts.update(trace)
+        if (len(trace) > 0):
+            starts.add(trace[0])
+            ends.add(trace[-1])
+    return counts, acts, starts, ends
 
 class EventLog():
     """
@@ -89,41 +232,174 @@ class EventLog():
         self._freqset = dict()
         self._len = 0
         self._variants = 0
-        self._acts = set([])
-        self._start_acts = set([])
-        self._end_acts = set([])
+        # activity sets are frozen, so they can be shared by accessors
+        self._acts = frozenset()
+        self._start_acts = frozenset()
+        self._end_acts = frozenset()
         self._traces = None
         info("Computing language...")
         start = time()
         for trace in traces:
-            if (trace in self._freqset.keys()):
-                self._freqset[trace] += 1
-            else:
-                self._acts = self._acts.union(
-                    trace.seen_activities()
-                )
-                if (len(trace) > 0):
-                    self._start_acts.add(trace[0])
-                    self._end_acts.add(trace[-1])
-                self._freqset[trace] = 1
-                self._variants += 1
-            self._len += 1
+            self._add(trace, 1)
         self._traces = set([ t for t in self._freqset.keys() ])
         info(f"Computed language in {(time()-start)*1000:.0f}ms")
         self.name = name 
-        self._relations = None
+        self._init_caches()
 
-    def seen_activities(self) -> Set[str]:
-        "Get a language of process activities from this language"
-        return deepcopy(self._acts)
+    def _init_caches(self) -> None:
+        "Clears the structures computed over this language on demand."
+        self._relations = None
+        self._alphabet = None
+        self._index = None
+        self._postings = None
+        self._ranking = None
+        self._coverage = None
+
+    @classmethod
+    def from_frequencies(cls, frequencies:Union[Mapping[Trace,int],
+                                                Iterable[Tuple[Trace,int]]],
+                         name:str=DEFAULT_SIMPLE_LOG_NAME) -> 'EventLog':
+        """
+        Creates a language from a mapping between traces and their 
+        frequencies (or from pairs of traces and frequencies), without 
+        expanding each variant into its instances. Repeated traces have 
+        their frequencies summed.
+        """
+        log = cls([], name)
+        if isinstance(frequencies, Mapping):
+            frequencies = frequencies.items()
+        for trace, freq in frequencies:
+            log._add(trace, freq)
+        log._traces = set([ t for t in log._freqset.keys() ])
+        return log
+
+    @classmethod
+    def from_shards(cls, shards:Iterable[Iterable[Trace]],
+                    name:str=DEFAULT_SIMPLE_LOG_NAME, 
+                    workers:int=1) -> 'EventLog':
+        """
+        Creates a language from shards of traces, where each shard is 
+        counted on its own and the partial counts are merged. By default, 
+        shards are counted serially, otherwise shards are counted in a pool
+        of processes (as per joblib's n_jobs) while they are produced.
+        """
+        if workers == 1:
+            parts = map(_count_shard, shards)
+        else:
+            from joblib import Parallel, delayed
+            info(f"counting shards with {workers} workers ...")
+            pool = Parallel(n_jobs=workers, return_as="generator")
+            # plain sequences are cheaper to send, and variants are only 
+            # made into traces once they are merged
+            parts = pool( 
+                delayed(_count_shard)([ trace.sequence for trace in shard ]) 
+                for shard in shards 
+            )
+        log = cls([], name)
+        freqset = dict()
+        acts, starts, ends = set(), set(), set()
+        for counts, shard_acts, shard_starts, shard_ends in parts:
+            for trace, freq in counts.items():
+                freqset[trace] = freqset.get(trace, 0) + freq
+                log._len += freq
+            acts.update(shard_acts)
+            starts.update(shard_starts)
+            ends.update(shard_ends)
+        if workers == 1:
+            log._freqset = freqset
+        else:
+            log._freqset = dict( (Trace(sequence), freq) 
+                                 for sequence, freq in freqset.items() )
+        freqset = log._freqset
+        log._variants = len(freqset)
+        log._acts = frozenset(acts)
+        log._start_acts = frozenset(starts)
+        log._end_acts = frozenset(ends)
+        log._traces = set([ t for t in freqset.keys() ])
+        return log
+
+    @classmethod
+    def from_traces(cls, traces:Iterable[Trace], 
+                    name:str=DEFAULT_SIMPLE_LOG_NAME, workers:int=1,
+                    shard_size:int=None) -> 'EventLog':
+        """
+        Creates a language by partitioning traces into shards of 
+        shard_size traces, see `from_shards`. Traces are only partitioned
+        when counted in parallel.
+        """
+        if workers == 1:
+            # a single shard, as there is nothing to gain from splitting
+            return cls.from_shards([traces], name, workers)
+        if shard_size == None:
+            shard_size = SHARD_SIZE
+        iterator = iter(traces)
+        shards = iter(lambda: list(islice(iterator, shard_size)), [])
+        return cls.from_shards(shards, name, workers)
+
+    def _add(self, trace:Trace, freq:int) -> None:
+        "Adds freq instances of the given trace to this language."
+        if (trace in self._freqset):
+            self._freqset[trace] += freq
+        else:
+            acts = trace.seen_activities()
+            if (not acts <= self._acts):
+                self._acts = self._acts.union(acts)
+            if (len(trace) > 0):
+                if (trace[0] not in self._start_acts):
+                    self._start_acts = self._start_acts.union([trace[0]])
+                if (trace[-1] not in self._end_acts):
+                    self._end_acts = self._end_acts.union([trace[-1]])
+            self._freqset[trace] = freq
+            self._variants += 1
+        self._len += freq
+
+    def alphabet(self) -> ActivityAlphabet:
+        """
+        Get the alphabet of activities for this language, which encodes 
+        each activity as a small integer (see `encoded_language`).
+        """
+        if self._alphabet == None:
+            alphabet = ActivityAlphabet()
+            for trace in self._freqset.keys():
+                for act in trace:
+                    alphabet.encode(act)
+            self._alphabet = alphabet
+        return self._alphabet
+
+    def encoded_language(self) -> Iterator[Tuple[array,int]]:
+        """
+        Get the variants of this language encoded as arrays of activity 
+        codes from `alphabet`, along with their frequencies, in seen order.
+        Encodings are made as they are consumed rather than kept, so the 
+        language is not stored twice.
+        """
+        alphabet = self.alphabet()
+        return (
+            (alphabet.encode_trace(trace), freq)
+            for trace, freq
+            in self._freqset.items()
+        )
+
+    def seen_activities(self) -> FrozenSet[str]:
+        """
+        Get a language of process activities from this language, as a
+        read-only set (use `set(...)` for a mutable copy).
+        """
+        return self._acts
 
-    def seen_start_activities(self) -> Set[str]:
-        "Get a set of start activities from this language"
-        return deepcopy(self._start_acts)
+    def seen_start_activities(self) -> FrozenSet[str]:
+        """
+        Get a read-only set of start activities from this language (use 
+        `set(...)` for a mutable copy).
+        """
+        return self._start_acts
 
-    def seen_end_activities(self) -> Set[str]:
-        "Get a set of end activities from this language"
-        return deepcopy(self._end_acts)
+    def seen_end_activities(self) -> FrozenSet[str]:
+        """
+        Get a read-only set of end activities from this language (use 
+        `set(...)` for a mutable copy).
+        """
+        return self._end_acts
 
     def language(self) -> Set[Trace]:
         "Get a trace language from this language"
@@ -138,46 +414,151 @@ class EventLog():
         from pmkoalas.models.transitiontree import construct_from_log
         return construct_from_log(self)
 
+    def variant_index(self) -> 'VariantIndex':
+        """
+        Get a prefix trie over the variants of this language, which answers
+        prefix, suffix and wildcard pattern queries, see `pmkoalas.index`.
+        """
+        if self._index == None:
+            from pmkoalas.index import VariantIndex
+            self._index = VariantIndex(self)
+        return self._index
+
+    def view(self) -> 'LogView':
+        """
+        Get a lazy view over this language, which selects variants through 
+        chainable predicates without copying this language, see 
+        `pmkoalas.views`.
+        """
+        from pmkoalas.views import LogView
+        return LogView(self)
+
+    def _ranked(self, k:int) -> List[Tuple[Trace,int]]:
+        """
+        Get (at least) the k most frequent variants, from most to least 
+        frequent (in seen order for ties). The ranking is kept, so that 
+        later calls needing at most as many variants only slice it.
+        """
+        k = min(k, self._variants)
+        if self._ranking == None or len(self._ranking) < k:
+            if k * TOP_HEAP_RATIO < self._variants:
+                ranking = nlargest(k, self._freqset.items(), 
+                                   key=itemgetter(1))
+            else:
+                ranking = sorted(self._freqset.items(), key=itemgetter(1),
+                                 reverse=True)
+            self._ranking = ranking
+            self._coverage = list(accumulate( freq for _, freq in ranking ))
+        return self._ranking
+
+    def top_variants(self, k:int) -> 'LogView':
+        """
+        Get a view of the k most frequent variants of this language (in 
+        seen order for ties).
+        """
+        if k < 1:
+            return self._ranked_view(0)
+        self._ranked(k)
+        return self._ranked_view(k)
+
+    def variants_covering(self, fraction:float) -> 'LogView':
+        """
+        Get a view of the fewest most frequent variants of this language, 
+        which together cover at least the given fraction of traces.
+        """
+        if not (0 <= fraction <= 1):
+            raise ValueError("fraction of traces to cover must be between"
+                             + f" 0 and 1, but was given :: {fraction}")
+        # rounded, so that fractions such as 0.7 of 10 need 7 traces
+        needed = round(fraction * self._len, 9)
+        if needed <= 0:
+            return self._ranked_view(0)
+        if self._ranking == None or self._coverage[-1] < needed:
+            self._ranked(self._variants)
+        return self._ranked_view(bisect_left(self._coverage, needed) + 1)
+
+    def _ranked_view(self, k:int) -> 'LogView':
+        "Get a view of the first k variants of the kept ranking."
+        from pmkoalas.views import LogView
+        selection = () if k < 1 else tuple(self._ranking[:k])
+        return LogView(self, selection=selection)
+
+    def activity_index(self) -> 'ActivityIndex':
+        """
+        Get an inverted index from the activities of this language to the 
+        variants and positions where they occur, see `pmkoalas.index`.
+        """
+        if self._postings == None:
+            from pmkoalas.index import ActivityIndex
+            self._postings = ActivityIndex(self)
+        return self._postings
+
+    def _select(self, vids:Iterable[int]) -> 'EventLog':
+        "Creates a language from the given variants of this language."
+        index = self.activity_index()
+        return self.__class__.from_frequencies(
+            [ index.variant(vid) for vid in vids ], self.name)
+
+    def filter_containing(self, *activities:str) -> 'EventLog':
+        "Get the variants of this language where all activities occur."
+        return self._select(self.activity_index().containing(*activities))
+
+    def filter_eventually_follows(self, actA:str, actB:str) -> 'EventLog':
+        """
+        Get the variants of this language where actA is eventually followed
+        by actB.
+        """
+        return self._select(
+            self.activity_index().eventually_follows(actA, actB))
+
     @enable_logging
     def directly_follow_relations(self) -> FollowLanguage:
         "Get the directly flow relations for this language"
         if (self._relations == None):
             # compute directly flow relations
-            self._relations = FollowLanguage([])
             start = time()
-            computed_times = []
             info("Starting computation of relations")
-            starts = {}
-            ends = {}
-            for tid,(trace,freq) in enumerate(self._freqset.items()):
-                if (len(trace) < 1):
+            # relations are collected over activity codes, where the 
+            # source and end of a variant have their own codes
+            alphabet = self.alphabet()
+            source, end = -1, -2
+            freqs = dict()
+            preceding = dict()
+            proceeding = dict()
+            for tid,(codes,freq) in enumerate(self.encoded_language()):
+                if (len(codes) < 1):
                     continue
-                compute_time = time()
-                # build initial flow
-                debug(f"working on :: {trace=} @ {freq=}")
-                relations = extract_df_pairs(list(trace), freq=freq)
-                debug(f"starting pair :: {relations[0]}")
-                if get_logger().level == DEBUG:
-                    for pair in relations[1:-1]:
-                        debug(f"pair :: {pair}")
-                debug(f"ending with :: {relations[-1]}")
-
-                # update lang
-                self._relations  = self._relations + \
-                    FollowLanguage(relations)
-                
-                if (len(computed_times) < 30):
-                    computed_times.append(time() - compute_time)
-                else:
-                    computed_times.pop(0)
-                    computed_times.append(time() - compute_time)
-
-                if (tid > 0 and (tid % 100) == 0):
-                    avg_time = (sum(computed_times)/ 
-                     len(computed_times))* 1000
-                    info(f"computed {tid}/{self._variants} @ " + 
-                     f"{avg_time:.1f}ms/variant"
-                    )
+                variant = [source]
+                variant.extend(codes)
+                variant.append(end)
+                for curr in range(1, len(variant)):
+                    pair = (variant[curr-1], variant[curr])
+                    if pair in freqs:
+                        freqs[pair] += freq
+                    else:
+                        freqs[pair] = freq
+                        preceding[pair] = set()
+                        proceeding[pair] = set()
+                    if curr > 1:
+                        preceding[pair].add(variant[curr-2])
+                    if curr + 1 < len(variant):
+                        proceeding[pair].add(variant[curr+1])
+
+                if (tid > 0 and (tid % 10000) == 0):
+                    info(f"computed {tid}/{self._variants} variants")
+
+            # relations are only built over labels once
+            labels = { source : DIRECTLY_SOURCE, end : DIRECTLY_END }
+            labels.update( (code, alphabet.label(code)) 
+                           for code in range(len(alphabet)) )
+            self._relations = FollowLanguage([
+                DirectlyFollowPair(
+                    labels[pair[0]], labels[pair[1]], freq,
+                    preceeding=set( labels[c] for c in preceding[pair] ),
+                    proceeding=set( labels[c] for c in proceeding[pair] )
+                )
+                for pair, freq in freqs.items()
+            ])
 
             # relations computed 
             info(f"Computed relations in {(time()-start)*1000:.0f}ms")
@@ -219,10 +600,17 @@ class EventLog():
 
     # membership test
     def __contains__(self, other):
+        """
+        Tests whether a trace is a variant of this language, or whether some
+        variant matches a pattern (a tuple or list of activities, where "*" 
+        matches any number of activities and "?" exactly one activity).
+        """
         if isinstance(other, Trace):
             return other in self._freqset.keys()
-        raise NotImplemented("Membership test not defined for :: "
-         + type(other))
+        if isinstance(other, (tuple, list)):
+            return other in self.variant_index()
+        raise NotImplementedError("Membership test not defined for :: "
+         + str(type(other)))
 
     # Rich comparisons 
     # https://peps.python.org/pep-0207/#classes
@@ -235,56 +623,111 @@ class EventLog():
 
     def __lt__(self,other) -> bool:
         """
-        Tests whether this event log is a proper subset of 
-        another event log.
+        Tests whether this event log is strictly included in another event
+        log as a multiset, i.e. this log is included in the other (see 
+        `__le__`) and the logs are not equal.
         """
         if isinstance(other,EventLog):
-            this_traces = self._traces
-            other_traces = other._traces
-            if (this_traces.issubset(other_traces)):
-                diff_set = other_traces.difference(
-                    this_traces )
-                return len(diff_set) > 0
-            return False
+            return self <= other and self != other
         raise NotImplementedError("Subset comparsion" +
          f" between an EventLog (simple) and {type(other)}" +
           " is not defined.") 
 
     def __le__(self,other) -> bool:
         """
-        Tests whether this event log is a subset of 
-        another event log.
+        Tests whether this event log is included in another event log as a
+        multiset, i.e. every variant is at most as frequent in this log as
+        in the other.
         """ 
         if isinstance(other,EventLog):
-            this_traces = self._traces
-            other_traces = other._traces
-            return this_traces.issubset(other_traces)
+            theirs = other._freqset
+            return all( freq <= theirs.get(trace, 0) 
+                        for trace, freq in self._freqset.items() )
         raise NotImplementedError("Subset comparsion" +
          f" between an EventLog (simple) and {type(other)}" +
           " is not defined.") 
 
     def __gt__(self,other) -> bool:
-        pass 
+        """
+        Tests whether this event log strictly includes another event log as
+        a multiset, i.e. the other log is strictly included in this log.
+        """
+        if isinstance(other,EventLog):
+            return other < self
+        raise NotImplementedError("Superset comparsion" +
+         f" between an EventLog (simple) and {type(other)}" +
+          " is not defined.") 
 
     def __ge__(self,other) -> bool:
-        pass 
+        """
+        Tests whether this event log includes another event log as a 
+        multiset, i.e. the other log is included in this log.
+        """
+        if isinstance(other,EventLog):
+            return other <= self
+        raise NotImplementedError("Superset comparsion" +
+         f" between an EventLog (simple) and {type(other)}" +
+          " is not defined.") 
     
-    # Emulating numeric types
-    # do we need these? could be cool for extra bits
-    # <<, >>, &, ^, |
-    def __lshift__(self, other):
-        pass 
+    # Emulating numeric types, as multiset operations over the 
+    # frequencies of variants, see multiset.md
+    # +, -, |, &, ^
+    def _combine(self, other:'EventLog', 
+                 combine:Callable[[int,int],int]) -> 'EventLog':
+        """
+        Creates a log of the same name, where the frequency of each variant
+        is combined from its frequency in this log and the other log. 
+        Variants combined to zero or less are left out.
+        """
+        freqs = dict()
+        ours = self._freqset
+        theirs = other._freqset
+        for trace, freq in ours.items():
+            count = combine(freq, theirs.get(trace, 0))
+            if (count > 0):
+                freqs[trace] = count
+        for trace, freq in theirs.items():
+            if (trace not in ours):
+                count = combine(0, freq)
+                if (count > 0):
+                    freqs[trace] = count
+        return self.__class__.from_frequencies(freqs, self.name)
+
+    def __add__(self, other):
+        "Sum of two event logs, adding the frequencies of variants."
+        if isinstance(other, EventLog):
+            return self._combine(other, lambda a,b: a + b)
+        return NotImplemented
+
+    def __sub__(self, other):
+        """
+        Difference of two event logs, removing the frequencies of variants 
+        in the other log (down to zero).
+        """
+        if isinstance(other, EventLog):
+            return self._combine(other, lambda a,b: a - b)
+        return NotImplemented
 
-    def __rshift__(self, other):
-        pass 
+    def __or__(self, other):
+        "Union of two event logs, keeping the largest frequency of variants."
+        if isinstance(other, EventLog):
+            return self._combine(other, max)
+        return NotImplemented
 
     def __and__(self, other):
-        pass
+        """
+        Intersection of two event logs, keeping the smallest frequency of 
+        variants.
+        """
+        if isinstance(other, EventLog):
+            return self._combine(other, min)
+        return NotImplemented
 
     def __xor__(self, other):
-        pass
-
-    def __or__(self, other):
-        pass
-
-
+        """
+        Symmetric difference of two event logs, keeping the difference 
+        between the frequencies of variants.
+        """
+        if isinstance(other, EventLog):
+            return self._combine(other, lambda a,b: abs(a - b))
+        return NotImplemented
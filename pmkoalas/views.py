@@ -0,0 +1,313 @@
+"""
+This module contains lazy views over event logs, which select variants of a
+parent log through chainable predicates without copying the parent.
+
+Included are the following structures:
+    - `LogView`, a view over a simplified event log (`EventLog`).
+    - `ComplexLogView`, a view over a complex event log (`ComplexEventLog`).
+
+A view is created with `log.view()` and narrowed with predicates, i.e.
+`log.view().with_length(at_least=3).containing("a")`. Predicates are only
+evaluated when the view is first used as a log, after which the view
+behaves as the log it selects, sharing the traces (and instances) of its
+parent. Views are read-only.
+"""
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, \
+    Mapping, Set, Tuple, Union
+
+from pmkoalas._logging import info
+from pmkoalas.simple import Trace, EventLog, DEFAULT_SIMPLE_LOG_NAME
+from pmkoalas.complex import ComplexEventLog, ComplexTrace
+
+Predicate = Callable[[Trace,int],bool]
+
+# predicates used by views are module-level classes rather than lambdas,
+# so that views over picklable logs are picklable too
+class _FrequencyBounds():
+    "Selects variants with a frequency in the given bounds."
+
+    def __init__(self, at_least:int, at_most:int=None) -> None:
+        self.at_least = at_least
+        self.at_most = at_most
+
+    def __call__(self, trace:Trace, freq:int) -> bool:
+        if self.at_most is None:
+            return freq >= self.at_least
+        return self.at_least <= freq <= self.at_most
+
+class _LengthBounds():
+    "Selects variants with a length in the given bounds."
+
+    def __init__(self, at_least:int, at_most:int=None) -> None:
+        self.at_least = at_least
+        self.at_most = at_most
+
+    def __call__(self, trace:Trace, freq:int) -> bool:
+        if self.at_most is None:
+            return len(trace) >= self.at_least
+        return self.at_least <= len(trace) <= self.at_most
+
+class _Excluding():
+    "Selects variants where none of the activities occur."
+
+    def __init__(self, activities:Iterable[str]) -> None:
+        self.acts = frozenset(activities)
+
+    def __call__(self, trace:Trace, freq:int) -> bool:
+        return self.acts.isdisjoint(trace.seen_activities())
+
+class _Boundary():
+    """
+    Selects variants where the activity at the given position (the first
+    or the last) is one of the activities.
+    """
+
+    def __init__(self, activities:Iterable[str], position:int) -> None:
+        self.acts = frozenset(activities)
+        self.position = position
+
+    def __call__(self, trace:Trace, freq:int) -> bool:
+        return len(trace) > 0 and trace[self.position] in self.acts
+
+def _evaluated(name:str) -> property:
+    "An attribute of the log, computed when the view is first evaluated."
+    def get(self):
+        return self._ensure_evaluated()[name]
+    return property(get)
+
+def _activities(position:int) -> property:
+    "An activity set of the log, computed when it is first asked for."
+    def get(self):
+        if self._activity_sets is None:
+            self._activity_sets = _boundaries(self._freqset.keys())
+        return self._activity_sets[position]
+    return property(get)
+
+class _DeferredView():
+    """
+    Shared behaviour of views, where the state of the log is only computed
+    when it is first needed (see `_ensure_evaluated`), and the activities 
+    of the selected variants only when they are asked for.
+    """
+    # the state of the log, as properties over the evaluated view
+    _freqset = _evaluated("_freqset")
+    _len = _evaluated("_len")
+    _variants = _evaluated("_variants")
+    _acts = _activities(0)
+    _start_acts = _activities(1)
+    _end_acts = _activities(2)
+
+    def __init__(self, parent, predicates:Tuple[Predicate]=(),
+                 required:FrozenSet[str]=frozenset()) -> None:
+        self._parent = parent
+        self._predicates = tuple(predicates)
+        self._required = frozenset(required)
+        self._state = None
+        self._activity_sets = None
+        self._variant_set = None
+
+    def _narrow(self, predicate:Predicate=None,
+                required:Iterable[str]=()) -> '_DeferredView':
+        "Creates a view over the same parent, with a further restriction."
+        predicates = self._predicates
+        if predicate is not None:
+            predicates = predicates + (predicate,)
+        return self.__class__(self._parent, predicates,
+                              self._required.union(required), self.name)
+
+    def _matches(self, trace:Trace, freq:int) -> bool:
+        "Tests whether a variant is selected by this view."
+        for predicate in self._predicates:
+            if not predicate(trace, freq):
+                return False
+        return True
+
+    def _evaluate(self) -> Dict[str,object]:
+        "Computes the state of the log, by the name of each attribute."
+        raise NotImplementedError()
+
+    def _ensure_evaluated(self) -> Dict[str,object]:
+        """
+        Get the state of the log, evaluating the predicates of this view 
+        when first called (errors raised by predicates are passed on).
+        """
+        if self._state is None:
+            info(f"evaluating view over :: {self._parent.get_name()}")
+            self._state = self._evaluate()
+        return self._state
+
+    @property
+    def _traces(self) -> Set[Trace]:
+        if self._variant_set is None:
+            self._variant_set = set(self._freqset.keys())
+        return self._variant_set
+
+    # chainable predicates
+    def where(self, predicate:Predicate) -> '_DeferredView':
+        """
+        Get a view of the variants for which the predicate holds, where the
+        predicate is given a variant and its frequency.
+        """
+        return self._narrow(predicate)
+
+    def with_frequency(self, at_least:int=1,
+                       at_most:int=None) -> '_DeferredView':
+        "Get a view of the variants with a frequency in the given bounds."
+        return self._narrow(_FrequencyBounds(at_least, at_most))
+
+    def with_length(self, at_least:int=0,
+                    at_most:int=None) -> '_DeferredView':
+        "Get a view of the variants with a length in the given bounds."
+        return self._narrow(_LengthBounds(at_least, at_most))
+
+    def containing(self, *activities:str) -> '_DeferredView':
+        "Get a view of the variants where all of the activities occur."
+        return self._narrow(required=activities)
+
+    def excluding(self, *activities:str) -> '_DeferredView':
+        "Get a view of the variants where none of the activities occur."
+        return self._narrow(_Excluding(activities))
+
+    def starting_with(self, *activities:str) -> '_DeferredView':
+        "Get a view of the variants starting with one of the activities."
+        return self._narrow(_Boundary(activities, 0))
+
+    def ending_with(self, *activities:str) -> '_DeferredView':
+        "Get a view of the variants ending with one of the activities."
+        return self._narrow(_Boundary(activities, -1))
+
+    def parent(self):
+        "Get the log that this view selects from."
+        return self._parent
+
+def _boundaries(variants:Iterable[Trace]) \
+        -> Tuple[FrozenSet[str],FrozenSet[str],FrozenSet[str]]:
+    "Get the activities, start activities and end activities of variants."
+    acts, starts, ends = set(), set(), set()
+    for trace in variants:
+        acts.update(trace.seen_activities())
+        if (len(trace) > 0):
+            starts.add(trace[0])
+            ends.add(trace[-1])
+    return frozenset(acts), frozenset(starts), frozenset(ends)
+
+class LogView(_DeferredView, EventLog):
+    """
+    A lazy view over the variants of a simplified event log, which can be
+    used wherever an `EventLog` is accepted. Variants requiring activities
+    (see `containing`) are found through the activity index of the parent.
+    A view may be restricted to a selection of the parent's variants, such
+    as those from `EventLog.top_variants`, in which case only the selection
+    is evaluated.
+    """
+    def __init__(self, parent:EventLog, predicates:Tuple[Predicate]=(),
+                 required:FrozenSet[str]=frozenset(),
+                 name:str=None, 
+                 selection:Tuple[Tuple[Trace,int]]=None) -> None:
+        _DeferredView.__init__(self, parent, predicates, required)
+        self.name = parent.get_name() if name is None else name
+        # the variants of the parent to select from, or all if None
+        self._selection = selection
+        self._init_caches()
+
+    def _narrow(self, predicate:Predicate=None,
+                required:Iterable[str]=()) -> 'LogView':
+        view = _DeferredView._narrow(self, predicate, required)
+        view._selection = self._selection
+        return view
+
+    @classmethod
+    def from_frequencies(cls, frequencies:Union[Mapping[Trace,int],
+                                                Iterable[Tuple[Trace,int]]],
+                         name:str=DEFAULT_SIMPLE_LOG_NAME) -> EventLog:
+        "Creates a (materialised) language, see `EventLog.from_frequencies`."
+        return EventLog.from_frequencies(frequencies, name)
+
+    @classmethod
+    def from_shards(cls, shards:Iterable[Iterable[Trace]],
+                    name:str=DEFAULT_SIMPLE_LOG_NAME,
+                    workers:int=1) -> EventLog:
+        "Creates a (materialised) language, see `EventLog.from_shards`."
+        return EventLog.from_shards(shards, name, workers)
+
+    def _candidates(self) -> Iterator[Tuple[Trace,int]]:
+        "Get the variants of the parent that may be selected."
+        if self._selection is not None:
+            required = self._required
+            if not required:
+                return iter(self._selection)
+            return ( (trace, freq) for trace, freq in self._selection
+                     if required <= trace.seen_activities() )
+        if not self._required:
+            return iter(self._parent)
+        index = self._parent.activity_index()
+        return ( index.variant(vid)
+                 for vid in index.containing(*self._required) )
+
+    def _evaluate(self) -> Dict[str,object]:
+        freqset = dict(
+            (trace, freq) for trace, freq in self._candidates()
+            if self._matches(trace, freq)
+        )
+        return dict(
+            _freqset=freqset,
+            _len=sum(freqset.values()),
+            _variants=len(freqset)
+        )
+
+    def materialise(self) -> EventLog:
+        "Creates a new event log with the variants of this view."
+        return EventLog.from_frequencies(self._freqset, self.name)
+
+class ComplexLogView(_DeferredView, ComplexEventLog):
+    """
+    A lazy view over the variants of a complex event log, which can be used
+    wherever a `ComplexEventLog` is accepted. Predicates are given the
+    simplified variant and its number of instances.
+    """
+    _instances = _evaluated("_instances")
+    _pop_size = _evaluated("_pop_size")
+
+    def __init__(self, parent:ComplexEventLog,
+                 predicates:Tuple[Predicate]=(),
+                 required:FrozenSet[str]=frozenset(),
+                 name:str=None) -> None:
+        _DeferredView.__init__(self, parent, predicates, required)
+        self.name = parent.get_name() if name is None else name
+        self._view = None
+        self._map = parent.data()
+
+    @classmethod
+    def from_instances(cls, instances:Mapping[Trace,Iterable[ComplexTrace]],
+                       data:Mapping[str,object]=None,
+                       name:str=None) -> ComplexEventLog:
+        "Creates a (materialised) collection, see `ComplexEventLog`."
+        if name is None:
+            return ComplexEventLog.from_instances(instances, data)
+        return ComplexEventLog.from_instances(instances, data, name)
+
+    def _evaluate(self) -> Dict[str,object]:
+        required = self._required
+        # instances are shared with the parent, and are not modified
+        selected = dict(
+            (strace, collector)
+            for strace, collector in self._parent._instances.items()
+            if required <= strace.seen_activities()
+                and self._matches(strace, len(collector))
+        )
+        freqset = dict(
+            (strace, len(collector)) for strace, collector in selected.items()
+        )
+        size = sum(freqset.values())
+        return dict(
+            _instances=selected,
+            _freqset=freqset,
+            _len=size,
+            _pop_size=size,
+            _variants=len(selected)
+        )
+
+    def materialise(self) -> ComplexEventLog:
+        "Creates a new collection with the variants of this view."
+        return ComplexEventLog.from_instances(self._instances, self._map,
+                                              self.name)
@@ -1,8 +1,24 @@
 """
-This module includes attributes keys for the XES format.
+This module includes attributes keys for the XES format, and helpers 
+shared by its readers and writers.
 """
 
 XES_XML_NAMESPACE = { 'xes' : "http://www.xes-standard.org/"}
 
 XES_CONCEPT = "concept:name"
-XES_TIME = "time:timestamp"
\ No newline at end of file
+XES_TIME = "time:timestamp"
+# the number of cases of a trace variant that is written once
+XES_VARIANT_COUNT = "meta:variant:count"
+
+XES_GZIP_SUFFIX = ".gz"
+GZIP_MAGIC = b"\x1f\x8b"
+
+def is_compressed(filepath:str) -> bool:
+    """
+    Checks if the given file is gzip compressed, either by its extension
+    (i.e. `.xes.gz`) or by the magic bytes at the start of the file.
+    """
+    if filepath.lower().endswith(XES_GZIP_SUFFIX):
+        return True
+    with open(filepath, "rb") as f:
+        return f.read(len(GZIP_MAGIC)) == GZIP_MAGIC
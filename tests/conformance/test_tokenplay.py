@@ -8,6 +8,7 @@ from pmkoalas.models.petrinets.pn import Place, LabelledPetriNet
 from pmkoalas.models.petrinets.pn import AcceptingPetriNet, PetriNetMarking
 from pmkoalas.models.petrinets.pn import get_execution_semantics
 from pmkoalas.conformance.tokenreplay import generate_traces_from_lpn
+from pmkoalas.conformance.tokenreplay import PlayoutTrace, PlayoutEvent
 
 test_lpn = parse_net_fragments(
     "test_lpn_seq",
@@ -37,6 +38,17 @@ class MatchingTests(unittest.TestCase):
     def tearDown(self) -> None:
         super().tearDown()
 
+    def test_playout_copy(self):
+        from copy import deepcopy
+        from pickle import dumps, loads
+        trace = PlayoutTrace([ PlayoutEvent("A", None), 
+                               PlayoutEvent("B", None) ])
+        for other in [deepcopy(trace), loads(dumps(trace))]:
+            self.assertIs(type(other), PlayoutTrace)
+            self.assertEqual(other, trace)
+            self.assertEqual(other.act(1), "B")
+            self.assertEqual(other.acut(1), Trace(["A"]))
+
     def test_generate_max_len(self):
         exnet = get_execution_semantics(test_lpn)
         log = generate_traces_from_lpn(exnet, 3)
@@ -0,0 +1,83 @@
+import unittest
+from importlib.util import find_spec
+
+from pmkoalas.simple import Trace, EventLog
+from pmkoalas.columnar import ColumnarEventLog
+
+SKIP_NUMPY = find_spec("numpy") == None
+
+LOG = EventLog([
+    Trace(["a","b","c"]),
+    Trace(["a","b","c"]),
+    Trace(["a","c"]),
+    Trace([]),
+    Trace(["b","b"]),
+], "columns")
+
+def describe(flang):
+    return [ 
+        (p.left(), p.right(), p.frequency(), 
+         sorted(p.preceding()), sorted(p.proceeding()))
+        for p in flang.pairs()
+    ]
+
+@unittest.skipIf(SKIP_NUMPY, "numpy is not installed")
+class ColumnarEventLogTest(unittest.TestCase):
+
+    def test_columns(self):
+        log = ColumnarEventLog.from_log(LOG)
+        self.assertEqual(log, LOG)
+        self.assertEqual(log.get_name(), "columns")
+        self.assertEqual(log.codes().tolist(), [0,1,2,0,2,1,1])
+        self.assertEqual(log.offsets().tolist(), [0,3,5,5,7])
+        self.assertEqual(log.frequencies().tolist(), [2,1,1,1])
+        self.assertEqual(len(log), 5)
+        self.assertEqual(log.get_nvariants(), 4)
+        # variants are only kept as columns
+        self.assertNotIn("_freqset", log.__dict__)
+        self.assertNotIn("_encoded", log.__dict__)
+        self.assertEqual(list(log), list(LOG))
+        self.assertEqual(ColumnarEventLog(Trace(t) for t in 
+                                          ["abc", "abc", "ac", "", "bb"]),
+                         LOG)
+        self.assertIsInstance(log + log, ColumnarEventLog)
+        self.assertEqual(log + log, LOG + LOG)
+
+    def test_contains(self):
+        log = ColumnarEventLog.from_log(LOG)
+        self.assertIn(Trace(["a","b","c"]), log)
+        self.assertIn(Trace([]), log)
+        self.assertIn(Trace(["b","b"]), log)
+        self.assertNotIn(Trace(["b","a"]), log)
+        self.assertNotIn(Trace(["a","b","d"]), log)
+        self.assertNotIn(Trace([]), ColumnarEventLog.from_log(
+            EventLog([Trace(["a"])])))
+        self.assertIn(("*","b","c"), log)
+
+    def test_primitives(self):
+        log = ColumnarEventLog.from_log(LOG)
+        self.assertEqual(log.length_histogram(), {0:1, 2:2, 3:2})
+        self.assertEqual(log.activity_counts(), {"a":3, "b":4, "c":3})
+        self.assertEqual(log.start_counts(), {"a":3, "b":1})
+        self.assertEqual(log.end_counts(), {"c":3, "b":1})
+        self.assertEqual(log.seen_activities(), LOG.seen_activities())
+        self.assertEqual(log.seen_start_activities(), 
+                         LOG.seen_start_activities())
+        self.assertEqual(log.seen_end_activities(), 
+                         LOG.seen_end_activities())
+        self.assertIsInstance(log.seen_start_activities(), frozenset)
+        self.assertEqual(log.pair_counts(), 
+            {("a","b"):2, ("b","c"):2, ("a","c"):1, ("b","b"):1})
+
+    def test_directly_follow_relations(self):
+        log = ColumnarEventLog.from_log(LOG)
+        self.assertEqual(describe(log.directly_follow_relations()),
+                         describe(LOG.directly_follow_relations()))
+        empty = ColumnarEventLog([])
+        self.assertEqual(len(empty.directly_follow_relations()), 0)
+        self.assertEqual(empty.length_histogram(), {})
+        self.assertEqual(empty.start_counts(), {})
+        self.assertEqual(empty.seen_activities(), set())
+
+if __name__ == '__main__':
+    unittest.main()
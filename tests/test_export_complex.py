@@ -3,7 +3,8 @@ from os import path
 from tempfile import TemporaryDirectory
 
 from pmkoalas.read import read_xes_complex
-from pmkoalas.export import export_to_xes_complex
+from pmkoalas.export import export_to_xes_complex, XesStreamWriter
+from pmkoalas.simple import EventLog, Trace
 
 import xmlschema
 
@@ -47,6 +48,113 @@ class DTLogTest(unittest.TestCase):
 
         fdir.cleanup()
 
+    def test_compressed_export_import(self):
+        log = read_xes_complex(SSMALL)
+        fdir = TemporaryDirectory()
+        try:
+            filepath = path.join(fdir.name, "test_log.xes.gz")
+            export_to_xes_complex(filepath, log)
+            with open(filepath, "rb") as f:
+                self.assertEqual(f.read(2), b"\x1f\x8b")
+            self.assertEqual(log, read_xes_complex(filepath))
+            # compressed input is also detected without the extension
+            filepath = path.join(fdir.name, "test_log")
+            export_to_xes_complex(filepath, log, compress=True)
+            self.assertEqual(log, read_xes_complex(filepath))
+        finally:
+            fdir.cleanup()
+
+    def test_parallel_export(self):
+        log = read_xes_complex(DSMALL)
+        fdir = TemporaryDirectory()
+        try:
+            expected = path.join(fdir.name, "expected.xes")
+            export_to_xes_complex(expected, log)
+            filepath = path.join(fdir.name, "parallel.xes")
+            export_to_xes_complex(filepath, log, workers=2)
+            with open(expected, "rb") as e, open(filepath, "rb") as f:
+                self.assertEqual(e.read(), f.read())
+        finally:
+            fdir.cleanup()
+
+    def test_stream_writer(self):
+        log = read_xes_complex(DSMALL)
+        fdir = TemporaryDirectory()
+        try:
+            expected = path.join(fdir.name, "expected.xes")
+            export_to_xes_complex(expected, log)
+            filepath = path.join(fdir.name, "streamed.xes")
+            with XesStreamWriter(filepath, log.get_name(), 
+                                 log.data()) as writer:
+                for _, instances in log:
+                    for trace in instances:
+                        writer.write_trace(trace)
+            with open(expected, "rb") as e, open(filepath, "rb") as f:
+                self.assertEqual(e.read(), f.read())
+        finally:
+            fdir.cleanup()
+
+    def test_stream_writer_append(self):
+        traces = [ Trace(["A","B"]), Trace(["A","C"]), Trace(["A","B"]) ]
+        fdir = TemporaryDirectory()
+        try:
+            filepath = path.join(fdir.name, "appended.xes")
+            with XesStreamWriter(filepath, "appended") as writer:
+                writer.write_trace(traces[0])
+            with XesStreamWriter(filepath, append=True) as writer:
+                writer.write_trace(traces[1])
+                writer.write_trace(traces[2])
+            log = read_xes_complex(filepath)
+            self.assertEqual(log, EventLog(traces))
+            self.assertEqual(log.get_name(), "appended")
+            names = sorted( trace.data()["concept:name"] 
+                            for _, instances in log for trace in instances )
+            self.assertEqual(names, ["trace 1", "trace 2", "trace 3"])
+            # an unfinished document loses its incomplete trace
+            with open(filepath, "rb") as f:
+                document = f.read()
+            with open(filepath, "wb") as f:
+                f.write(document[:document.rfind(b"<event>")])
+            with XesStreamWriter(filepath, append=True) as writer:
+                writer.write_trace(traces[1])
+            self.assertEqual(read_xes_complex(filepath), 
+                             EventLog(traces[:2] + traces[1:2]))
+            # a document without traces is continued after its header
+            filepath = path.join(fdir.name, "empty.xes")
+            with XesStreamWriter(filepath, "empty"):
+                pass
+            self.assertEqual(len(read_xes_complex(filepath)), 0)
+            with XesStreamWriter(filepath, append=True) as writer:
+                writer.write_trace(traces[0])
+            log = read_xes_complex(filepath)
+            self.assertEqual(log, EventLog(traces[:1]))
+            self.assertEqual(log.get_name(), "empty")
+            # a header without the closing of the log is continued
+            with open(filepath, "rb") as f:
+                document = f.read()
+            header = document[:document.find(b"<trace")]
+            for unfinished in [ header, header + b"<trace>\n\t\t<string" ]:
+                with open(filepath, "wb") as f:
+                    f.write(unfinished)
+                with XesStreamWriter(filepath, append=True) as writer:
+                    writer.write_trace(traces[1])
+                log = read_xes_complex(filepath)
+                self.assertEqual(log, EventLog(traces[1:2]))
+                self.assertEqual(log.get_name(), "empty")
+            with open(filepath, "wb") as f:
+                f.write(b"<?xml version='1.0' encoding='UTF-8'?>\n<lo")
+            with self.assertRaises(ValueError):
+                XesStreamWriter(filepath, append=True).open()
+            # compressed documents cannot be appended to
+            filepath = path.join(fdir.name, "appended.xes.gz")
+            with XesStreamWriter(filepath) as writer:
+                writer.write_trace(traces[0])
+            with self.assertRaises(ValueError):
+                with XesStreamWriter(filepath, append=True) as writer:
+                    pass
+        finally:
+            fdir.cleanup()
+
     def test_xml_valid(self):
         try:
             log = read_xes_complex(SSMALL) 
@@ -2,7 +2,7 @@ import unittest
 from os import path 
 from tempfile import TemporaryDirectory
 
-from pmkoalas.read import read_xes_simple
+from pmkoalas.read import read_xes_simple, iter_xes_complex
 from pmkoalas.export import export_to_xes_simple
 
 import xmlschema
@@ -46,6 +46,64 @@ class DTLogTest(unittest.TestCase):
 
         fdir.cleanup()
 
+    def test_compressed_export_import(self):
+        log = read_xes_simple(SSMALL)
+        fdir = TemporaryDirectory()
+        try:
+            filepath = path.join(fdir.name, "test_log.xes.gz")
+            export_to_xes_simple(filepath, log)
+            with open(filepath, "rb") as f:
+                self.assertEqual(f.read(2), b"\x1f\x8b")
+            self.assertEqual(log, read_xes_simple(filepath))
+            # compressed input is also detected without the extension
+            filepath = path.join(fdir.name, "test_log")
+            export_to_xes_simple(filepath, log, compress=True)
+            self.assertEqual(log, read_xes_simple(filepath))
+        finally:
+            fdir.cleanup()
+
+    def test_compact_export_import(self):
+        log = read_xes_simple(SSMALL)
+        fdir = TemporaryDirectory()
+        try:
+            filepath = path.join(fdir.name, "test_log.xes")
+            export_to_xes_simple(filepath, log, pretty=False)
+            with open(filepath, "rb") as f:
+                self.assertEqual(f.read().count(b"\n"), 1)
+            self.assertEqual(log, read_xes_simple(filepath))
+        finally:
+            fdir.cleanup()
+
+    def test_variant_instances_named(self):
+        log = read_xes_simple(SSMALL)
+        fdir = TemporaryDirectory()
+        try:
+            filepath = path.join(fdir.name, "test_log.xes")
+            export_to_xes_simple(filepath, log)
+            names = [ trace.data()["concept:name"] 
+                      for trace in iter_xes_complex(filepath) ]
+            self.assertEqual(names, 
+                [ f"trace {id}" for id in range(1, len(log) + 1) ])
+        finally:
+            fdir.cleanup()
+
+    def test_variant_export_import(self):
+        log = read_xes_simple(SSMALL)
+        fdir = TemporaryDirectory()
+        try:
+            filepath = path.join(fdir.name, "test_log.xes")
+            export_to_xes_simple(filepath, log, variants=True)
+            names = [ trace.data()["concept:name"] 
+                      for trace in iter_xes_complex(filepath) ]
+            self.assertEqual(names, 
+                [ f"variant {id}" 
+                  for id in range(1, log.get_nvariants() + 1) ])
+            for fast in [False, True]:
+                self.assertEqual(log, read_xes_simple(filepath, fast=fast))
+            self.assertEqual(log, read_xes_simple(filepath, workers=2))
+        finally:
+            fdir.cleanup()
+
     def test_xml_valid(self):
         try:
             log = read_xes_simple(SSMALL) 
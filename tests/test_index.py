@@ -0,0 +1,131 @@
+import unittest
+from itertools import product
+from re import fullmatch
+
+from pmkoalas.simple import Trace, EventLog
+from pmkoalas.dtlog import convert
+from pmkoalas.index import VariantIndex, PATTERN_GAP, PATTERN_ANY
+
+def _brute(log:EventLog, pattern):
+    "Matches a pattern by scanning every variant."
+    regex = "".join(
+        "(?:[a-z],)*" if act == PATTERN_GAP else
+        "[a-z]," if act == PATTERN_ANY else
+        act + ","
+        for act in pattern
+    )
+    return dict( (trace, freq) for trace, freq in log
+                 if fullmatch(regex, "".join(a + "," for a in trace)) )
+
+class VariantIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.log = convert(
+            "a b c d", "a b c d", "a c b d", "a b", "b c", "c", "",
+            "a b c d e", "d a b", "a a b b"
+        )
+        self.index = self.log.variant_index()
+
+    def test_lazy(self):
+        self.assertIsInstance(self.index, VariantIndex)
+        self.assertIs(self.index, self.log.variant_index())
+
+    def test_prefix(self):
+        match = self.index.prefix(["a","b"])
+        self.assertEqual(match.variants(), {
+            Trace(["a","b","c","d"]) : 2,
+            Trace(["a","b"]) : 1,
+            Trace(["a","b","c","d","e"]) : 1
+        })
+        self.assertEqual(match.frequency, 4)
+        self.assertEqual(len(match), 3)
+        self.assertEqual(self.index.prefix([]).frequency, len(self.log))
+        self.assertFalse(self.index.prefix(["e"]))
+
+    def test_suffix(self):
+        match = self.index.suffix(["b"])
+        self.assertEqual(match.variants(), {
+            Trace(["a","b"]) : 1,
+            Trace(["d","a","b"]) : 1,
+            Trace(["a","a","b","b"]) : 1
+        })
+        self.assertEqual(match.frequency, 3)
+        self.assertFalse(self.index.suffix(["a"]))
+
+    def test_frequency(self):
+        self.assertEqual(self.index.frequency(["a","b","c","d"]), 2)
+        self.assertEqual(self.index.frequency([]), 1)
+        self.assertEqual(self.index.frequency(["a","b","c"]), 0)
+
+    def test_patterns(self):
+        acts = ["a", "b", "d", PATTERN_GAP, PATTERN_ANY]
+        for size in range(5):
+            for pattern in product(acts, repeat=size):
+                match = self.index.match(pattern)
+                expected = _brute(self.log, pattern)
+                self.assertEqual(match.variants(), expected, pattern)
+                self.assertEqual(match.frequency, sum(expected.values()),
+                                 pattern)
+
+    def test_unseen(self):
+        self.assertFalse(self.index.match(["*","z","*"]))
+        self.assertEqual(self.index.match(["*","z","*"]).variants(), {})
+
+    def test_contains(self):
+        self.assertIn(("*","a","b","*"), self.log)
+        self.assertIn(["?","a","b"], self.log)
+        self.assertNotIn(("*","b","a","*"), self.log)
+        self.assertIn(Trace(["a","b"]), self.log)
+        self.assertNotIn(Trace(["*","a","b","*"]), self.log)
+        self.assertIn((), self.log)
+        self.assertNotIn((), EventLog([]))
+        with self.assertRaises(NotImplementedError):
+            1 in self.log
+
+class ActivityIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.log = convert(
+            "a b c d", "a b c d", "a c b d", "a b", "b c", "c", "",
+            "a b c d e", "d a b", "a a b b"
+        )
+        self.index = self.log.activity_index()
+
+    def test_lazy(self):
+        self.assertIs(self.index, self.log.activity_index())
+
+    def test_postings(self):
+        for vid, (trace, _) in enumerate(self.log):
+            self.assertEqual(self.index.variant(vid)[0], trace)
+        a_a_b_b = [ vid for vid, (trace, _) in enumerate(self.log) 
+                    if trace == Trace(["a","a","b","b"]) ][0]
+        self.assertEqual(self.index.postings("b")[a_a_b_b], (2,3))
+        self.assertEqual(self.index.postings("z"), {})
+
+    def test_filter_containing(self):
+        self.assertEqual(self.log.filter_containing("a","d"), 
+            convert("a b c d", "a b c d", "a c b d", "a b c d e", "d a b"))
+        self.assertEqual(self.log.filter_containing("z"), EventLog([]))
+        self.assertEqual(self.log.filter_containing(), self.log)
+
+    def test_filter_eventually_follows(self):
+        self.assertEqual(self.log.filter_eventually_follows("a","d"), 
+            convert("a b c d", "a b c d", "a c b d", "a b c d e"))
+        self.assertEqual(self.log.filter_eventually_follows("b","a"), 
+            EventLog([]))
+        self.assertEqual(self.log.filter_eventually_follows("a","a"), 
+            convert("a a b b"))
+
+    def test_first_precedes(self):
+        from pmkoalas.discovery.agrawal_miner import _check_follows_for
+        acts = self.log.seen_activities()
+        for actA, actB in product(acts, acts):
+            if actA == actB:
+                continue
+            traces = [ trace for trace, _ in self.log 
+                       if actA in trace.seen_activities() 
+                       and actB in trace.seen_activities() ]
+            before = sum( 1 for trace in traces 
+                          if _check_follows_for(trace, actB, actA) )
+            self.assertEqual(self.index.first_precedes(actA, actB), 
+                             (len(traces), before), (actA, actB))
@@ -1,8 +1,14 @@
 import unittest
 from os import path 
 from datetime import datetime
+from tempfile import TemporaryDirectory
+from shutil import copyfile
+from unittest import mock
+from copy import deepcopy
 
 from pmkoalas.read import read_xes_simple,read_xes_complex
+from pmkoalas.read import iter_xes_complex, read_xes_header
+from pmkoalas.read import read_xes_many_complex
 from pmkoalas.simple import EventLog,Trace
 from pmkoalas.complex import ComplexEventLog, ComplexTrace, ComplexEvent
 
@@ -11,6 +17,24 @@ WSMALL = path.join(".","tests","small_02.xes")
 OSMALL = path.join(".","tests","small_03.xes")
 DSMALL = path.join(".","tests","small_04.xes")
 
+MALFORMED_LOG = """<?xml version="1.0" encoding="UTF-8" ?>
+<log xes.version="1.0" xmlns="http://www.xes-standard.org/">
+    <trace>
+        <int key="cost" value="1"/>
+        <date key="opened" value="not a date"/>
+        <event>
+            <string key="concept:name" value="A"/>
+            <int key="res" value="0"/>
+            <date key="time:timestamp" value="not a date"/>
+        </event>
+        <event>
+            <string key="concept:name" value="B"/>
+            <int key="count" value="many"/>
+        </event>
+    </trace>
+</log>
+"""
+
 class DTLogTest(unittest.TestCase):
 
     def test_successful_read(self):
@@ -105,6 +129,155 @@ class DTLogTest(unittest.TestCase):
         self.maxDiff = None
         self.assertEqual(log.__repr__(), real_log.__repr__())
 
+    def test_iter_traces(self):
+        traces = iter_xes_complex(SSMALL)
+        first = next(traces)
+        self.assertEqual(first.simplify(), Trace(["A","B","C","D","E"]))
+        self.assertEqual(first.data(), {'concept:name' : 'trace 01'})
+        rest = list(traces)
+        self.assertEqual(len(rest), 4)
+        self.assertEqual(
+            ComplexEventLog([first] + rest), read_xes_complex(SSMALL)
+        )
+
+    def test_iter_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            iter_xes_complex(path.join(".","tests","missing.xes"))
+
+    def test_read_only_views(self):
+        log = read_xes_complex(DSMALL)
+        self.assertIs(log.get_instances(), log.get_instances())
+        with self.assertRaises(TypeError):
+            log.get_instances()[Trace(['A'])] = ()
+        strace, instances = next(iter(log))
+        self.assertIs(log.seen_instances_for(strace), instances)
+        self.assertEqual(log.seen_instances_for(Trace(['Z'])), ())
+        trace = instances[0]
+        with self.assertRaises(TypeError):
+            trace.data()['trace:cost'] = 0
+        with self.assertRaises(TypeError):
+            trace[0].data()['concept:name'] = 'Z'
+        data = trace.data().copy()
+        data['trace:cost'] = 0
+        self.assertEqual(trace.data()['trace:cost'], 10)
+        # views can be used to create new traces
+        self.assertEqual(ComplexTrace(trace, trace.data()), trace)
+
+    def test_read_header(self):
+        header = read_xes_header(DSMALL)
+        self.assertEqual(header.name, 'A simple complex log')
+        self.assertEqual(header.data, {
+            'concept:name' : 'A simple complex log',
+            'extracted' : datetime.fromisoformat("2122-01-05T01:00:00.000+10:00"),
+            'exporter:ver' : 1,
+            'percent:life' : 0.754,
+            'life' : True 
+        })
+
+    def test_attribute_projection(self):
+        log = read_xes_complex(DSMALL, attributes=['res'], 
+                               trace_attributes=[])
+        self.assertEqual(log.get_nvariants(), 1)
+        trace = log.seen_instances_for(Trace(['A','B','C']))[0]
+        self.assertEqual(trace.data(), dict())
+        self.assertEqual(
+            [ event.data() for event in trace ],
+            [ {'res' : 0}, {'res' : 1}, {'res' : 1} ]
+        )
+        trace = next(iter_xes_complex(DSMALL, attributes=['life'], 
+                                      trace_attributes=['trace:cost']))
+        self.assertEqual(trace.data(), {'trace:cost' : 10})
+        self.assertEqual(
+            [ event.data() for event in trace ],
+            [ {'life' : False}, {'life' : False}, {'life' : True} ]
+        )
+
+    def test_projection_skips_conversion(self):
+        fdir = TemporaryDirectory()
+        try:
+            filepath = path.join(fdir.name, "malformed.xes")
+            with open(filepath, "w") as f:
+                f.write(MALFORMED_LOG)
+            with self.assertRaises(ValueError):
+                read_xes_complex(filepath)
+            log = read_xes_complex(filepath, attributes=['res'], 
+                                   trace_attributes=['cost'])
+            [ trace ] = log.seen_instances_for(Trace(['A','B']))
+            self.assertEqual(trace.data(), {'cost' : 1})
+            self.assertEqual([ event.data() for event in trace ],
+                             [ {'res' : 0}, {} ])
+        finally:
+            fdir.cleanup()
+
+    def test_read_without_copies(self):
+        # events and traces take over the maps built by the reader, so only
+        # the log-level attributes are copied
+        with mock.patch("pmkoalas.complex.deepcopy", 
+                        wraps=deepcopy) as copies:
+            log = read_xes_complex(DSMALL)
+        self.assertEqual(copies.call_count, 1)
+        self.assertEqual(log, read_xes_simple(DSMALL))
+
+    def test_cached_read(self):
+        fdir = TemporaryDirectory()
+        try:
+            filepath = path.join(fdir.name, "cached.xes")
+            copyfile(DSMALL, filepath)
+            log = read_xes_complex(filepath, cache=True)
+            cached = read_xes_complex(filepath, cache=True)
+            self.assertEqual(log.__repr__(), cached.__repr__())
+            self.assertEqual(cached.get_name(), 'A simple complex log')
+            projected = read_xes_complex(filepath, attributes=['res'], 
+                                         cache=True)
+            self.assertEqual(
+                [ ev.data() for ev in 
+                  projected.seen_instances_for(Trace(['A','B','C']))[0] ],
+                [ {'res' : 0}, {'res' : 1}, {'res' : 1} ]
+            )
+        finally:
+            fdir.cleanup()
+
+    def test_subset_read(self):
+        log = read_xes_complex(SSMALL, limit=3)
+        self.assertEqual(log, EventLog([
+                Trace(["A","B","C","D","E"]),
+                Trace(["A","B","C","D","E"]),
+                Trace(["A","A","A","B","E"]),
+        ]))
+        log = read_xes_complex(SSMALL, sample=2, seed=3)
+        self.assertEqual(len(log), 2)
+        self.assertEqual(log.__repr__(), 
+            read_xes_complex(SSMALL, sample=2, seed=3).__repr__())
+        names = [ trace.data()['concept:name'] 
+                  for _, instances in log for trace in instances ]
+        self.assertEqual(len(names), 2)
+
+    def test_parallel_read(self):
+        with mock.patch("pmkoalas.read.READ_PARALLEL_SIZE", 0):
+            log = read_xes_complex(DSMALL, workers=2)
+            self.assertEqual(log.__repr__(), 
+                             read_xes_complex(DSMALL).__repr__())
+            log = read_xes_complex(SSMALL, workers=2)
+            self.assertEqual(log.__repr__(), 
+                             read_xes_complex(SSMALL).__repr__())
+
+    def test_read_many(self):
+        single = read_xes_complex(DSMALL)
+        for workers in [1, 2]:
+            log = read_xes_many_complex([DSMALL, DSMALL], workers=workers)
+            self.assertEqual(log.get_name(), single.get_name())
+            self.assertEqual(len(log), 2 * len(single))
+            grouped = log.get_instances()
+            for strace, instances in single:
+                merged = grouped[strace]
+                self.assertEqual(len(merged), 2 * len(instances))
+                self.assertEqual(merged.__repr__(), 
+                                 (instances + instances).__repr__())
+        log = read_xes_many_complex([SSMALL, DSMALL], name="merged")
+        self.assertEqual(log.get_name(), "merged")
+        self.assertEqual(log, EventLog.from_frequencies(
+            list(read_xes_simple(SSMALL)) + list(read_xes_simple(DSMALL))))
+
     def nottest_read_bad(self):
         with self.failUnlessRaises(Exception): 
             log = read_xes_complex(path.join(".","tests","small_bad.xes")) 
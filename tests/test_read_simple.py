@@ -1,12 +1,119 @@
 import unittest
 from os import path 
+from tempfile import TemporaryDirectory
+from shutil import copyfile
+from unittest import mock
 
-from pmkoalas.read import read_xes_simple
+from pmkoalas.read import read_xes_simple, _stream_log_children
+from pmkoalas.read import _split_at_traces, read_xes_many
+from pmkoalas.read import read_xes_simple_views
 from pmkoalas.simple import EventLog,Trace
 
 SSMALL = path.join(".","tests","small_01.xes")
 WSMALL = path.join(".","tests","small_02.xes")
 OSMALL = path.join(".","tests","small_03.xes")
+DSMALL = path.join(".","tests","small_04.xes")
+
+IRREGULAR_LOG = """<?xml version="1.0" encoding="UTF-8" ?>
+<log xes.version="1.0" xmlns="http://www.xes-standard.org/">
+    <global scope="trace">
+        <string key="concept:name" value="__INVALID__"/>
+    </global>
+    <string key="concept:name" value="irregular"/>
+    <trace>
+        <string key="concept:name" value="trace 01"/>
+        <event><string key="concept:name" value="A &amp; B"/></event>
+        <event>
+            <date key="time:timestamp" value="2122-01-01T01:00:00"/>
+            <string key="concept:name" value="C"/>
+        </event>
+    </trace>
+    <trace>
+        <event><string value="D" key="concept:name"/></event>
+        <event><string key='concept:name' value='E'/></event>
+    </trace>
+</log>
+"""
+
+PREFIXED_LOG = """<?xml version="1.0" encoding="UTF-8" ?>
+<xes:log xes.version="1.0" xmlns:xes="http://www.xes-standard.org/">
+    <xes:string key="concept:name" value="prefixed"/>
+    <xes:trace>
+        <xes:event><xes:string key="concept:name" value="A"/></xes:event>
+        <xes:event><xes:string key="concept:name" value="B"/></xes:event>
+    </xes:trace>
+    <xes:trace>
+        <xes:event><xes:string key="concept:name" value="C"/></xes:event>
+    </xes:trace>
+</xes:log>
+"""
+
+NESTED_LOG = """<?xml version="1.0" encoding="UTF-8" ?>
+<log xes.version="1.0" xmlns="http://www.xes-standard.org/">
+    <trace>
+        <string key="concept:name" value="trace 01"/>
+        <event>
+            <string key="concept:name" value="A">
+                <string key="concept:name" value="X"/>
+            </string>
+        </event>
+        <event><string key="concept:name" value="B"/></event>
+    </trace>
+</log>
+"""
+
+SELF_CLOSING_LOG = """<?xml version="1.0" encoding="UTF-8" ?>
+<log xes.version="1.0" xmlns="http://www.xes-standard.org/">
+    <trace/>
+    <trace>
+        <event><string key="concept:name" value="A"/></event>
+    </trace>
+    <trace key="empty" />
+    <trace>
+        <event><string key="concept:name" value="B"/></event>
+    </trace>
+</log>
+"""
+
+COMMENTED_LOG = """<?xml version="1.0" encoding="UTF-8" ?>
+<log xes.version="1.0" xmlns="http://www.xes-standard.org/">
+    <!-- an example <trace> -->
+    <trace>
+        <event><string key="concept:name" value="A"/></event>
+        <!-- <event><string key="concept:name" value="X"/></event> -->
+        <event><string key="concept:name" value="B"/></event>
+    </trace>
+    <!-- </trace> <trace> -->
+    <trace>
+        <event>
+            <!-- <string key="concept:name" value="Y"/> -->
+            <string key="concept:name" value="C"/>
+        </event>
+    </trace>
+</log>
+"""
+
+SPACED_CLOSE_LOG = """<?xml version="1.0" encoding="UTF-8" ?>
+<log xes.version="1.0" xmlns="http://www.xes-standard.org/">
+    <trace>
+        <event><string key="concept:name" value="A"/></event >
+    </trace >
+    <trace>
+        <event><string key="concept:name" value="B"/></event>
+    </trace
+    >
+</log>
+"""
+
+NEWLINE_LOG = """<?xml version="1.0" encoding="UTF-8" ?>
+<log xes.version="1.0" xmlns="http://www.xes-standard.org/">
+    <trace>
+        <event><string key="concept:name" value="A
+B"/></event>
+        <event><string key="concept:name" value="C\r\nD\tE&#10;F"/></event>
+    </trace>
+</log>
+"""
 
 class DTLogTest(unittest.TestCase):
 
@@ -54,6 +161,257 @@ class DTLogTest(unittest.TestCase):
             ])
         self.assertEqual(log, real_log)
 
+    def test_log_name(self):
+        log = read_xes_simple(SSMALL)
+        self.assertEqual(log.get_name(), "A small log")
+
+    def test_streamed_traces_are_released(self):
+        seen = []
+        for child in _stream_log_children(SSMALL):
+            seen.append(child)
+        traces = [ child for child in seen if child.tag.endswith("trace") ]
+        self.assertEqual(len(traces), 5)
+        for trace in traces:
+            self.assertEqual(len(trace), 0)
+
+    def test_parallel_read(self):
+        with mock.patch("pmkoalas.read.READ_PARALLEL_SIZE", 0):
+            log = read_xes_simple(SSMALL, workers=2)
+        self.assertEqual(log, read_xes_simple(SSMALL))
+        self.assertEqual(log.get_name(), "A small log")
+        self.assertEqual(
+            [ trace for trace,_ in log ],
+            [ trace for trace,_ in read_xes_simple(SSMALL) ]
+        )
+
+    def test_parallel_read_small(self):
+        # small documents are not worth sending to a pool of processes
+        with mock.patch("pmkoalas.read._read_chunks", 
+                        side_effect=AssertionError("parallel")):
+            log = read_xes_simple(SSMALL, workers=2)
+            self.assertEqual(read_xes_simple_views(OSMALL, ["concept:name"],
+                                                   workers=-1),
+                             [ read_xes_simple(OSMALL) ])
+        self.assertEqual(log, read_xes_simple(SSMALL))
+
+    def test_split_at_traces(self):
+        start, ranges, end = _split_at_traces(SSMALL, 3)
+        self.assertEqual(len(ranges), 3)
+        self.assertEqual(ranges[0][0], start)
+        self.assertEqual(ranges[-1][1], end)
+        with open(SSMALL, "rb") as f:
+            for lower,_ in ranges:
+                f.seek(lower)
+                self.assertEqual(f.read(7), b"<trace>")
+            f.seek(end)
+            self.assertEqual(f.read(6), b"</log>")
+
+    def test_fast_read(self):
+        self.assertEqual(read_xes_simple(SSMALL, fast=True),
+                         read_xes_simple(SSMALL))
+        self.assertEqual(read_xes_simple(SSMALL, fast=True).get_name(),
+                         "A small log")
+        self.assertEqual(read_xes_simple(OSMALL, label_attribute="name",
+                                         fast=True),
+                         read_xes_simple(OSMALL, label_attribute="name"))
+        self.assertEqual(
+            read_xes_simple(OSMALL, label_attribute=["concept:name","name"],
+                            fast=True),
+            read_xes_simple(OSMALL, label_attribute=["concept:name","name"])
+        )
+        with self.assertRaises(ValueError):
+            read_xes_simple(WSMALL, fast=True)
+
+    def test_fast_read_irregular(self):
+        fdir = TemporaryDirectory()
+        try:
+            filepath = path.join(fdir.name, "irregular.xes")
+            with open(filepath, "w") as f:
+                f.write(IRREGULAR_LOG)
+            log = read_xes_simple(filepath, fast=True)
+            self.assertEqual(log, read_xes_simple(filepath))
+            self.assertEqual(log, EventLog([
+                Trace(["A & B", "C"]),
+                Trace(["D", "E"]),
+            ]))
+            self.assertEqual(log.get_name(), "irregular")
+        finally:
+            fdir.cleanup()
+
+    def _write(self, fdir:TemporaryDirectory, content:str) -> str:
+        filepath = path.join(fdir.name, "log.xes")
+        with open(filepath, "w") as f:
+            f.write(content)
+        return filepath
+
+    def test_fast_read_prefixed(self):
+        fdir = TemporaryDirectory()
+        try:
+            filepath = self._write(fdir, PREFIXED_LOG)
+            log = read_xes_simple(filepath, fast=True)
+            self.assertEqual(log, read_xes_simple(filepath))
+            self.assertEqual(log, EventLog([
+                Trace(["A", "B"]), Trace(["C"])
+            ]))
+            self.assertEqual(log.get_name(), "prefixed")
+        finally:
+            fdir.cleanup()
+
+    def test_fast_read_nested_label(self):
+        fdir = TemporaryDirectory()
+        try:
+            filepath = self._write(fdir, NESTED_LOG)
+            expected = EventLog([ Trace(["A X", "B"]) ])
+            self.assertEqual(read_xes_simple(filepath), expected)
+            self.assertEqual(read_xes_simple(filepath, fast=True), expected)
+            labels = ["concept:name", "org:resource"]
+            self.assertEqual(
+                read_xes_simple(filepath, label_attribute=labels, fast=True),
+                read_xes_simple(filepath, label_attribute=labels))
+        finally:
+            fdir.cleanup()
+
+    def test_fast_read_equivalent(self):
+        cases = [
+            (SELF_CLOSING_LOG, [[], ["A"], [], ["B"]]),
+            (COMMENTED_LOG, [["A", "B"], ["C"]]),
+            (SPACED_CLOSE_LOG, [["A"], ["B"]]),
+            (NEWLINE_LOG, [["A B", "C D E\nF"]]),
+        ]
+        for content, traces in cases:
+            fdir = TemporaryDirectory()
+            try:
+                filepath = self._write(fdir, content)
+                expected = EventLog([ Trace(trace) for trace in traces ])
+                self.assertEqual(read_xes_simple(filepath), expected)
+                self.assertEqual(read_xes_simple(filepath, fast=True),
+                                 read_xes_simple(filepath, fast=False))
+            finally:
+                fdir.cleanup()
+
+    def test_cached_read(self):
+        fdir = TemporaryDirectory()
+        try:
+            filepath = path.join(fdir.name, "cached.xes")
+            copyfile(SSMALL, filepath)
+            log = read_xes_simple(filepath, cache=True)
+            self.assertTrue(path.exists(filepath + ".koalas"))
+            cached = read_xes_simple(filepath, cache=True)
+            self.assertEqual(log, cached)
+            self.assertEqual(cached.get_name(), "A small log")
+            # a different classifier is not served from the sidecar
+            labels = ["concept:name", "time:timestamp"]
+            self.assertEqual(
+                read_xes_simple(filepath, label_attribute=labels, cache=True),
+                read_xes_simple(SSMALL, label_attribute=labels)
+            )
+            self.assertNotEqual(
+                read_xes_simple(filepath, label_attribute=labels, cache=True),
+                log
+            )
+            # a changed file makes the sidecar stale
+            copyfile(OSMALL, filepath)
+            self.assertEqual(read_xes_simple(filepath, cache=True),
+                             read_xes_simple(OSMALL))
+        finally:
+            fdir.cleanup()
+
+    def test_cached_read_refuses_code(self):
+        import pickle
+        fdir = TemporaryDirectory()
+        marker = path.join(fdir.name, "marker")
+        class Exploit():
+            def __reduce__(self):
+                return (open, (marker, "w"))
+        try:
+            filepath = path.join(fdir.name, "cached.xes")
+            copyfile(SSMALL, filepath)
+            with open(filepath + ".koalas", "wb") as f:
+                pickle.dump(Exploit(), f)
+            self.assertEqual(read_xes_simple(filepath, cache=True),
+                             read_xes_simple(SSMALL))
+            self.assertFalse(path.exists(marker))
+        finally:
+            fdir.cleanup()
+
+    def test_cached_read_restamps(self):
+        from os import utime, stat
+        fdir = TemporaryDirectory()
+        try:
+            filepath = path.join(fdir.name, "cached.xes")
+            copyfile(SSMALL, filepath)
+            log = read_xes_simple(filepath, cache=True)
+            mtime = stat(filepath).st_mtime_ns + 10 ** 9
+            utime(filepath, ns=(mtime, mtime))
+            # the unchanged contents are hashed once, then restamped
+            self.assertEqual(read_xes_simple(filepath, cache=True), log)
+            with mock.patch("pmkoalas._cache.content_hash", 
+                            side_effect=AssertionError("hashed again")):
+                self.assertEqual(read_xes_simple(filepath, cache=True), log)
+        finally:
+            fdir.cleanup()
+
+    def test_limited_read(self):
+        log = read_xes_simple(SSMALL, limit=2)
+        self.assertEqual(log, EventLog([
+                Trace(["A","B","C","D","E"]),
+                Trace(["A","B","C","D","E"]),
+        ]))
+        self.assertEqual(log.get_name(), "A small log")
+        self.assertEqual(read_xes_simple(SSMALL, limit=2, fast=True), log)
+        self.assertEqual(len(read_xes_simple(SSMALL, limit=0)), 0)
+
+    def test_sampled_read(self):
+        full = read_xes_simple(SSMALL)
+        for fast in [False, True]:
+            log = read_xes_simple(SSMALL, sample=3, seed=7, fast=fast)
+            self.assertEqual(len(log), 3)
+            self.assertEqual(log, 
+                read_xes_simple(SSMALL, sample=3, seed=7, fast=fast))
+            for trace, freq in log:
+                self.assertTrue(trace in full)
+                self.assertTrue(freq <= full.stochastic_language()[trace])
+        self.assertEqual(read_xes_simple(SSMALL, sample=10), full)
+        with self.assertRaises(ValueError):
+            read_xes_simple(SSMALL, sample=-1)
+
+    def test_read_many(self):
+        logs = [ read_xes_simple(file) for file in [SSMALL, DSMALL, SSMALL] ]
+        expected = EventLog.from_frequencies(
+            [ pair for log in logs for pair in log ], "A small log")
+        for workers in [1, 2]:
+            log = read_xes_many([SSMALL, DSMALL, SSMALL], workers=workers)
+            self.assertEqual(log, expected)
+            self.assertEqual(log.get_name(), "A small log")
+        log = read_xes_many([SSMALL], name="merged", fast=True)
+        self.assertEqual(log, logs[0])
+        self.assertEqual(log.get_name(), "merged")
+        self.assertEqual(len(read_xes_many([])), 0)
+        with self.assertRaises(FileNotFoundError):
+            read_xes_many([SSMALL, "tests/missing.xes"])
+
+    def test_read_views(self):
+        classifiers = [["concept:name"], "name", ["name", "concept:name"]]
+        for workers in [1, 2]:
+            with mock.patch("pmkoalas.read.READ_PARALLEL_SIZE", 0):
+                views = read_xes_simple_views(OSMALL, classifiers, 
+                                              workers=workers)
+            self.assertEqual(len(views), 3)
+            for view, classifier in zip(views, classifiers):
+                self.assertEqual(view, 
+                    read_xes_simple(OSMALL, label_attribute=classifier))
+                self.assertEqual(view.get_name(), 
+                                 read_xes_simple(OSMALL).get_name())
+        views = read_xes_simple_views(OSMALL, classifiers, limit=2)
+        self.assertEqual(views[1], EventLog([
+                Trace(["E","D","C","B","A"]),
+                Trace(["E","D","C","B","A"]),
+        ]))
+        with self.assertRaises(ValueError):
+            read_xes_simple_views(OSMALL, [])
+        with self.assertRaises(ValueError):
+            read_xes_simple_views(OSMALL, [["name"], ["foo:bah"]])
+
     def nottest_read_bad(self):
         with self.failUnlessRaises(Exception): 
             log = read_xes_simple(path.join(".","tests","small_bad.xes")) 
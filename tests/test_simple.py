@@ -1,11 +1,59 @@
 import unittest
-from pmkoalas.simple import Trace,EventLog
+from copy import deepcopy
+from pmkoalas.simple import Trace,EventLog,ActivityAlphabet
 from pmkoalas.dtlog import convert
 
+class NamedTrace(Trace):
+    "A subclass of traces, to check that copies keep their type."
+
+class SlottedTrace(Trace):
+    "A subclass of traces with its own slots."
+    __slots__ = ("weight",)
+
 class TraceTest(unittest.TestCase):
     def test_init(self):
         t = Trace(['a','c'])
  
+    def test_immutable(self):
+        seq = ('a','b','a')
+        t = Trace(seq)
+        self.assertIs(t.sequence, seq)
+        self.assertEqual(t, Trace(['a','b','a']))
+        self.assertEqual(hash(t), hash(Trace(['a','b','a'])))
+        self.assertIs(deepcopy(t), t)
+        with self.assertRaises(AttributeError):
+            t.extra = 1
+        lst = ['a','b']
+        t = Trace(lst)
+        lst.append('c')
+        self.assertEqual(len(t), 2)
+
+    def test_interned(self):
+        label = "".join(['a','b'])
+        t = Trace((label,'c'))
+        self.assertIs(t[0], "ab")
+        self.assertIs(Trace([label])[0], t[0])
+        self.assertEqual(Trace([1,2]).sequence, (1,2))
+
+    def test_subclass_copy(self):
+        from pickle import dumps, loads
+        t = NamedTrace(['a','b'])
+        self.assertIs(type(deepcopy(t)), NamedTrace)
+        self.assertIs(type(loads(dumps(t))), NamedTrace)
+        self.assertEqual(loads(dumps(t)), t)
+        self.assertIs(type(loads(dumps(Trace(['a'])))), Trace)
+        # state added by subclasses is kept
+        t.source = "sim"
+        self.assertEqual(loads(dumps(t)).source, "sim")
+        t = SlottedTrace(['a'])
+        t.weight = 2
+        self.assertEqual(loads(dumps(t)).weight, 2)
+        self.assertFalse(hasattr(loads(dumps(SlottedTrace(['a']))), "weight"))
+
+    def test_get_id(self):
+        with self.assertWarns(DeprecationWarning):
+            self.assertIsNone(Trace(['a']).get_id())
+
     def test_str(self):
         self.assertEqual( '<b>', str(Trace(['b']) ) )
         self.assertEqual( '<a,b>', str(Trace(['a','b']) ) )
@@ -45,6 +93,195 @@ class TraceTest(unittest.TestCase):
             set(['c','b','a', 'd'])
         )
 
+    def test_from_shards(self):
+        traces = [ Trace(['a','b']), Trace(['c']), Trace([]), 
+                   Trace(['a','b']), Trace(['b','c','d']) ]
+        expected = EventLog(traces, "sharded")
+        for workers in [1, 2]:
+            log = EventLog.from_traces(traces, "sharded", workers=workers,
+                                       shard_size=2)
+            self.assertEqual(log, expected)
+            self.assertEqual(list(log), list(expected))
+            self.assertEqual(log.get_name(), "sharded")
+            self.assertEqual(log.get_nvariants(), 4)
+            self.assertEqual(len(log), 5)
+            self.assertEqual(log.seen_activities(), 
+                             expected.seen_activities())
+            self.assertEqual(log.seen_start_activities(), 
+                             expected.seen_start_activities())
+            self.assertEqual(log.seen_end_activities(), 
+                             expected.seen_end_activities())
+        log = EventLog.from_shards([traces[:3], traces[3:]])
+        self.assertEqual(log, expected)
+        self.assertEqual(len(EventLog.from_traces([])), 0)
+
+    def test_read_only_activities(self):
+        log = EventLog([Trace(['a','b']), Trace(['c'])])
+        self.assertIs(log.seen_activities(), log.seen_activities())
+        with self.assertRaises(AttributeError):
+            log.seen_activities().add('d')
+        acts = set(log.seen_activities())
+        acts.add('d')
+        self.assertEqual(log.seen_activities(), set(['a','b','c']))
+
+    def test_from_frequencies(self):
+        log = EventLog.from_frequencies({
+            Trace(['a','b']) : 3,
+            Trace(['c']) : 1
+        }, "freqs")
+        self.assertEqual(log, convert("a b", "a b", "c", "a b"))
+        self.assertEqual(len(log), 4)
+        self.assertEqual(log.get_name(), "freqs")
+        self.assertEqual(log.seen_start_activities(), set(['a','c']))
+        log = EventLog.from_frequencies([
+            (Trace(['a']), 2), (Trace(['a']), 3)
+        ])
+        self.assertEqual(log.stochastic_language(), { Trace(['a']) : 5 })
+
+class MultisetTest(unittest.TestCase):
+    A = EventLog.from_frequencies({ Trace(['a']) : 3, Trace(['a','b']) : 1 },
+                                  "a")
+    B = EventLog.from_frequencies({ Trace(['a']) : 1, Trace(['c']) : 2 },
+                                  "b")
+
+    def test_sum_and_difference(self):
+        self.assertEqual(self.A + self.B, EventLog.from_frequencies(
+            { Trace(['a']) : 4, Trace(['a','b']) : 1, Trace(['c']) : 2 }))
+        self.assertEqual((self.A + self.B).get_name(), "a")
+        self.assertEqual(self.A - self.B, EventLog.from_frequencies(
+            { Trace(['a']) : 2, Trace(['a','b']) : 1 }))
+        diff = self.B - self.A
+        self.assertEqual(diff, EventLog.from_frequencies({ Trace(['c']) : 2 }))
+        self.assertEqual(diff.seen_activities(), set(['c']))
+        self.assertEqual(len(self.A - self.A), 0)
+
+    def test_union_intersection_xor(self):
+        self.assertEqual(self.A | self.B, EventLog.from_frequencies(
+            { Trace(['a']) : 3, Trace(['a','b']) : 1, Trace(['c']) : 2 }))
+        self.assertEqual(self.A & self.B, EventLog.from_frequencies(
+            { Trace(['a']) : 1 }))
+        self.assertEqual(self.A ^ self.B, EventLog.from_frequencies(
+            { Trace(['a']) : 2, Trace(['a','b']) : 1, Trace(['c']) : 2 }))
+        with self.assertRaises(TypeError):
+            self.A | 1
+
+    def test_inclusion(self):
+        self.assertTrue((self.A & self.B) <= self.A)
+        self.assertTrue(self.A >= (self.A & self.B))
+        self.assertFalse(self.A <= self.B)
+        self.assertTrue(self.A + self.B >= self.A)
+        self.assertTrue(self.A + self.A > self.A)
+        self.assertTrue(self.A > (self.A & self.B))
+        self.assertTrue(self.A + self.B > self.A)
+        self.assertTrue(self.A < self.A + self.B)
+        self.assertFalse(self.A > self.A)
+        self.assertFalse(self.A < self.A)
+        self.assertTrue(self.A >= self.A)
+        self.assertTrue(self.A <= self.A)
+        self.assertFalse(EventLog([]) > EventLog([]))
+        self.assertFalse(EventLog([]) < EventLog([]))
+        self.assertTrue(EventLog([]) < self.A)
+        # frequencies are compared, not only variants
+        self.assertTrue(self.A <= self.A + self.A)
+        self.assertFalse(self.A + self.A <= self.A)
+        self.assertFalse(self.A >= self.A + self.A)
+        self.assertFalse(self.A >= self.B)
+        self.assertFalse(self.B >= self.A)
+        for left, right in [(self.A, self.B), (self.A + self.A, self.A),
+                            (self.A & self.B, self.A), (self.A, self.A)]:
+            self.assertEqual(left <= right, right >= left)
+            self.assertEqual(left < right, right > left)
+
+class ActivityAlphabetTest(unittest.TestCase):
+    def test_encode(self):
+        alphabet = ActivityAlphabet(['b','a'])
+        self.assertEqual(len(alphabet), 2)
+        self.assertEqual(alphabet.code('b'), 0)
+        self.assertEqual(alphabet.encode('c'), 2)
+        self.assertEqual(alphabet.label(1), 'a')
+        self.assertTrue('c' in alphabet)
+        self.assertEqual(list(alphabet), ['b','a','c'])
+        with self.assertRaises(KeyError):
+            alphabet.code('d')
+
+    def test_encode_trace(self):
+        alphabet = ActivityAlphabet()
+        codes = alphabet.encode_trace(Trace(['a','b','a']))
+        self.assertEqual(codes.typecode, 'H')
+        self.assertEqual(list(codes), [0,1,0])
+        self.assertEqual(alphabet.decode_trace(codes), Trace(['a','b','a']))
+
+    def test_encoded_language(self):
+        log = EventLog([ Trace(['a','b']), Trace(['b']), Trace(['a','b']) ])
+        alphabet = log.alphabet()
+        self.assertEqual(set(alphabet), log.seen_activities())
+        decoded = EventLog.from_frequencies(
+            (alphabet.decode_trace(codes), freq) 
+            for codes, freq in log.encoded_language() )
+        self.assertEqual(decoded, log)
+        # encodings are made on demand, not kept with the language
+        self.assertNotIn("_encoded", log.__dict__)
+
+class RankingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.log = convert(
+            "a b", "a b", "a b", "a b", "c", "c", "c", "d", "d", "e", "a b c"
+        )
+
+    def test_top_variants(self):
+        from pmkoalas.views import LogView
+        top = self.log.top_variants(2)
+        self.assertIsInstance(top, LogView)
+        self.assertEqual(top, convert("a b", "a b", "a b", "a b",
+                                      "c", "c", "c"))
+        self.assertEqual([ t for t, _ in top ], 
+                         [ Trace(["a","b"]), Trace(["c"]) ])
+        # ties are in seen order
+        self.assertEqual([ t for t, _ in self.log.top_variants(4) ][3],
+                         Trace(["e"]))
+        self.assertEqual(self.log.top_variants(0), EventLog([]))
+        self.assertEqual(self.log.top_variants(10), self.log)
+
+    def test_top_variants_heap(self):
+        log = EventLog.from_frequencies(
+            (Trace([str(i)]), i % 7) for i in range(1, 200) )
+        expected = sorted(log, key=lambda pair: pair[1], reverse=True)
+        for k in [1, 3, 12, 50, 199]:
+            top = log.__class__.from_frequencies(log)
+            self.assertEqual(list(top.top_variants(k)), expected[:k])
+            self.assertEqual(list(log.top_variants(k)), expected[:k])
+
+    def test_variants_covering(self):
+        self.assertEqual(self.log.variants_covering(0), EventLog([]))
+        self.assertEqual(self.log.variants_covering(0.3), 
+                         self.log.top_variants(1))
+        self.assertEqual(self.log.variants_covering(4/11), 
+                         self.log.top_variants(1))
+        self.assertEqual(self.log.variants_covering(0.4), 
+                         self.log.top_variants(2))
+        self.assertEqual(self.log.variants_covering(0.8), 
+                         self.log.top_variants(3))
+        self.assertEqual(self.log.variants_covering(0.85), 
+                         self.log.top_variants(4))
+        self.assertEqual(self.log.variants_covering(1), self.log)
+        log = convert(*(["a"] * 7 + ["b"] * 3))
+        self.assertEqual(log.variants_covering(0.7), convert(*["a"] * 7))
+        with self.assertRaises(ValueError):
+            self.log.variants_covering(1.5)
+
+    def test_ranking_kept(self):
+        self.log.variants_covering(0.5)
+        ranking = self.log._ranking
+        for k in range(6):
+            self.log.top_variants(k)
+            self.assertIs(self.log._ranking, ranking)
+
+    def test_view_ranking(self):
+        view = self.log.view().with_length(at_most=1)
+        self.assertEqual(view.top_variants(1), convert("c", "c", "c"))
+        top = self.log.top_variants(3).containing("a")
+        self.assertEqual(top, convert("a b", "a b", "a b", "a b"))
+
 if __name__ == '__main__':
     unittest.main()
-
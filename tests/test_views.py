@@ -0,0 +1,157 @@
+import pickle
+import unittest
+from os import path
+from tempfile import TemporaryDirectory
+
+from pmkoalas.simple import EventLog
+from pmkoalas.complex import ComplexEventLog
+from pmkoalas.dtlog import convert
+from pmkoalas.views import LogView, ComplexLogView
+from pmkoalas.read import read_xes_simple, read_xes_complex
+from pmkoalas.export import export_to_xes_simple, export_to_xes_complex
+from pmkoalas.discovery.alpha_miner import AlphaMinerInstance
+
+DSMALL = path.join(".","tests","small_04.xes")
+
+class LogViewTest(unittest.TestCase):
+
+    def setUp(self):
+        self.log = convert(
+            "a b c d", "a b c d", "a c b d", "a b", "b c", "c", "",
+            "a b c d e", "d a b", "a a b b"
+        )
+
+    def test_deferred(self):
+        view = self.log.view().containing("a").with_length(at_least=3)
+        self.assertIsInstance(view, LogView)
+        self.assertIsInstance(view, EventLog)
+        self.assertIsNone(view._state)
+        self.assertEqual(len(view), 6)
+        self.assertIsNotNone(view._state)
+        self.assertIs(view.parent(), self.log)
+
+    def test_predicate_errors(self):
+        def failing(trace, freq):
+            raise KeyError("missing")
+        view = self.log.view().where(failing)
+        with self.assertRaises(KeyError):
+            len(view)
+        with self.assertRaises(KeyError):
+            view.seen_activities()
+        with self.assertRaises(AttributeError):
+            view.unknown
+
+    def test_shares_traces(self):
+        view = self.log.view().with_frequency(at_least=2)
+        self.assertEqual(view, convert("a b c d", "a b c d"))
+        [ (trace, _) ] = list(view)
+        [ parent ] = [ t for t, _ in self.log if t == trace ]
+        self.assertIs(trace, parent)
+
+    def test_predicates(self):
+        view = self.log.view()
+        self.assertEqual(view, self.log)
+        self.assertEqual(view.with_length(1, 2), convert("a b", "b c", "c"))
+        self.assertEqual(view.with_frequency(at_most=1).with_length(4),
+                         convert("a c b d", "a b c d e", "a a b b"))
+        self.assertEqual(view.containing("a", "d").excluding("e"),
+                         convert("a b c d", "a b c d", "a c b d", "d a b"))
+        self.assertEqual(view.starting_with("b", "c"), convert("b c", "c"))
+        self.assertEqual(view.ending_with("d").starting_with("d"),
+                         EventLog([]))
+        self.assertEqual(view.where(lambda trace, _: trace[0] == "a"
+                                    if len(trace) > 0 else False),
+                         self.log.filter_containing("a").view()
+                            .starting_with("a"))
+
+    def test_log_accessors(self):
+        view = self.log.view().containing("d")
+        self.assertEqual(view.seen_activities(), set("abcde"))
+        self.assertEqual(view.seen_start_activities(), set("ad"))
+        self.assertEqual(view.seen_end_activities(), set("bde"))
+        self.assertEqual(view.get_nvariants(), 4)
+        self.assertEqual(view.get_name(), self.log.get_name())
+        self.assertTrue(view < self.log)
+        self.assertIn(("*", "c", "b", "*"), view)
+        self.assertEqual(repr(view.directly_follow_relations()),
+                         repr(view.materialise().directly_follow_relations()))
+
+    def test_operators(self):
+        view = self.log.view().containing("d")
+        combined = view + self.log
+        self.assertNotIsInstance(combined, LogView)
+        self.assertEqual(combined, self.log + view.materialise())
+        self.assertNotIsInstance(view.materialise(), LogView)
+
+    def test_pickle(self):
+        view = self.log.view().containing("a").with_length(1, 4) \
+            .with_frequency(at_most=1).excluding("e") \
+            .starting_with("a").ending_with("b", "d")
+        copied = pickle.loads(pickle.dumps(view))
+        self.assertIsInstance(copied, LogView)
+        self.assertIsNone(copied._state)
+        self.assertEqual(copied, view.materialise())
+        self.assertEqual(copied, convert("a c b d", "a b", "a a b b"))
+
+    def test_miner(self):
+        view = self.log.view().with_frequency(at_least=2)
+        miner = AlphaMinerInstance()
+        found = miner.discover(view).net
+        expected = miner.discover(view.materialise()).net
+        self.assertEqual(set( t.name for t in found.transitions ),
+                         set( t.name for t in expected.transitions ))
+        self.assertEqual(set( p.name for p in found.places ),
+                         set( p.name for p in expected.places ))
+        self.assertEqual(len(found.arcs), len(expected.arcs))
+
+    def test_export(self):
+        log = read_xes_simple(DSMALL)
+        view = log.view().with_length(at_least=2)
+        fdir = TemporaryDirectory()
+        try:
+            filepath = path.join(fdir.name, "view.xes")
+            export_to_xes_simple(filepath, view)
+            self.assertEqual(read_xes_simple(filepath), view.materialise())
+        finally:
+            fdir.cleanup()
+
+class ComplexLogViewTest(unittest.TestCase):
+
+    def setUp(self):
+        self.log = read_xes_complex(DSMALL)
+
+    def test_view(self):
+        view = self.log.view().with_length(at_least=2)
+        self.assertIsInstance(view, ComplexLogView)
+        self.assertIsInstance(view, ComplexEventLog)
+        self.assertIsNone(view._state)
+        expected = dict(
+            (strace, instances)
+            for strace, instances in self.log.get_instances().items()
+            if len(strace) >= 2
+        )
+        self.assertEqual(dict(view.get_instances()), expected)
+        self.assertEqual(len(view),
+            sum( len(instances) for instances in expected.values() ))
+        self.assertEqual(view.data(), self.log.data())
+        for strace, instances in view:
+            for instance, parent in zip(instances,
+                    self.log.seen_instances_for(strace)):
+                self.assertIs(instance, parent)
+
+    def test_pickle(self):
+        view = self.log.view().with_length(at_least=2)
+        copied = pickle.loads(pickle.dumps(view))
+        self.assertIsInstance(copied, ComplexLogView)
+        self.assertEqual(copied.materialise(), view.materialise())
+
+    def test_export(self):
+        acts = sorted(self.log.seen_activities())
+        view = self.log.view().containing(acts[0])
+        fdir = TemporaryDirectory()
+        try:
+            filepath = path.join(fdir.name, "view.xes")
+            export_to_xes_complex(filepath, view)
+            self.assertEqual(read_xes_complex(filepath), view.materialise())
+        finally:
+            fdir.cleanup()